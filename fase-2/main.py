@@ -1,14 +1,16 @@
-# descrição:        ficheiro principal do jogo.
+# descrição:        ficheiro principal do jogo, controlado por deteção de movimentos.
+#                   o jogo e o detetor são os da fase 4, este ficheiro só corre o jogo da fase 4 com o
+#                   controlador desta fase (ver fase-4/fases.py).
 # autor:            Luís Pereira (18446), Paulo Machado (23484)
 # criado a:         25-11-2022
-# modificado a:     25-11-2022
+# modificado a:     18-10-2026
 
 
-import tkinter as tk
-from Game import Game
+import os
+import subprocess
+import sys
 
-root = tk.Tk()
-root.title('Break Those Bricks')
 
-game = Game(root)
-game.mainloop()
+PHASES_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fase-4', 'fases.py')
+
+sys.exit(subprocess.call([sys.executable, PHASES_SCRIPT, '2', 'jogo'] + sys.argv[1:]))
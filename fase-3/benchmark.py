@@ -0,0 +1,16 @@
+# descrição:        benchmark da deteção de faces sobre vídeos gravados (ver fase-4/benchmark_faces.py).
+#                   o jogo e o detetor são os da fase 4, este ficheiro só corre o benchmark da fase 4 com o
+#                   controlador desta fase (ver fase-4/fases.py).
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import os
+import subprocess
+import sys
+
+
+PHASES_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fase-4', 'fases.py')
+
+sys.exit(subprocess.call([sys.executable, PHASES_SCRIPT, '3', 'benchmark'] + sys.argv[1:]))
@@ -0,0 +1,145 @@
+# descrição:        classe responsável pela subtração de fundo da transmissão de vídeo (câmara) do computador,
+#                   para assim manipular o paddle do jogo através do centro da silhueta em movimento do jogador,
+#                   mais barata que o optical flow (para computadores mais fracos).
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import cv2 as cv
+import numpy as np
+from CameraDetector import CameraDetector
+from Controllers import Part_Of_Screen
+from Instrumentation import timings
+
+
+class BackgroundSubtraction(CameraDetector):
+    # subtractor: 'mog2' ou 'knn' (modelos de fundo incrementais do OpenCV)
+    def __init__(self, processing_scale=0.25, subtractor='mog2', preview_mode='frames', preview_every=1,
+                 preview_fps=30):
+        CameraDetector.__init__(self, preview_mode, preview_every, preview_fps)
+
+        self.frame = None
+        self.frame_time = None
+        self.part_of_screen = Part_Of_Screen.NONE
+
+        # escala a que o modelo de fundo é atualizado (1.0 = resolução original da câmara),
+        # o modelo guarda várias gaussianas por pixel, por isso uma frame reduzida torna-o muito mais barato
+        self.processing_scale = processing_scale
+
+        # tamanho do filtro gaussiano ajustado à escala (tem de ser ímpar)
+        self.blur_size = max(3, int(9 * processing_scale) | 1)
+
+        # modelo do fundo, aprendido continuamente (também antes do jogo iniciar, enquanto o jogador se prepara)
+        self.subtractor = subtractor
+        if subtractor == 'knn':
+            self.background_model = cv.createBackgroundSubtractorKNN(history=300, detectShadows=False)
+        else:
+            self.background_model = cv.createBackgroundSubtractorMOG2(history=300, varThreshold=25,
+                                                                      detectShadows=False)
+
+        # remover pequenos pontos de ruído da máscara do primeiro plano
+        self.morph_kernel = cv.getStructuringElement(cv.MORPH_ELLIPSE, (3, 3))
+
+        # área mínima do primeiro plano (fração da frame) para considerar que o jogador se está a mexer
+        self.min_foreground_area = 0.01
+
+        # máscara do primeiro plano e centro da silhueta (em coordenadas da frame original)
+        self.foreground_mask = None
+        self.foreground_center_x = -1
+
+    # chamada pela pré-visualização para obter a frame a mostrar (com o primeiro plano a verde)
+    def draw_preview(self):
+        image_preview = self.get_buffer('preview', self.frame.shape)
+        np.copyto(image_preview, self.frame)
+
+        if not self.is_start or self.foreground_mask is None:
+            return image_preview
+
+        # voltar a colocar a máscara na resolução original
+        image_mask = self.foreground_mask
+        if self.processing_scale != 1.0:
+            image_mask = cv.resize(image_mask, (image_preview.shape[1], image_preview.shape[0]),
+                                   dst=self.get_buffer('mask_original', image_preview.shape[:2]),
+                                   interpolation=cv.INTER_NEAREST)
+
+        # pintar o primeiro plano de verde
+        image_green = self.buffers.get('green')
+        if image_green is None or image_green.shape != image_preview.shape:
+            image_green = np.full(image_preview.shape, (0, 255, 0), np.uint8)
+            self.buffers['green'] = image_green
+
+        cv.copyTo(image_green, image_mask, image_preview)
+
+        # desenhar o centro da silhueta
+        if self.foreground_center_x != -1:
+            cv.line(image_preview, (self.foreground_center_x, 0), (self.foreground_center_x, image_preview.shape[0]),
+                    (0, 0, 255), 2)
+
+        return image_preview
+
+    # processar uma frame da câmara, sem qualquer janela (usado também pelo benchmark)
+    def process_frame(self, frame, frame_time=None):
+        return self.process_cached_frame(self.frame_cache.add(frame, frame_time))
+
+    # processar uma frame já adicionada a uma cache de pré-processamento (partilhada com outros detetores na fusão)
+    def process_cached_frame(self, preprocessed_frame):
+        self.frame = preprocessed_frame.flipped()
+        self.frame_time = preprocessed_frame.frame_time
+
+        # frame em grayscale, reduzida para a escala de processamento e com um filtro gaussiano para remover ruído
+        # (a mesma frame preparada do optical flow, por isso é partilhada na fusão)
+        frame_prepared = preprocessed_frame.blurred(self.processing_scale, self.blur_size, gray=True)
+
+        # atualizar o modelo do fundo e obter os pixeis que não pertencem a ele (255 = primeiro plano)
+        start_time = timings.now()
+        foreground_mask = self.background_model.apply(frame_prepared,
+                                                      self.get_buffer('foreground', frame_prepared.shape))
+        timings.record('background_apply', start_time)
+
+        start_time = timings.now()
+        self.foreground_mask = cv.morphologyEx(foreground_mask, cv.MORPH_OPEN, self.morph_kernel,
+                                               dst=self.get_buffer('foreground_open', frame_prepared.shape))
+        timings.record('morphologyEx', start_time)
+
+        # decidir só quando o jogo iniciar
+        if self.is_start:
+            self.find_foreground_side()
+
+        return self.part_of_screen
+
+    # níveis de qualidade para o governador (ver QualityGovernor), do melhor (as opções pedidas) para o pior:
+    # só menos frames na pré-visualização, porque o modelo do fundo é aprendido a uma escala fixa
+    def get_quality_levels(self):
+        return [dict(preview_divisor=preview_divisor) for preview_divisor in [1, 2, 4]]
+
+    def set_quality(self, quality):
+        if self.preview is not None:
+            self.preview.set_rate_divisor(quality['preview_divisor'])
+
+    def find_foreground_side(self):
+        self.foreground_center_x = -1
+        self.part_of_screen = Part_Of_Screen.NONE
+
+        # área e centróide do primeiro plano, numa só passagem pela máscara
+        start_time = timings.now()
+        moments = cv.moments(self.foreground_mask, binaryImage=True)
+        timings.record('moments', start_time)
+        mask_height, mask_width = self.foreground_mask.shape
+
+        # sem movimentos suficientes (jogador parado ou só ruído), o paddle não se move
+        if moments['m00'] < self.min_foreground_area * mask_width * mask_height:
+            return
+
+        # centro da silhueta, convertido para a frame original
+        self.foreground_center_x = int(moments['m10'] / moments['m00'] / self.processing_scale)
+
+        # descobrir em que lado da tela está a silhueta
+        frame_width = self.frame.shape[1]
+        if self.foreground_center_x <= frame_width / 2:
+            self.part_of_screen = Part_Of_Screen.LEFT
+        else:
+            self.part_of_screen = Part_Of_Screen.RIGHT
+
+        # posição contínua da silhueta, para o paddle a seguir (se o filtro de posição estiver ativo)
+        self.update_position(self.foreground_center_x / frame_width, self.frame_time)
@@ -0,0 +1,21 @@
+# descrição:        buffers pré-alocados, reutilizados em todas as frames para não alocar memória no ciclo da câmara,
+#                   usados pelos detetores (ver CameraDetector) e pelas frames da cache do pré-processamento
+#                   (ver FrameCache). cada classe que os usa guarda os seus buffers no dicionário self.buffers.
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import numpy as np
+
+
+class Buffers(object):
+    # obter um buffer pré-alocado, que só é criado novamente se o tamanho ou o tipo mudarem
+    def get_buffer(self, name, shape, dtype=np.uint8):
+        buffer = self.buffers.get(name)
+
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype)
+            self.buffers[name] = buffer
+
+        return buffer
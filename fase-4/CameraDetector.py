@@ -0,0 +1,124 @@
+# descrição:        classe base dos detetores com câmara (cor, optical flow, faces, subtração de fundo e fusão):
+#                   o ciclo da câmara (obter a frame, processá-la, ajustar a qualidade e gravar a sessão), a
+#                   pré-visualização num thread próprio e o clique na câmara que inicia o jogo. cada detetor só
+#                   implementa o processamento da frame (process_frame) e o que é desenhado (draw_preview).
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import time
+import cv2 as cv
+from threading import Thread, Lock
+from Preview import Preview
+from Buffers import Buffers
+from FrameCache import FrameCache
+from Controllers import Controller
+from Instrumentation import timings
+
+
+class CameraDetector(Thread, Controller, Buffers):
+    def __init__(self, preview_mode='frames', preview_every=1, preview_fps=30):
+        Thread.__init__(self)
+        Controller.__init__(self)
+
+        # buffers pré-alocados, reutilizados em todas as frames para não alocar memória no ciclo da câmara
+        # (são criados na primeira frame, ou quando o tamanho da frame muda)
+        self.buffers = {}
+
+        # pré-processamento de cada frame (espelhar, grayscale, filtro gaussiano, etc.), que pode ser partilhado
+        # com outros detetores quando processam a mesma frame (ver Fusion)
+        self.frame_cache = FrameCache()
+
+        # pré-visualização da câmara, num thread próprio: 'off' (sem janela), 'frames' (uma em cada
+        # preview_every frames) ou 'fps' (no máximo preview_fps frames por segundo)
+        self.preview_mode = preview_mode
+        self.preview_every = preview_every
+        self.preview_fps = preview_fps
+
+        # frames processadas, e o lock que impede a pré-visualização de desenhar uma frame a meio do processamento
+        self.frames_count = 0
+        self.frame_lock = Lock()
+
+        # instantes (time.perf_counter) de cada etapa do arranque: câmara aberta e primeira frame obtida
+        # (os detetores podem acrescentar as suas, ex.: classificador carregado)
+        self.startup_times = {}
+
+    # função pertencente à classe Thread, chamada quando o thread é iniciado
+    def run(self):
+        # a janela da câmara é tratada pelo thread da pré-visualização,
+        # assim a deteção corre ao ritmo da câmara e não ao da janela
+        preview = None
+        if self.preview_mode != 'off':
+            preview = Preview(self, self.preview_mode, self.preview_every, self.preview_fps)
+            preview.start()
+            self.preview = preview
+
+        # rendezirar câmara
+        camera = self.open_camera()
+
+        while not self.is_finish:
+            # obter frame
+            capture_start_time = timings.now()
+            ret, frame = camera.read(self.buffers.get('capture'))
+            self.buffers['capture'] = frame
+            frame_time = time.perf_counter()
+            timings.record('capture', capture_start_time)
+
+            if 'first_frame' not in self.startup_times:
+                self.startup_times['first_frame'] = time.perf_counter()
+
+            # processar frame (a deteção só é feita quando o jogo iniciar)
+            with self.frame_lock:
+                process_start_time = time.perf_counter()
+                self.process_frame(frame, frame_time)
+                self.frames_count += 1
+
+                # baixar ou subir a qualidade se o processamento das últimas frames saiu do orçamento
+                self.update_quality(time.perf_counter() - process_start_time)
+
+            # gravar a frame e a decisão, se a sessão estiver a ser gravada
+            self.record_frame(frame, frame_time)
+
+            # sem janela não é possível clicar na câmara, por isso é usado o centro da câmara
+            # (o detetor de cor segue o objeto que estiver no centro)
+            if preview is None and not self.is_start:
+                self.click_in_camera_and_start_game(cv.EVENT_LBUTTONUP, frame.shape[1] // 2, frame.shape[0] // 2,
+                                                    None, None)
+
+        # conclui a transmissão do vídeo
+        camera.release()
+
+        self.release_resources()
+
+        if preview is not None:
+            preview.join()
+
+        self.is_finish = True
+
+    # fonte das frames (ver Controller.camera), sem fonte é usada a câmara do computador
+    def open_camera(self):
+        camera = self.camera if self.camera is not None else cv.VideoCapture(0)
+        self.startup_times['camera_opened'] = time.perf_counter()
+
+        return camera
+
+    # terminar o que o detetor criou além da câmara (ex.: threads do cálculo do flow em faixas)
+    def release_resources(self):
+        pass
+
+    # chamada pela pré-visualização depois de criar a janela da câmara
+    def setup_window(self):
+        # evento de clicar na câmara com o mouse
+        cv.setMouseCallback('Camera', self.click_in_camera_and_start_game)
+
+    def click_in_camera_and_start_game(self, event, x, y, flags, param):
+        # sai da função, quando o utilizador clica na câmara e o jogo já está em andamento
+        if self.is_start:
+            return
+
+        if event == cv.EVENT_LBUTTONUP:
+            self.record_click(x, y)
+
+            # iniciar jogo
+            self.is_start = True
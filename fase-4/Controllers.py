@@ -0,0 +1,253 @@
+# descrição:        registo dos controladores do paddle (deteção de cor, optical flow, faces, subtração de
+#                   fundo, fusão, teclado, etc.). cada controlador só é importado quando é escolhido, para o jogo
+#                   não carregar o OpenCV (nem abrir a câmara) quando o controlador escolhido não precisa.
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import importlib
+from enum import Enum
+
+
+class Part_Of_Screen(Enum):
+    NONE = 0
+    LEFT = 1
+    MIDDLE = 2
+    RIGHT = 3
+
+
+# nome do controlador: (módulo, classe)
+CONTROLLERS = {}
+
+
+def register_controller(name, module_name, class_name):
+    CONTROLLERS[name] = (module_name, class_name)
+
+
+# importar o módulo do controlador apenas agora
+def get_controller_class(name):
+    if name not in CONTROLLERS:
+        raise ValueError('controlador desconhecido: %s (disponíveis: %s)' % (name, ', '.join(sorted(CONTROLLERS))))
+
+    module_name, class_name = CONTROLLERS[name]
+    module = importlib.import_module(module_name)
+
+    return getattr(module, class_name)
+
+
+# criar o controlador com as opções recebidas
+def create_controller(name, **options):
+    return get_controller_class(name)(**options)
+
+
+# interface comum que o jogo usa para mover o paddle:
+# - is_start / is_finish: o controlador está pronto a jogar / foi encerrado
+# - part_of_screen: para onde o paddle deve andar (Part_Of_Screen)
+# - attach(game): chamado quando o jogo é criado (ex.: associar teclas à janela)
+# - update(game): chamado em cada ciclo do jogo, antes de ler o part_of_screen
+# - get_position(now): posição contínua prevista (fração da largura), se o controlador tiver um filtro de posição
+# os controladores com câmara são threads, por isso também herdam o start, o join e o is_alive do Thread
+class Controller(object):
+    paddle_speed = 10
+    start_message = 'Clique na Câmara'
+
+    # filtro das posições medidas pelo detetor (ver PositionFilter), sem filtro o paddle anda por passos fixos
+    position_filter = None
+
+    # gravação da sessão da câmara (ver SessionRecording), sem gravação as frames não são guardadas
+    recorder = None
+
+    # fonte das frames dos detetores, com a interface do cv.VideoCapture (ex.: SyntheticCamera ou SessionReader),
+    # sem fonte é usada a câmara do computador
+    camera = None
+
+    # governador da qualidade do detetor (ver QualityGovernor), sem governador a qualidade nunca muda
+    quality_governor = None
+
+    # pré-visualização da câmara (ver Preview), só nos detetores com janela
+    preview = None
+
+    # instante (time.perf_counter) da captura da frame que deu o part_of_screen atual, para medir a latência
+    # das decisões (só os controladores com câmara o conhecem)
+    decision_time = None
+
+    def __init__(self):
+        self.is_start = False
+        self.is_finish = False
+        self.part_of_screen = Part_Of_Screen.NONE
+
+    def attach(self, game):
+        pass
+
+    # chamado em cada ciclo do jogo, com o tabuleiro (paddle, bola e tijolos, ver Game.Board)
+    def update(self, board):
+        pass
+
+    def set_position_filter(self, position_filter):
+        self.position_filter = position_filter
+
+    # chamado pelos detetores com a posição do objeto/face (fração da largura) e o instante da frame
+    def update_position(self, position, frame_time):
+        if self.position_filter is not None:
+            self.position_filter.update(position, frame_time)
+
+    def get_position(self, now):
+        if self.position_filter is None:
+            return None
+
+        return self.position_filter.predict(now)
+
+    def set_camera(self, camera):
+        self.camera = camera
+
+    def set_recorder(self, recorder):
+        self.recorder = recorder
+
+    # chamado pelos detetores depois de processarem cada frame da câmara
+    def record_frame(self, frame, frame_time):
+        self.decision_time = frame_time
+
+        if self.recorder is not None:
+            self.recorder.add(frame, frame_time, self.is_start, self.part_of_screen)
+
+    # chamado pelos detetores quando o jogador clica na câmara
+    def record_click(self, x, y):
+        if self.recorder is not None:
+            self.recorder.set_click_pixel(x, y)
+
+    def set_quality_governor(self, quality_governor):
+        self.quality_governor = quality_governor
+
+    # chamado pelos detetores com o tempo de processamento de cada frame
+    def update_quality(self, processing_time):
+        if self.quality_governor is None:
+            return
+
+        # os níveis são calculados na primeira frame, a partir das opções com que o detetor foi criado
+        if self.quality_governor.levels is None:
+            self.quality_governor.set_levels(self.get_quality_levels())
+
+        quality = self.quality_governor.update(processing_time)
+        if quality is not None:
+            self.set_quality(quality)
+
+    # parâmetros de cada nível de qualidade, do melhor para o pior (os detetores sem níveis têm só um)
+    def get_quality_levels(self):
+        return [{}]
+
+    # aplicar os parâmetros de um nível de qualidade
+    def set_quality(self, quality):
+        pass
+
+    # nível de qualidade atual e as suas mudanças, sem governador não há estatísticas
+    def get_quality_stats(self):
+        if self.quality_governor is None:
+            return {}
+
+        return self.quality_governor.get_stats()
+
+    def start(self):
+        pass
+
+    def join(self):
+        pass
+
+    def is_alive(self):
+        return False
+
+
+class KeyboardController(Controller):
+    start_message = 'Pressione Espaço'
+
+    def __init__(self):
+        Controller.__init__(self)
+
+        # teclas pressionadas, para o paddle não parar ao largar uma tecla enquanto a outra continua pressionada
+        self.pressed_keys = set()
+
+    def attach(self, game):
+        game.canvas.bind('<KeyPress-Left>', lambda event: self.press_key('Left'))
+        game.canvas.bind('<KeyPress-Right>', lambda event: self.press_key('Right'))
+        game.canvas.bind('<KeyRelease-Left>', lambda event: self.release_key('Left'))
+        game.canvas.bind('<KeyRelease-Right>', lambda event: self.release_key('Right'))
+        game.canvas.bind('<space>', lambda event: self.start_game())
+
+    def start_game(self):
+        self.is_start = True
+
+    def press_key(self, key):
+        self.pressed_keys.add(key)
+        self.update_part_of_screen()
+
+    def release_key(self, key):
+        self.pressed_keys.discard(key)
+        self.update_part_of_screen()
+
+    def update_part_of_screen(self):
+        if 'Left' in self.pressed_keys and 'Right' not in self.pressed_keys:
+            self.part_of_screen = Part_Of_Screen.LEFT
+        elif 'Right' in self.pressed_keys and 'Left' not in self.pressed_keys:
+            self.part_of_screen = Part_Of_Screen.RIGHT
+        else:
+            self.part_of_screen = Part_Of_Screen.NONE
+
+
+# segue a bola sozinho, útil para testar o jogo sem câmara
+class AutopilotController(Controller):
+    start_message = 'Piloto Automático'
+
+    def __init__(self, dead_zone=10):
+        Controller.__init__(self)
+
+        # distância (em pixels) entre a bola e o centro do paddle a partir da qual o paddle se move
+        self.dead_zone = dead_zone
+        self.is_start = True
+
+    def update(self, board):
+        if board.ball is None:
+            self.part_of_screen = Part_Of_Screen.NONE
+            return
+
+        ball_coords = board.ball.get_position()
+        paddle_coords = board.paddle.get_position()
+        offset = (ball_coords[0] + ball_coords[2]) * 0.5 - (paddle_coords[0] + paddle_coords[2]) * 0.5
+
+        if offset < -self.dead_zone:
+            self.part_of_screen = Part_Of_Screen.LEFT
+        elif offset > self.dead_zone:
+            self.part_of_screen = Part_Of_Screen.RIGHT
+        else:
+            self.part_of_screen = Part_Of_Screen.NONE
+
+
+# repete as decisões guardadas num ficheiro de texto, uma por ciclo do jogo (NONE, LEFT, MIDDLE ou RIGHT)
+class ReplayController(Controller):
+    start_message = 'Repetição'
+
+    def __init__(self, replay_path):
+        Controller.__init__(self)
+
+        with open(replay_path) as replay_file:
+            self.decisions = [Part_Of_Screen[line.strip().upper()] for line in replay_file if line.strip()]
+
+        self.decision_index = 0
+        self.is_start = True
+
+    def update(self, board):
+        # depois da última decisão o paddle fica parado
+        if self.decision_index < len(self.decisions):
+            self.part_of_screen = self.decisions[self.decision_index]
+            self.decision_index += 1
+        else:
+            self.part_of_screen = Part_Of_Screen.NONE
+
+
+register_controller('cor', 'Segmentation', 'Segmentation')
+register_controller('movimento', 'OpticalFlow', 'OpticalFlow')
+register_controller('faces', 'FaceDetection', 'FaceDetection')
+register_controller('fundo', 'BackgroundSubtraction', 'BackgroundSubtraction')
+register_controller('fusao', 'Fusion', 'Fusion')
+register_controller('teclado', 'Controllers', 'KeyboardController')
+register_controller('autopiloto', 'Controllers', 'AutopilotController')
+register_controller('repeticao', 'Controllers', 'ReplayController')
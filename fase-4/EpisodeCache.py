@@ -0,0 +1,105 @@
+# descrição:        cache persistente dos resultados de jogos completos sem janela (ver avaliar.py), para as
+#                   avaliações de controladores em muitos tabuleiros e seeds não repetirem jogos já jogados.
+#                   cada resultado é guardado com uma chave que é o hash do controlador e dos seus parâmetros, do
+#                   tabuleiro, da versão da lógica do jogo (o conteúdo dos ficheiros do jogo) e da seed. a cache é
+#                   uma base de dados sqlite, que vários processos podem ler e escrever ao mesmo tempo, com um
+#                   número máximo de resultados: quando passa o máximo, saem os usados há mais tempo.
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+
+# ficheiros com a lógica do jogo e dos controladores sem câmara: qualquer alteração muda os resultados dos jogos,
+# por isso faz parte da chave
+ENGINE_FILES = ['Game.py', 'HeadlessCanvas.py', 'Controllers.py']
+
+
+# versão da lógica do jogo: hash do conteúdo dos ficheiros do jogo
+def get_engine_version():
+    engine_hash = hashlib.sha256()
+
+    for file_name in ENGINE_FILES:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name), 'rb') as engine_file:
+            engine_hash.update(engine_file.read())
+
+    return engine_hash.hexdigest()[:16]
+
+
+# chave de um jogo: hash de tudo o que decide o resultado (os parâmetros têm de ser serializáveis em JSON)
+def get_episode_key(controller, parameters, layout, engine_version, seed):
+    description = json.dumps({'controller': controller, 'parameters': parameters, 'layout': layout,
+                              'engine': engine_version, 'seed': seed}, sort_keys=True)
+
+    return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+
+class EpisodeCache(object):
+    # path: ficheiro da base de dados,
+    # max_entries: resultados guardados, os usados há mais tempo são removidos quando há mais,
+    # eviction_interval: resultados novos entre cada remoção (a contagem percorre a tabela toda, por isso não é
+    #                    feita em cada resultado, e a cache pode passar o máximo em até eviction_interval resultados
+    #                    por processo)
+    def __init__(self, path, max_entries=100000, eviction_interval=100):
+        self.path = path
+        self.max_entries = max_entries
+        self.eviction_interval = eviction_interval
+
+        # cada processo tem a sua ligação (as ligações não podem ser partilhadas entre processos),
+        # o journal WAL deixa ler enquanto outro processo escreve, e o timeout espera pelos outros escritores
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS episodes (key TEXT PRIMARY KEY, result TEXT NOT NULL, '
+                                'last_used REAL NOT NULL)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS episodes_last_used ON episodes (last_used)')
+
+        self.hits = 0
+        self.misses = 0
+        self.new_entries = 0
+
+    # resultado guardado de um jogo (ou None), o jogo passa a ser o usado mais recentemente
+    def get(self, key):
+        row = self.connection.execute('SELECT result FROM episodes WHERE key = ?', (key,)).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.connection.execute('UPDATE episodes SET last_used = ? WHERE key = ?', (time.time(), key))
+        self.hits += 1
+
+        return json.loads(row[0])
+
+    def put(self, key, result):
+        self.connection.execute('INSERT OR REPLACE INTO episodes (key, result, last_used) VALUES (?, ?, ?)',
+                                (key, json.dumps(result), time.time()))
+        self.new_entries += 1
+
+        if self.new_entries % self.eviction_interval == 0:
+            self.evict()
+
+    # remover os resultados usados há mais tempo, até ficarem no máximo max_entries
+    # (numa transação, para dois processos não removerem ao mesmo tempo)
+    def evict(self):
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            entries = self.connection.execute('SELECT COUNT(*) FROM episodes').fetchone()[0]
+
+            if entries > self.max_entries:
+                self.connection.execute('DELETE FROM episodes WHERE key IN (SELECT key FROM episodes '
+                                        'ORDER BY last_used LIMIT ?)', (entries - self.max_entries,))
+        finally:
+            self.connection.execute('COMMIT')
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM episodes').fetchone()[0]
+
+    def close(self):
+        self.evict()
+        self.connection.close()
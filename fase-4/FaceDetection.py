@@ -0,0 +1,300 @@
+# descrição:        classe responsável pela deteção de faces da transmissão de vídeo (câmara) do computador,
+#                   para assim manipular o paddle do jogo através dessa deteção.
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         10-12-2022
+# modificado a:     18-10-2026
+
+
+import os
+import time
+import cv2 as cv
+import numpy as np
+from threading import Thread, Lock
+from CameraDetector import CameraDetector
+from Controllers import Part_Of_Screen
+from Instrumentation import timings
+
+
+# modelo pré-treinado de viola-jones disponibilizado pelo OpenCV, guardado com a fase 3
+# (relativo a este ficheiro e não à pasta atual)
+HAARCASCADE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fase-3', 'models',
+                                'haarcascade_frontalface_default.xml')
+
+# classificadores já carregados, para não voltar a ler o modelo sempre que é criada uma deteção de faces
+cascade_cache = {}
+cascade_cache_lock = Lock()
+
+
+class FaceDetection(CameraDetector):
+    paddle_speed = 10
+
+    def __init__(self, processing_scale=1.0, detection_interval=1, preview_mode='frames', preview_every=1,
+                 preview_fps=30):
+        CameraDetector.__init__(self, preview_mode, preview_every, preview_fps)
+
+        self.frame = None
+        self.frame_time = None
+        self.part_of_screen = Part_Of_Screen.NONE
+
+        # escala a que a deteção de faces é feita (1.0 = resolução original da câmara),
+        # o resultado é só esquerda/direita, por isso uma frame reduzida é suficiente
+        self.processing_scale = processing_scale
+
+        # classificador de viola-jones e retângulo da última face detetada (em coordenadas da frame original)
+        self.face_cascade = None
+        self.face_rectangle = None
+
+        # modo híbrido: o classificador só é aplicado a cada N frames (ou quando o seguimento falha),
+        # e nas restantes a face é seguida por template matching numa janela à volta da última posição
+        self.detection_interval = detection_interval
+        self.frames_since_detection = 0
+        self.tracking_threshold = 0.6
+
+        # última face (na escala de processamento) e a sua imagem, usada como template no seguimento
+        self.last_face = None
+        self.face_template = None
+
+        # estatísticas do processamento (frames, frames com classificador e frames seguidas)
+        self.stats = {
+            'frames': 0,
+            'detections': 0,
+            'tracked_frames': 0
+        }
+
+    # chamada pela pré-visualização para obter a frame a mostrar (com a face detetada, se o jogo já iniciou)
+    def draw_preview(self):
+        if not self.is_start:
+            image_preview = self.get_buffer('preview', self.frame.shape)
+            np.copyto(image_preview, self.frame)
+            return image_preview
+
+        return self.draw_face()
+
+    # carregar o classificador de faces em paralelo com a abertura da câmara
+    # (só é preciso quando o jogo iniciar, mas tem de estar pronto antes disso)
+    def open_camera(self):
+        cascade_thread = Thread(target=self.load_face_cascade)
+        cascade_thread.start()
+
+        camera = CameraDetector.open_camera(self)
+        cascade_thread.join()
+
+        return camera
+
+    def load_face_cascade(self):
+        # criar o classificador para aplicar o modelo, ou reutilizar o que já foi carregado
+        with cascade_cache_lock:
+            if HAARCASCADE_PATH not in cascade_cache:
+                cascade_cache[HAARCASCADE_PATH] = cv.CascadeClassifier(HAARCASCADE_PATH)
+
+            self.face_cascade = cascade_cache[HAARCASCADE_PATH]
+
+        self.startup_times['cascade_loaded'] = time.perf_counter()
+
+    # processar uma frame da câmara, sem qualquer janela (usado também pelo benchmark)
+    def process_frame(self, frame, frame_time=None):
+        return self.process_cached_frame(self.frame_cache.add(frame, frame_time))
+
+    # processar uma frame já adicionada a uma cache de pré-processamento (partilhada com outros detetores na fusão)
+    def process_cached_frame(self, preprocessed_frame):
+        self.frame = preprocessed_frame.flipped()
+        self.frame_time = preprocessed_frame.frame_time
+
+        # se o jogo ainda não iniciou, apenas guardar a frame para a mostrar
+        if not self.is_start:
+            return self.part_of_screen
+
+        # quando a deteção não é feita pelo run (ex.: na fusão), o classificador é carregado na primeira frame
+        if self.face_cascade is None:
+            self.load_face_cascade()
+
+        # preparar frame para efetuar a deteção de faces
+        frame_prepared = self.prepare_frame(preprocessed_frame)
+
+        self.detect_face(frame_prepared)
+
+        return self.part_of_screen
+
+    # níveis de qualidade para o governador (ver QualityGovernor), do melhor (as opções pedidas) para o pior:
+    # menos frames na pré-visualização, o classificador aplicado menos vezes (seguindo a face nas outras frames)
+    # e depois frames mais reduzidas
+    def get_quality_levels(self):
+        return [dict(processing_scale=self.processing_scale * scale, preview_divisor=preview_divisor,
+                     detection_interval=max(self.detection_interval, detection_interval))
+                for scale, preview_divisor, detection_interval in [(1, 1, 1), (1, 2, 1), (1, 2, 3), (0.75, 2, 3),
+                                                                   (0.5, 4, 6), (0.35, 4, 6)]]
+
+    def set_quality(self, quality):
+        # com outra escala a última face e o seu template já não servem, a face volta a ser procurada
+        if quality['processing_scale'] != self.processing_scale:
+            self.processing_scale = quality['processing_scale']
+            self.last_face = None
+            self.face_template = None
+
+        self.detection_interval = quality['detection_interval']
+
+        if self.preview is not None:
+            self.preview.set_rate_divisor(quality['preview_divisor'])
+
+    # preparar cada frame para cada deteção de faces: grayscale (antes de reduzir, para redimensionar só um canal)
+    # e reduzida para a escala de processamento
+    def prepare_frame(self, preprocessed_frame):
+        return preprocessed_frame.scaled(self.processing_scale, gray=True)
+
+    def detect_face(self, frame_prepared):
+        self.stats['frames'] += 1
+        self.frames_since_detection += 1
+
+        face = None
+
+        # seguir a face nas frames entre deteções
+        if self.face_template is not None and self.frames_since_detection < self.detection_interval:
+            face = self.track_face(frame_prepared)
+
+        # aplicar o classificador quando chegou a vez dele ou quando o seguimento falhou
+        if face is None:
+            face = self.detect_face_with_cascade(frame_prepared)
+
+        self.face_rectangle = None
+
+        # se não existem faces, não é necessário fazer mais nada
+        if face is not None:
+            # converter o retângulo da face para a frame original
+            (x, y, w, h) = [int(value / self.processing_scale) for value in face]
+            self.face_rectangle = (x, y, w, h)
+
+            (center_x, center_y) = self.get_rectangle_center(x, y, w, h)
+
+            # verificar se existe um valor válido para o centro da face,
+            # dado que se existir o centro da face, podemos considerar que a face também existe
+            if center_x != -1:
+                # descobrir em que lado da tela está a face
+                self.part_of_screen = self.find_screen_side_belongs(center_x)
+
+                # posição contínua da face, para o paddle a seguir (se o filtro de posição estiver ativo)
+                self.update_position(center_x / self.get_screen_width(self.frame), self.frame_time)
+
+    def detect_face_with_cascade(self, frame_prepared):
+        self.stats['detections'] += 1
+        self.frames_since_detection = 0
+
+        # lista de todos os retângulos das faces detetadas na frame,
+        # se já existe uma face, só são procuradas faces de tamanho parecido (o que é muito mais rápido)
+        start_time = timings.now()
+        if self.last_face is not None:
+            face_width = self.last_face[2]
+            min_size = (int(face_width * 0.7), int(face_width * 0.7))
+            max_size = (int(face_width * 1.4), int(face_width * 1.4))
+            faces = self.face_cascade.detectMultiScale(frame_prepared, minSize=min_size, maxSize=max_size)
+        else:
+            faces = self.face_cascade.detectMultiScale(frame_prepared)
+        timings.record('detectMultiScale', start_time)
+
+        # quantidade de faces detetadas
+        faces_count = len(faces)
+
+        # sem faces, a próxima deteção volta a procurar faces de todos os tamanhos
+        if faces_count == 0:
+            self.last_face = None
+            self.face_template = None
+            return None
+
+        # obter o retângulo da maior face detetada e guardar a sua imagem para o seguimento
+        (x, y, w, h) = self.find_biggest_rectangle(faces)
+        self.last_face = (x, y, w, h)
+        self.face_template = self.get_buffer('template', (h, w))
+        np.copyto(self.face_template, frame_prepared[y:y + h, x:x + w])
+
+        return self.last_face
+
+    def track_face(self, frame_prepared):
+        (x, y, w, h) = self.last_face
+        frame_height, frame_width = frame_prepared.shape
+
+        # janela de procura à volta da última face, com metade do tamanho da face em cada lado
+        window_left = max(0, x - w // 2)
+        window_top = max(0, y - h // 2)
+        window_right = min(frame_width, x + w + w // 2)
+        window_bottom = min(frame_height, y + h + h // 2)
+
+        search_window = frame_prepared[window_top:window_bottom, window_left:window_right]
+
+        # a face saiu quase toda da frame
+        if search_window.shape[0] < h or search_window.shape[1] < w:
+            return None
+
+        # procurar a posição da janela mais parecida com o template da face
+        result_shape = (search_window.shape[0] - h + 1, search_window.shape[1] - w + 1)
+        start_time = timings.now()
+        result = cv.matchTemplate(search_window, self.face_template, cv.TM_CCOEFF_NORMED,
+                                  result=self.get_buffer('template_result', result_shape, np.float32))
+        min_value, max_value, min_location, max_location = cv.minMaxLoc(result)
+        timings.record('matchTemplate', start_time)
+
+        # confiança baixa, é melhor aplicar o classificador
+        if max_value < self.tracking_threshold:
+            return None
+
+        self.stats['tracked_frames'] += 1
+        self.last_face = (window_left + max_location[0], window_top + max_location[1], w, h)
+
+        return self.last_face
+
+    # obter as estatísticas do processamento, com o nível de qualidade (quando há governador da qualidade)
+    def get_stats(self):
+        return dict(self.stats, **self.get_quality_stats())
+
+    # desenhar a face detetada, apenas quando a frame é realmente mostrada
+    def draw_face(self):
+        # copiar a frame para o buffer da pré-visualização, para não modificar a frame da câmara
+        image_faces = self.get_buffer('preview', self.frame.shape)
+        np.copyto(image_faces, self.frame)
+
+        if self.face_rectangle is not None:
+            (x, y, w, h) = self.face_rectangle
+            (center_x, center_y) = self.get_rectangle_center(x, y, w, h)
+
+            # criar elipse à volta da face
+            cv.ellipse(image_faces, (center_x, center_y), (w // 2, h // 2), 0, 0, 360, (0, 0, 255), 4)
+
+        return image_faces
+
+    def find_biggest_rectangle(self, rectangles):
+        max_area = 0
+        biggest_rectangle = None
+
+        for (x, y, w, h) in rectangles:
+            current_area = w * h
+
+            if current_area > max_area:
+                max_area = current_area
+                biggest_rectangle = (x, y, w, h)
+
+        return biggest_rectangle
+
+    def get_rectangle_center(self, x, y, w, h):
+        return x + w // 2, y + h // 2
+
+    def get_screen_width(self, frame):
+        return frame.shape[1]
+
+    def get_screen_center_x(self, frame_width):
+        return frame_width / 2
+
+    def find_screen_side_belongs(self, x):
+        # obter a largura da tela e o centro dela no eixo x
+        frame_width = self.get_screen_width(self.frame)
+        frame_center_x = self.get_screen_center_x(frame_width)
+
+        belongs_to_left = 0 <= x <= frame_center_x
+        belongs_to_right = frame_center_x <= x <= frame_width
+
+        part_of_screen = Part_Of_Screen.NONE
+
+        # guardar em que parte da tela encontra-se o valor de x
+        if belongs_to_left:
+            part_of_screen = Part_Of_Screen.LEFT
+        elif belongs_to_right:
+            part_of_screen = Part_Of_Screen.RIGHT
+
+        return part_of_screen
@@ -0,0 +1,153 @@
+# descrição:        cache do pré-processamento de cada frame da câmara (espelhar, grayscale, redimensionar,
+#                   filtro gaussiano e HSV), identificada pelo número da frame, para que vários detetores
+#                   da mesma frame partilhem estes resultados em vez de os calcularem cada um.
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import time
+import cv2 as cv
+from threading import Lock, RLock
+from Buffers import Buffers
+from Instrumentation import timings
+
+
+class FrameCache(object):
+    # history: número de frames recentes guardadas (o optical flow ainda precisa da frame anterior,
+    # e a pré-visualização pode estar a mostrar uma frame enquanto a seguinte é processada)
+    def __init__(self, history=3):
+        self.history = history
+        self.next_frame_id = 0
+
+        # as frames são reutilizadas em anel (com os seus buffers, resultados e lock), por isso uma frame nova não
+        # aloca nada: a frame N ocupa o lugar da frame N - history
+        self.frames = [PreprocessedFrame(self) for i in range(history)]
+        self.lock = Lock()
+
+        # resultados calculados e resultados reaproveitados por outro detetor, atualizados pelos threads de
+        # vários detetores (cada um só tem o lock da sua frame), por isso com um lock próprio
+        self.stats = {
+            'computed': 0,
+            'reused': 0
+        }
+        self.stats_lock = Lock()
+
+    # adicionar uma frame nova da câmara no lugar da mais antiga, frame_time é o instante em que a frame foi obtida
+    # (por omissão, agora)
+    def add(self, frame, frame_time=None):
+        with self.lock:
+            frame_id = self.next_frame_id
+            self.next_frame_id += 1
+
+            if frame_time is None:
+                frame_time = time.perf_counter()
+
+            preprocessed_frame = self.frames[frame_id % self.history]
+            preprocessed_frame.reset(frame_id, frame, frame_time)
+
+        return preprocessed_frame
+
+    # frame pelo número, se ainda estiver na cache
+    def get(self, frame_id):
+        preprocessed_frame = self.frames[frame_id % self.history]
+
+        return preprocessed_frame if preprocessed_frame.frame_id == frame_id else None
+
+    def count_result(self, name):
+        with self.stats_lock:
+            self.stats[name] += 1
+
+    def get_stats(self):
+        with self.stats_lock:
+            return dict(self.stats)
+
+
+# resultados do pré-processamento de uma frame, calculados só quando algum detetor os pede pela primeira vez
+class PreprocessedFrame(Buffers):
+    def __init__(self, cache):
+        self.frame_id = -1
+        self.frame = None
+        self.frame_time = None
+        self.buffers = {}
+        self.cache = cache
+        self.results = {}
+
+        # os detetores podem pedir o mesmo resultado ao mesmo tempo, e só um deles o calcula
+        # (reentrante porque cada resultado pede os resultados anteriores, ex.: o HSV pede o filtro gaussiano)
+        self.lock = RLock()
+
+    # passar a ser a frame frame_id: os resultados da frame anterior são descartados, os buffers são reaproveitados
+    # (as chaves ficam no dicionário só com None, porque o clear libertava a tabela e cada frame voltava a criá-la)
+    def reset(self, frame_id, frame, frame_time):
+        with self.lock:
+            self.frame_id = frame_id
+            self.frame = frame
+            self.frame_time = frame_time
+
+            for key in self.results:
+                self.results[key] = None
+
+    def get_result(self, key, compute):
+        with self.lock:
+            result = self.results.get(key)
+
+            if result is None:
+                start_time = timings.now()
+                result = compute(key)
+                timings.record(key[0], start_time)
+                self.results[key] = result
+                self.cache.count_result('computed')
+            else:
+                self.cache.count_result('reused')
+
+        return result
+
+    # frame espelhada, para um buffer contínuo (o frame[:, ::-1, :] obrigava a cópias mais à frente)
+    def flipped(self):
+        return self.get_result(('flip',), self.compute_flipped)
+
+    def gray(self):
+        return self.get_result(('gray',), self.compute_gray)
+
+    # frame (a cores ou em grayscale) reduzida para a escala de processamento
+    def scaled(self, scale, gray=False):
+        if scale == 1.0:
+            return self.gray() if gray else self.flipped()
+
+        return self.get_result(('scale', scale, gray), self.compute_scaled)
+
+    # frame reduzida e com um filtro gaussiano para remover ruído
+    def blurred(self, scale, blur_size, gray=False):
+        return self.get_result(('blur', scale, blur_size, gray), self.compute_blurred)
+
+    def hsv(self, scale, blur_size):
+        return self.get_result(('hsv', scale, blur_size), self.compute_hsv)
+
+    # cálculo de cada resultado, só chamado quando o resultado ainda não está na frame
+    # (os parâmetros vêm na chave, assim não é criada uma função nova em cada pedido)
+    def compute_flipped(self, key):
+        return cv.flip(self.frame, 1, dst=self.get_buffer(key, self.frame.shape))
+
+    def compute_gray(self, key):
+        return cv.cvtColor(self.flipped(), cv.COLOR_BGR2GRAY, dst=self.get_buffer(key, self.frame.shape[:2]))
+
+    def compute_scaled(self, key):
+        name, scale, gray = key
+        image = self.gray() if gray else self.flipped()
+        scaled_size = (round(image.shape[1] * scale), round(image.shape[0] * scale))
+
+        return cv.resize(image, scaled_size, dst=self.get_buffer(key, scaled_size[::-1] + image.shape[2:]),
+                         interpolation=cv.INTER_AREA)
+
+    def compute_blurred(self, key):
+        name, scale, blur_size, gray = key
+        image = self.scaled(scale, gray)
+
+        return cv.GaussianBlur(image, (blur_size, blur_size), 0, dst=self.get_buffer(key, image.shape))
+
+    def compute_hsv(self, key):
+        name, scale, blur_size = key
+        image = self.blurred(scale, blur_size)
+
+        return cv.cvtColor(image, cv.COLOR_BGR2HSV, dst=self.get_buffer(key, image.shape))
@@ -0,0 +1,130 @@
+# descrição:        classe responsável por vários detetores em simultâneo sobre a mesma transmissão de vídeo
+#                   (câmara), que partilham o pré-processamento de cada frame e cujas decisões são combinadas
+#                   numa só (ex.: a posição da face só move o paddle quando também há movimento).
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import cv2 as cv
+from concurrent.futures import ThreadPoolExecutor
+from CameraDetector import CameraDetector
+from Controllers import Part_Of_Screen
+from Instrumentation import timings
+
+
+class Fusion(CameraDetector):
+    # detectors: detetores já criados (não são iniciados como threads, só processam as frames dadas pela fusão),
+    # fusion_rule: 'portao' (decisão do primeiro detetor, só quando todos os outros detetam algo)
+    #              ou 'maioria' (decisão com mais votos, sem empates)
+    def __init__(self, detectors, fusion_rule='portao', preview_mode='frames', preview_every=1, preview_fps=30):
+        CameraDetector.__init__(self, preview_mode, preview_every, preview_fps)
+
+        self.detectors = detectors
+        self.fusion_rule = fusion_rule
+
+        # o paddle anda à velocidade do detetor principal
+        self.paddle_speed = detectors[0].paddle_speed
+
+        # cada frame é pré-processada uma só vez para todos os detetores (na cache da fusão),
+        # e os detetores processam a mesma frame em paralelo (o OpenCV liberta o GIL)
+        self.detectors_pool = ThreadPoolExecutor(max_workers=len(detectors))
+
+        # última frame e decisões de cada detetor nessa frame
+        self.preprocessed_frame = None
+        self.decisions = [Part_Of_Screen.NONE] * len(detectors)
+
+    # terminar os threads que processam as frames nos detetores
+    def release_resources(self):
+        self.detectors_pool.shutdown()
+
+    # chamada pela pré-visualização para obter a frame a mostrar (a do detetor principal)
+    def draw_preview(self):
+        return self.detectors[0].draw_preview()
+
+    # processar uma frame da câmara em todos os detetores, e combinar as decisões deles
+    def process_frame(self, frame, frame_time=None):
+        self.preprocessed_frame = self.frame_cache.add(frame, frame_time)
+
+        start_time = timings.now()
+        decisions = self.detectors_pool.map(self.process_detector_frame, self.detectors)
+        self.decisions = list(decisions)
+        timings.record('fusion_detectors', start_time)
+
+        if self.is_start:
+            self.part_of_screen = self.fuse_decisions(self.decisions)
+
+        return self.part_of_screen
+
+    def process_detector_frame(self, detector):
+        # o lock do detetor protege a frame dele de um clique na câmara a meio do processamento
+        with detector.frame_lock:
+            return detector.process_cached_frame(self.preprocessed_frame)
+
+    def click_in_camera_and_start_game(self, event, x, y, flags, param):
+        # sai da função, quando o utilizador clica na câmara e o jogo já está em andamento
+        if self.is_start:
+            return
+
+        if event == cv.EVENT_LBUTTONUP:
+            # iniciar todos os detetores (o de cor também usa o pixel clicado para escolher a cor do objeto)
+            for detector in self.detectors:
+                detector.click_in_camera_and_start_game(event, x, y, flags, param)
+
+            self.record_click(x, y)
+            self.is_start = True
+
+    # o nível N da fusão é o nível N de cada detetor (ou o pior nível dele, se tiver menos níveis),
+    # e a pré-visualização segue o detetor principal
+    def get_quality_levels(self):
+        detectors_levels = [detector.get_quality_levels() for detector in self.detectors]
+        levels_count = max(len(detector_levels) for detector_levels in detectors_levels)
+
+        levels = []
+        for level in range(levels_count):
+            detectors_quality = [detector_levels[min(level, len(detector_levels) - 1)]
+                                 for detector_levels in detectors_levels]
+            levels.append(dict(detectors=detectors_quality,
+                               preview_divisor=detectors_quality[0].get('preview_divisor', 1)))
+
+        return levels
+
+    # os detetores não estão a processar nenhuma frame (a fusão tem o lock da frame), por isso podem mudar
+    def set_quality(self, quality):
+        for detector, detector_quality in zip(self.detectors, quality['detectors']):
+            detector.set_quality(detector_quality)
+
+        if self.preview is not None:
+            self.preview.set_rate_divisor(quality['preview_divisor'])
+
+    # a posição contínua é a do detetor principal (o optical flow não mede posições)
+    def set_position_filter(self, position_filter):
+        self.detectors[0].set_position_filter(position_filter)
+
+    def get_position(self, now):
+        return self.detectors[0].get_position(now)
+
+    def fuse_decisions(self, decisions):
+        # o meio (do detetor de cor) também significa que o paddle não se move
+        decisions = [Part_Of_Screen.NONE if decision == Part_Of_Screen.MIDDLE else decision for decision in decisions]
+
+        if self.fusion_rule == 'maioria':
+            left_votes = decisions.count(Part_Of_Screen.LEFT)
+            right_votes = decisions.count(Part_Of_Screen.RIGHT)
+            none_votes = decisions.count(Part_Of_Screen.NONE)
+
+            if left_votes > max(right_votes, none_votes):
+                return Part_Of_Screen.LEFT
+            elif right_votes > max(left_votes, none_votes):
+                return Part_Of_Screen.RIGHT
+
+            return Part_Of_Screen.NONE
+
+        # portão: os restantes detetores só confirmam que há algo (ex.: movimento) para o principal mover o paddle
+        if Part_Of_Screen.NONE in decisions[1:]:
+            return Part_Of_Screen.NONE
+
+        return decisions[0]
+
+    def get_stats(self):
+        return self.frame_cache.get_stats()
@@ -0,0 +1,393 @@
+# descrição:        classe responsável pelo jogo (elementos, eventos, UI, etc.),
+#                   comum a todos os controladores do paddle.
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         9-12-2022
+# modificado a:     18-10-2026
+
+
+import time
+import tkinter as tk
+from enum import Enum
+from Controllers import Part_Of_Screen
+from Instrumentation import timings
+
+
+class GameObject(object):
+    def __init__(self, canvas, item):
+        self.canvas = canvas
+        self.item = item
+
+    def get_position(self):
+        return self.canvas.coords(self.item)
+
+    def move(self, x, y):
+        self.canvas.move(self.item, x, y)
+
+    def delete(self):
+        self.canvas.delete(self.item)
+
+
+class Ball(GameObject):
+    def __init__(self, canvas, x, y):
+        self.radius = 10
+        self.direction = [1, -1]
+        # increase the below value to increase the speed of ball
+        self.speed = 5
+        item = canvas.create_oval(x - self.radius, y - self.radius,
+                                  x + self.radius, y + self.radius,
+                                  fill='white')
+        super(Ball, self).__init__(canvas, item)
+
+    def update(self):
+        coords = self.get_position()
+        width = self.canvas.winfo_width()
+        if coords[0] <= 0 or coords[2] >= width:
+            self.direction[0] *= -1
+        if coords[1] <= 0:
+            self.direction[1] *= -1
+        x = self.direction[0] * self.speed
+        y = self.direction[1] * self.speed
+        self.move(x, y)
+
+    def collide(self, game_objects):
+        coords = self.get_position()
+        x = (coords[0] + coords[2]) * 0.5
+        if len(game_objects) > 1:
+            self.direction[1] *= -1
+        elif len(game_objects) == 1:
+            game_object = game_objects[0]
+            coords = game_object.get_position()
+            if x > coords[2]:
+                self.direction[0] = 1
+            elif x < coords[0]:
+                self.direction[0] = -1
+            else:
+                self.direction[1] *= -1
+
+        for game_object in game_objects:
+            if isinstance(game_object, Brick):
+                game_object.hit()
+
+
+class Paddle(GameObject):
+    # uma cor por jogador
+    COLORS = ['#FFB643', '#43A6FF', '#6BCB77', '#FF6B6B']
+
+    # min_x / max_x: zona da janela onde o paddle se pode mexer (por omissão a janela toda)
+    def __init__(self, canvas, x, y, color='#FFB643', min_x=0, max_x=None):
+        self.width = 80
+        self.height = 10
+        self.ball = None
+        self.min_x = min_x
+        self.max_x = max_x
+        item = canvas.create_rectangle(x - self.width / 2,
+                                       y - self.height / 2,
+                                       x + self.width / 2,
+                                       y + self.height / 2,
+                                       fill=color)
+        super(Paddle, self).__init__(canvas, item)
+
+    def set_ball(self, ball):
+        self.ball = ball
+
+    def get_max_x(self):
+        return self.max_x if self.max_x is not None else self.canvas.winfo_width()
+
+    def move(self, offset):
+        coords = self.get_position()
+        if coords[0] + offset >= self.min_x and coords[2] + offset <= self.get_max_x():
+            super(Paddle, self).move(offset, 0)
+            if self.ball is not None:
+                self.ball.move(offset, 0)
+
+
+class Brick(GameObject):
+    COLORS = {1: '#4535AA', 2: '#ED639E', 3: '#8FE1A2'}
+
+    def __init__(self, canvas, x, y, hits):
+        self.width = 75
+        self.height = 20
+        self.hits = hits
+        color = Brick.COLORS[hits]
+        item = canvas.create_rectangle(x - self.width / 2,
+                                       y - self.height / 2,
+                                       x + self.width / 2,
+                                       y + self.height / 2,
+                                       fill=color, tags='brick')
+        super(Brick, self).__init__(canvas, item)
+
+    def hit(self):
+        self.hits -= 1
+        if self.hits == 0:
+            self.delete()
+        else:
+            self.canvas.itemconfig(self.item,
+                                   fill=Brick.COLORS[self.hits])
+
+
+# estado do tabuleiro depois de cada ciclo do jogo
+class Board_State(Enum):
+    PLAYING = 0
+    WON = 1
+    BALL_LOST = 2
+    LOST = 3
+
+
+# tijolos (x, y e número de toques) em linhas de 75 pixels de largura, com 3, 2 e 1 toques de cima para baixo
+# (o jogo usa 3 linhas de 8 tijolos, os benchmarks usam tabuleiros maiores)
+def get_bricks_layout(columns=8, rows=3):
+    return [(5 + column * 75 + 37.5, 50 + row * 20, 3 - row % 3) for row in range(rows) for column in range(columns)]
+
+
+# lógica do jogo (paddle, bola, tijolos e vidas), separada da janela para também correr sem Tk
+class Board(object):
+    # canvas: tela do tkinter, ou uma HeadlessCanvas (sem janela),
+    # bricks: lista de tijolos (ver get_bricks_layout),
+    # players: número de paddles, cada um na sua zona da janela (da esquerda para a direita)
+    def __init__(self, canvas, width=610, height=400, bricks=None, players=1):
+        self.canvas = canvas
+        self.width = width
+        self.height = height
+        self.lives = 3
+
+        self.items = {}
+        self.ball = None
+
+        self.paddles = []
+        zone_width = self.width / players
+        for player in range(players):
+            paddle = Paddle(self.canvas, zone_width * (player + 0.5), self.height - 74,
+                            Paddle.COLORS[player % len(Paddle.COLORS)], zone_width * player,
+                            zone_width * (player + 1) if players > 1 else None)
+            self.paddles.append(paddle)
+            self.items[paddle.item] = paddle
+
+        # a bola começa sempre no paddle do primeiro jogador
+        self.paddle = self.paddles[0]
+
+        # adding brick with different hit capacities - 3,2 and 1
+        if bricks is None:
+            bricks = get_bricks_layout()
+
+        for x, y, hits in bricks:
+            self.add_brick(x, y, hits)
+
+        # deslocamento máximo do paddle por ciclo quando segue uma posição contínua
+        self.paddle_max_speed = 30
+
+        # tijolos que faltam partir, atualizado em cada ciclo
+        self.bricks_count = len(bricks)
+
+        # tijolos tocados no último ciclo (ex.: para enviar só as alterações do tabuleiro, ver servidor_jogos.py)
+        self.hit_bricks = []
+
+    def add_ball(self):
+        if self.ball is not None:
+            self.ball.delete()
+        paddle_coords = self.paddle.get_position()
+
+        x = (paddle_coords[0] + paddle_coords[2]) * 0.5
+        self.ball = Ball(self.canvas, x, paddle_coords[1] - 11)
+        self.paddle.set_ball(self.ball)
+
+    def add_brick(self, x, y, hits):
+        brick = Brick(self.canvas, x, y, hits)
+        self.items[brick.item] = brick
+
+    # um ciclo do jogo: mover cada paddle com a decisão do seu controlador (um por jogador),
+    # tratar as colisões e mover a bola
+    def tick(self, controllers, now):
+        start_time = timings.now()
+        for paddle, controller in zip(self.paddles, controllers):
+            self.move_paddle(paddle, controller, now)
+        timings.record('game_paddle', start_time)
+
+        start_time = timings.now()
+        self.check_collisions()
+        timings.record('game_collisions', start_time)
+
+        self.bricks_count = len(self.canvas.find_withtag('brick'))
+        if self.bricks_count == 0:
+            self.ball.speed = None
+            return Board_State.WON
+        elif self.ball.get_position()[3] >= self.height:
+            self.ball.speed = None
+            self.lives -= 1
+            if self.lives < 0:
+                return Board_State.LOST
+            return Board_State.BALL_LOST
+
+        start_time = timings.now()
+        self.ball.update()
+        timings.record('game_ball', start_time)
+
+        return Board_State.PLAYING
+
+    def move_paddle(self, paddle, controller, now):
+        controller.update(self)
+
+        # com o filtro de posição o paddle segue a posição prevista para agora (dentro da zona do paddle),
+        # senão (ou enquanto não há medições) anda por passos fixos para o lado onde está o objeto
+        position = controller.get_position(now)
+
+        if position is not None:
+            self.move_paddle_to(paddle, paddle.min_x + position * (paddle.get_max_x() - paddle.min_x))
+        else:
+            part_of_screen = controller.part_of_screen
+
+            if part_of_screen == Part_Of_Screen.LEFT:
+                paddle.move(-controller.paddle_speed)
+            elif part_of_screen == Part_Of_Screen.RIGHT:
+                paddle.move(controller.paddle_speed)
+            else:
+                paddle.move(0)
+
+    def move_paddle_to(self, paddle, x):
+        paddle_coords = paddle.get_position()
+
+        # deslocamento até ao centro pedido, limitado à velocidade máxima e às margens da zona do paddle
+        offset = x - (paddle_coords[0] + paddle_coords[2]) * 0.5
+        offset = max(-self.paddle_max_speed, min(self.paddle_max_speed, offset))
+        offset = max(paddle.min_x - paddle_coords[0], min(paddle.get_max_x() - paddle_coords[2], offset))
+
+        paddle.move(offset)
+
+    # elementos do jogo em que a bola está a tocar
+    def find_collisions(self):
+        ball_coords = self.ball.get_position()
+        items = self.canvas.find_overlapping(*ball_coords)
+        return [self.items[x] for x in items if x in self.items]
+
+    def check_collisions(self):
+        game_objects = self.find_collisions()
+        self.ball.collide(game_objects)
+        self.hit_bricks = [game_object for game_object in game_objects if isinstance(game_object, Brick)]
+
+
+class Game(tk.Frame):
+    # controllers: controlador de cada jogador (um paddle por jogador),
+    # telemetry: registo do estado de cada ciclo do jogo (ver Telemetry), sem registo nada é guardado
+    def __init__(self, root, controllers, telemetry=None):
+        super(Game, self).__init__(root)
+        self.root = root
+
+        self.text_title = None
+        self.text_subtitle = None
+        self.width = 610
+        self.height = 400
+        self.canvas = tk.Canvas(self, bg='#D6D1F5', width=self.width, height=self.height)
+        self.canvas.pack()
+        self.pack()
+
+        self.board = Board(self.canvas, self.width, self.height, players=len(controllers))
+
+        self.hud = None
+
+        # os controladores já foram iniciados antes da janela do jogo,
+        # para as câmaras (se tiverem) abrirem em simultâneo
+        self.controllers = controllers
+        for controller in self.controllers:
+            controller.attach(self)
+
+        self.telemetry = telemetry
+
+        # instantes (time.perf_counter) do arranque do jogo: janela pronta e jogo pronto a jogar
+        self.startup_times = {}
+
+        self.root.protocol('WM_DELETE_WINDOW', self.click_in_close_game_window)
+
+        # self.setup_new_game()
+        self.text_title = self.draw_text(300, 180, 'Iniciar Jogo!')
+        self.text_subtitle = self.draw_text(300, 230, self.controllers[0].start_message)
+
+        self.canvas.focus_set()
+
+        # instantes do arranque do controlador do primeiro jogador (só os controladores com câmara os registam)
+        controller_startup_times = getattr(self.controllers[0], 'startup_times', {})
+
+        # o jogo só começa quando todos os jogadores estiverem prontos
+        while not all(controller.is_start for controller in self.controllers):
+            if self.is_finish():
+                self.click_in_close_game_window()
+                break
+
+            # permitir que seja mostrar a tela de jogo
+            self.root.update()
+
+            if 'game_window_ready' not in self.startup_times:
+                self.startup_times['game_window_ready'] = time.perf_counter()
+
+            # o jogo está pronto a jogar quando a janela do jogo e a primeira frame da câmara já são mostradas
+            if 'playable' not in self.startup_times and 'first_frame' in controller_startup_times:
+                self.startup_times['playable'] = time.perf_counter()
+
+        # iniciar jogo quando os controladores estiverem prontos (ex.: após clicar na câmara)
+        if not self.is_finish():
+            self.setup_game()
+
+    def setup_game(self):
+        self.board.add_ball()
+        self.update_lives_text()
+        self.start_game()
+
+    def draw_text(self, x, y, text, size='28'):
+        font = ('Forte', size)
+        return self.canvas.create_text(x, y, text=text, font=font)
+
+    def update_lives_text(self):
+        text = 'Lives: %s' % self.board.lives
+        if self.hud is None:
+            self.hud = self.draw_text(50, 20, text, 15)
+        else:
+            self.canvas.itemconfig(self.hud, text=text)
+
+    def start_game(self):
+        self.canvas.delete(self.text_title)
+        self.canvas.delete(self.text_subtitle)
+        self.board.paddle.ball = None
+        self.game_loop()
+
+    def game_loop(self):
+        if self.is_finish():
+            self.click_in_close_game_window()
+            return
+
+        loop_start_time = timings.now()
+
+        now = time.perf_counter()
+        state = self.board.tick(self.controllers, now)
+
+        if self.telemetry is not None:
+            self.telemetry.add(now, state, self.board, self.controllers)
+
+        if state == Board_State.WON:
+            self.text_title = self.draw_text(300, 200, 'Ganhaste!')
+            self.click_in_close_game_window()
+        elif state == Board_State.LOST:
+            self.text_title = self.draw_text(300, 200, 'Perdeste!')
+            self.click_in_close_game_window()
+        elif state == Board_State.BALL_LOST:
+            self.after(1000, self.setup_game)
+        else:
+            self.after(50, self.game_loop)
+
+        timings.record('game_loop', loop_start_time)
+
+    # o jogo termina quando um dos controladores é encerrado
+    def is_finish(self):
+        return any(controller.is_finish for controller in self.controllers)
+
+    def click_in_close_game_window(self):
+        # se os controladores já foram encerrados, fechar apenas a janela do jogo
+        # (os controladores sem thread nunca estão vivos, por isso o primeiro clique só os encerra)
+        if all(not controller.is_alive() and controller.is_finish for controller in self.controllers):
+            self.close_game_window()
+            return
+
+        for controller in self.controllers:
+            controller.is_finish = True
+        for controller in self.controllers:
+            controller.join()
+
+    def close_game_window(self):
+        self.root.destroy()
@@ -0,0 +1,75 @@
+# descrição:        tela sem janela com as mesmas operações da tela do tkinter usadas pelo jogo (criar, mover e
+#                   apagar elementos, procurar sobreposições, etc.), para correr a lógica do jogo sem Tk
+#                   (ex.: benchmark do jogo).
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+class HeadlessCanvas(object):
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+        # coordenadas, etiquetas e opções de cada elemento, pela ordem em que foram criados
+        # (a mesma ordem de empilhamento da tela do tkinter)
+        self.coords_by_item = {}
+        self.tags_by_item = {}
+        self.options_by_item = {}
+        self.next_item = 1
+
+    def create_item(self, coords, options):
+        item = self.next_item
+        self.next_item += 1
+
+        tags = options.pop('tags', ())
+        self.coords_by_item[item] = [float(value) for value in coords]
+        self.tags_by_item[item] = (tags,) if isinstance(tags, str) else tuple(tags)
+        self.options_by_item[item] = options
+
+        return item
+
+    def create_oval(self, x0, y0, x1, y1, **options):
+        return self.create_item((x0, y0, x1, y1), options)
+
+    def create_rectangle(self, x0, y0, x1, y1, **options):
+        return self.create_item((x0, y0, x1, y1), options)
+
+    def create_text(self, x, y, **options):
+        return self.create_item((x, y), options)
+
+    def coords(self, item):
+        return list(self.coords_by_item.get(item, ()))
+
+    def move(self, item, x, y):
+        coords = self.coords_by_item.get(item)
+        if coords is None:
+            return
+
+        for index in range(0, len(coords), 2):
+            coords[index] += x
+            coords[index + 1] += y
+
+    def delete(self, item):
+        self.coords_by_item.pop(item, None)
+        self.tags_by_item.pop(item, None)
+        self.options_by_item.pop(item, None)
+
+    def itemconfig(self, item, **options):
+        if item in self.options_by_item:
+            self.options_by_item[item].update(options)
+
+    # elementos cujo retângulo toca no retângulo dado (as margens também contam, tal como no tkinter)
+    def find_overlapping(self, x0, y0, x1, y1):
+        return tuple(item for item, coords in self.coords_by_item.items()
+                     if len(coords) == 4 and coords[0] <= x1 and coords[2] >= x0
+                     and coords[1] <= y1 and coords[3] >= y0)
+
+    def find_withtag(self, tag):
+        return tuple(item for item, tags in self.tags_by_item.items() if tag in tags)
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
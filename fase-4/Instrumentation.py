@@ -0,0 +1,131 @@
+# descrição:        tempos de cada etapa do processamento (captura, espelhar, filtro gaussiano, optical flow,
+#                   classificador, imshow, ciclo do jogo, etc.), guardados em buffers circulares de tamanho fixo
+#                   e em histogramas, com resumos durante o jogo e exportação para JSON/CSV no fim.
+#                   está desligado por omissão, e nesse caso cada registo é só uma verificação.
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import bisect
+import csv
+import json
+import time
+from array import array
+from threading import Lock
+
+
+# limites (em milissegundos) dos intervalos do histograma, o último intervalo é tudo acima de 1000 ms
+HISTOGRAM_BOUNDS = [0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+
+
+# percentil de uma lista de valores (fraction entre 0 e 1), usado também pelos benchmarks e pelo servidor de jogos,
+# por isso este módulo não pode depender do OpenCV nem do numpy
+def get_percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class StageTimes(object):
+    # size: número de tempos recentes guardados (os mais antigos são substituídos)
+    def __init__(self, size):
+        self.size = size
+        self.times = array('d', [0.0] * size)
+        self.index = 0
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+        # contagem de todos os tempos desde o início, por intervalo do histograma
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+
+    def add(self, duration):
+        self.times[self.index] = duration
+        self.index = (self.index + 1) % self.size
+        self.count += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.histogram[bisect.bisect_left(HISTOGRAM_BOUNDS, duration * 1000)] += 1
+
+    def get_summary(self):
+        # os percentis são calculados sobre os tempos recentes, a média e o máximo sobre todos
+        recent_times = sorted(self.times[:min(self.count, self.size)])
+
+        return {
+            'count': self.count,
+            'mean_ms': self.total_time / self.count * 1000,
+            'p50_ms': get_percentile(recent_times, 0.5) * 1000,
+            'p90_ms': get_percentile(recent_times, 0.9) * 1000,
+            'p99_ms': get_percentile(recent_times, 0.99) * 1000,
+            'max_ms': self.max_time * 1000,
+            'histogram': self.histogram[:]
+        }
+
+
+class Instrumentation(object):
+    def __init__(self, size=1024):
+        self.size = size
+        self.enabled = False
+        self.stages = {}
+
+        # as etapas são registadas pelos threads da câmara, da pré-visualização e do jogo
+        self.lock = Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    # instante de início de uma etapa, a passar depois ao record
+    def now(self):
+        return time.perf_counter()
+
+    def record(self, stage, start_time):
+        if not self.enabled:
+            return
+
+        duration = time.perf_counter() - start_time
+
+        with self.lock:
+            stage_times = self.stages.get(stage)
+            if stage_times is None:
+                stage_times = StageTimes(self.size)
+                self.stages[stage] = stage_times
+
+            stage_times.add(duration)
+
+    def get_summary(self):
+        with self.lock:
+            return dict((stage, stage_times.get_summary()) for stage, stage_times in self.stages.items())
+
+    # resumo de uma linha por etapa, ordenado pelo tempo total (as etapas que mais pesam primeiro)
+    def format_summary(self):
+        summary = self.get_summary()
+        lines = ['%-22s %8s %9s %9s %9s %9s' % ('etapa', 'n', 'média', 'p50', 'p90', 'p99')]
+
+        for stage, stage_summary in sorted(summary.items(), key=lambda item: -item[1]['count'] * item[1]['mean_ms']):
+            lines.append('%-22s %8d %7.2fms %7.2fms %7.2fms %7.2fms' % (
+                stage, stage_summary['count'], stage_summary['mean_ms'], stage_summary['p50_ms'],
+                stage_summary['p90_ms'], stage_summary['p99_ms']))
+
+        return '\n'.join(lines)
+
+    def export_json(self, path):
+        with open(path, 'w') as json_file:
+            json.dump({'histogram_bounds_ms': HISTOGRAM_BOUNDS, 'stages': self.get_summary()}, json_file, indent=2)
+
+    def export_csv(self, path):
+        summary = self.get_summary()
+        histogram_columns = ['<=%gms' % bound for bound in HISTOGRAM_BOUNDS] + ['>%gms' % HISTOGRAM_BOUNDS[-1]]
+
+        with open(path, 'w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(['stage', 'count', 'mean_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms'] + histogram_columns)
+
+            for stage, stage_summary in sorted(summary.items()):
+                writer.writerow([stage] + [stage_summary[column] for column in
+                                           ('count', 'mean_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms')] +
+                                stage_summary['histogram'])
+
+
+# instância partilhada por todos os módulos (tal como a cache dos classificadores das faces),
+# ligada pelo main.py com --tempos
+timings = Instrumentation()
@@ -0,0 +1,252 @@
+# descrição:        modo de vários jogadores, cada um com o seu paddle e o seu detetor. o detetor de cada jogador
+#                   corre num processo próprio, para os jogadores usarem vários núcleos em vez de partilharem o GIL
+#                   de um só processo. cada jogador usa a sua câmara, uma zona da mesma câmara (as frames são
+#                   partilhadas entre os processos em memória partilhada) ou uma câmara sintética (para testar sem
+#                   câmaras). as decisões de cada jogador chegam ao jogo por um canal em memória partilhada, que o
+#                   jogo lê em cada ciclo.
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import multiprocessing
+import cv2 as cv
+import numpy as np
+from multiprocessing import shared_memory
+from threading import Thread
+from Controllers import Controller, Part_Of_Screen, create_controller, get_controller_class
+from SyntheticCamera import SyntheticCamera, DETECTOR_TARGETS
+from QualityGovernor import QualityGovernor
+
+
+# canal de controlo de um jogador, em memória partilhada: o processo do jogador escreve a decisão de cada frame e
+# as posições medidas, e o jogo lê os últimos valores em cada ciclo
+class ControlChannel(object):
+    def __init__(self):
+        # jogo iniciado, decisão (valor do Part_Of_Screen, -1 = nenhuma), instante da frame da decisão, última
+        # posição medida, instante dela e número de posições medidas até agora (para o jogo saber quando chegou
+        # uma posição nova)
+        self.values = multiprocessing.Array('d', [0, -1, 0, 0, 0, 0])
+
+    # chamada pelo detetor depois de cada frame, no lugar da gravação da sessão (ver Controller.record_frame)
+    def add(self, frame, frame_time, is_start, part_of_screen):
+        with self.values.get_lock():
+            self.values[0] = is_start
+            self.values[1] = part_of_screen.value
+            self.values[2] = frame_time
+
+    def set_click_pixel(self, x, y):
+        pass
+
+    # chamada pelo detetor com cada posição medida, no lugar do filtro de posição (ver Controller.update_position),
+    # o filtro de posição (se houver) é o do jogo, que prevê a posição no instante de cada ciclo
+    def update(self, position, measurement_time):
+        with self.values.get_lock():
+            self.values[3] = position
+            self.values[4] = measurement_time
+            self.values[5] += 1
+
+    def predict(self, now):
+        return None
+
+    def read(self):
+        with self.values.get_lock():
+            return tuple(self.values)
+
+
+# frames de uma câmara partilhadas com os processos dos jogadores: um thread lê a câmara para uma de várias frames
+# em memória partilhada (em rotação) e avisa os leitores de cada frame nova
+class SharedCamera(Thread):
+    # camera: fonte das frames (ex.: cv.VideoCapture ou SyntheticCamera)
+    def __init__(self, camera, slots=3):
+        Thread.__init__(self)
+
+        self.camera = camera
+        self.slots = slots
+        self.is_finish = False
+
+        # a primeira frame dá o tamanho da memória partilhada
+        ret, frame = camera.read()
+        self.memory = shared_memory.SharedMemory(create=True, size=slots * frame.nbytes)
+        self.frames = np.ndarray((slots,) + frame.shape, frame.dtype, buffer=self.memory.buf)
+        self.frames[0] = frame
+
+        # índice da última frame escrita, e a condição que acorda os leitores quando ele muda
+        self.frame_index = multiprocessing.Value('q', 0)
+        self.frame_ready = multiprocessing.Condition()
+
+    # função pertencente à classe Thread
+    def run(self):
+        while not self.is_finish:
+            frame_index = self.frame_index.value + 1
+            slot = self.frames[frame_index % self.slots]
+
+            # a câmara escreve diretamente na memória partilhada (quando não consegue, a frame é copiada)
+            ret, frame = self.camera.read(slot)
+            if not ret:
+                continue
+            if frame is not slot:
+                np.copyto(slot, frame)
+
+            with self.frame_ready:
+                self.frame_index.value = frame_index
+                self.frame_ready.notify_all()
+
+        self.camera.release()
+
+    # descrição da câmara para o processo de um jogador (região: colunas [início, fim) da frame da câmara)
+    def get_description(self, region):
+        return dict(mode='partilhada', memory_name=self.memory.name, shape=self.frames.shape,
+                    dtype=self.frames.dtype.str,
+                    frame_index=self.frame_index, frame_ready=self.frame_ready, region=region)
+
+    def close(self):
+        self.is_finish = True
+        self.join()
+
+        self.frames = None
+        self.memory.close()
+        self.memory.unlink()
+
+
+# leitura de uma zona da câmara partilhada (no processo de um jogador), com a mesma interface da câmara,
+# cada leitura espera pela frame seguinte e copia a zona do jogador (a memória partilhada é logo reutilizada)
+class SharedCameraReader(object):
+    def __init__(self, description):
+        self.memory = shared_memory.SharedMemory(name=description['memory_name'])
+        self.frames = np.ndarray(description['shape'], np.dtype(description['dtype']), buffer=self.memory.buf)
+        self.frame_index = description['frame_index']
+        self.frame_ready = description['frame_ready']
+        self.region = description['region']
+        self.last_frame_index = -1
+
+    def isOpened(self):
+        return True
+
+    def read(self, frame=None):
+        with self.frame_ready:
+            self.frame_ready.wait_for(lambda: self.frame_index.value != self.last_frame_index, timeout=1)
+            self.last_frame_index = self.frame_index.value
+
+        region_frame = self.frames[self.last_frame_index % len(self.frames), :, self.region[0]:self.region[1]]
+
+        if frame is None or frame.shape != region_frame.shape:
+            frame = np.empty(region_frame.shape, region_frame.dtype)
+
+        np.copyto(frame, region_frame)
+        return True, frame
+
+    def release(self):
+        self.frames = None
+        self.memory.close()
+
+
+def create_camera(description):
+    if description['mode'] == 'partilhada':
+        return SharedCameraReader(description)
+    elif description['mode'] == 'sintetica':
+        return SyntheticCamera(description['target'], seed=description['seed'])
+
+    return cv.VideoCapture(description['index'])
+
+
+# processo de um jogador: cria o detetor e a câmara, e envia as decisões pelo canal até o jogo terminar
+# (frame_budget: orçamento do governador da qualidade, sem orçamento a qualidade nunca muda)
+def run_player(name, options, camera_description, channel, finish_event, frame_budget):
+    controller = create_controller(name, **options)
+    controller.set_camera(create_camera(camera_description))
+    controller.set_recorder(channel)
+    controller.set_position_filter(channel)
+    if frame_budget is not None:
+        controller.set_quality_governor(QualityGovernor(frame_budget))
+    controller.start()
+
+    # o detetor também pode terminar sozinho (ex.: a janela da câmara foi fechada)
+    while not finish_event.wait(0.1):
+        if not controller.is_alive():
+            break
+
+    controller.is_finish = True
+    controller.join()
+    finish_event.set()
+
+
+# controlador do jogo que representa o detetor de um jogador, a correr noutro processo
+class RemoteController(Controller):
+    def __init__(self, name, options, camera_description, frame_budget=None):
+        # o início e o fim do jogo são partilhados com o processo do jogador (ver is_start e is_finish)
+        self.part_of_screen = Part_Of_Screen.NONE
+
+        controller_class = get_controller_class(name)
+        self.paddle_speed = controller_class.paddle_speed
+        self.start_message = controller_class.start_message
+
+        self.channel = ControlChannel()
+        self.finish_event = multiprocessing.Event()
+        self.process = multiprocessing.Process(target=run_player, args=(name, options, camera_description,
+                                                                         self.channel, self.finish_event,
+                                                                         frame_budget),
+                                               daemon=True)
+
+        # posições já recebidas do processo do jogador
+        self.positions_count = 0
+
+    @property
+    def is_start(self):
+        return self.channel.read()[0] == 1
+
+    @property
+    def is_finish(self):
+        return self.finish_event.is_set()
+
+    @is_finish.setter
+    def is_finish(self, is_finish):
+        if is_finish:
+            self.finish_event.set()
+
+    # chamado em cada ciclo do jogo: ler a última decisão do jogador, e passar a posição nova (se houver) ao filtro
+    def update(self, board):
+        is_start, decision, decision_time, position, position_time, positions_count = self.channel.read()
+        self.part_of_screen = Part_Of_Screen(int(decision)) if decision >= 0 else Part_Of_Screen.NONE
+        self.decision_time = decision_time if decision >= 0 else None
+
+        if positions_count != self.positions_count:
+            self.positions_count = positions_count
+            self.update_position(position, position_time)
+
+    def start(self):
+        self.process.start()
+
+    def join(self):
+        self.finish_event.set()
+        self.process.join()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+
+# criar os controladores dos jogadores (detetor e opções de cada um) e a câmara partilhada (se for usada),
+# os processos dos jogadores só são iniciados com o start de cada controlador.
+# camera_mode: 'separadas' (a câmara N é a do jogador N), 'partilhada' (uma câmara dividida numa zona por jogador,
+#              da esquerda para a direita tal como os paddles) ou 'sintetica' (uma câmara sintética por jogador)
+def create_players(names, options, camera_mode, frame_budget=None):
+    shared_camera = None
+    if camera_mode == 'partilhada':
+        shared_camera = SharedCamera(cv.VideoCapture(0))
+        shared_camera.start()
+
+    controllers = []
+    for player, name in enumerate(names):
+        if camera_mode == 'partilhada':
+            # os detetores veem a câmara espelhada, por isso o primeiro jogador (à esquerda) está do lado direito
+            region_width = shared_camera.frames.shape[2] / len(names)
+            region = (int(region_width * (len(names) - player - 1)), int(region_width * (len(names) - player)))
+            camera_description = shared_camera.get_description(region)
+        elif camera_mode == 'sintetica':
+            camera_description = dict(mode='sintetica', target=DETECTOR_TARGETS[name], seed=player)
+        else:
+            camera_description = dict(mode='separadas', index=player)
+
+        controllers.append(RemoteController(name, options[player], camera_description, frame_budget))
+
+    return shared_camera, controllers
@@ -0,0 +1,400 @@
+# descrição:        classe responsável pelo optical flow da transmissão de vídeo (câmara) do computador,
+#                   para assim manipular o paddle do jogo através da deteção de movimentos.
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         25-11-2022
+# modificado a:     18-10-2026
+
+
+import time
+import cv2 as cv
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from CameraDetector import CameraDetector
+from Controllers import Part_Of_Screen
+from Instrumentation import timings
+
+
+class OpticalFlow(CameraDetector):
+    paddle_speed = 12
+
+    def __init__(self, processing_scale=1.0, flow_method='farneback', dis_preset='fast', use_motion_gate=True,
+                 flow_workers=1, strip_overlap=16, preview_mode='frames', preview_every=1, preview_fps=30):
+        CameraDetector.__init__(self, preview_mode, preview_every, preview_fps)
+
+        self.old_frame = None
+        self.new_frame = None
+        self.old_frame_prepared = None
+        self.new_frame_prepared = None
+
+        # sensibilidade em milésimos de pixel de deslocamento horizontal médio (na resolução original da câmara),
+        # assim não depende da resolução da câmara nem do método usado (80 equivale aos antigos 25000 em 640x480)
+        self.movement_sensibility = 80
+        self.part_of_screen = Part_Of_Screen.NONE
+
+        # escala a que o optical flow é calculado (1.0 = resolução original da câmara),
+        # o resultado é só esquerda/direita, por isso uma frame reduzida é suficiente
+        self.processing_scale = processing_scale
+
+        # tamanho do filtro gaussiano ajustado à escala (tem de ser ímpar)
+        self.blur_size = max(3, int(9 * processing_scale) | 1)
+
+        # método usado para calcular o flow: 'farneback' (denso, em toda a frame),
+        # 'dis' (denso, mais rápido que o farneback) ou 'lucas_kanade' (esparso, apenas em alguns pontos da frame)
+        self.flow_method = flow_method
+
+        # parâmetros do farneback (os padrão do OpenCV)
+        self.farneback_levels = 3
+        self.farneback_winsize = 15
+        self.farneback_iterations = 3
+
+        # o DIS tem presets que trocam precisão por rapidez: 'ultrafast', 'fast' ou 'medium'
+        self.dis_preset = dis_preset
+        self.dis = None
+
+        if flow_method == 'dis':
+            self.dis = cv.DISOpticalFlow_create(DIS_PRESETS[dis_preset])
+
+        # flow denso dividido em faixas horizontais calculadas em paralelo (o OpenCV liberta o GIL),
+        # cada faixa é alargada com algumas linhas das vizinhas para não perder movimentos nas fronteiras
+        self.flow_workers = flow_workers
+        self.strip_overlap = strip_overlap
+        self.flow_pool = None
+        self.dis_strips = []
+
+        if flow_workers > 1:
+            self.flow_pool = ThreadPoolExecutor(max_workers=flow_workers)
+
+            # o DIS guarda estado interno, por isso cada faixa tem a sua instância
+            if flow_method == 'dis':
+                self.dis_strips = [cv.DISOpticalFlow_create(DIS_PRESETS[dis_preset]) for i in range(flow_workers)]
+
+        # pontos seguidos pelo método de lucas-kanade e quantas frames passaram desde que foram escolhidos,
+        # os pontos são escolhidos novamente de tempos a tempos, porque vão sendo perdidos ou ficam nas margens
+        self.tracked_points = None
+        self.frames_since_reseed = 0
+        self.reseed_interval = 10
+        self.max_tracked_points = 300
+        self.min_tracked_points = 50
+
+        # deslocamento mínimo (em pixeis) para um ponto ser considerado em movimento
+        self.min_point_displacement = 0.5
+
+        # verificação rápida de movimento antes de calcular o flow: compara versões muito reduzidas
+        # de duas frames seguidas, e se quase nenhum pixel mudou mais do que o ruído da câmara (em níveis de
+        # cinzento) considera-se que a cena está parada e o flow não é calculado. é contada a fração de pixeis que
+        # mudaram, e não a diferença média da frame, para não ignorar movimentos numa zona pequena (ex.: uma mão)
+        self.use_motion_gate = use_motion_gate
+        self.motion_pixel_threshold = 15
+        self.motion_gate_fraction = 0.002
+        self.motion_gate_width = 80
+        self.old_frame_small = None
+
+        # estatísticas do processamento (frames, frames paradas e tempos em segundos)
+        self.stats = {
+            'frames': 0,
+            'gated_frames': 0,
+            'gate_time': 0.0,
+            'flow_frames': 0,
+            'flow_time': 0.0
+        }
+
+    # terminar os threads do cálculo do flow em faixas
+    def release_resources(self):
+        if self.flow_pool is not None:
+            self.flow_pool.shutdown()
+
+    # chamada pela pré-visualização depois de criar a janela da câmara
+    def setup_window(self):
+        # criar trackbar
+        cv.createTrackbar('Sensibilidade', 'Camera', self.movement_sensibility, 1000,
+                          self.onTrackbarChange)
+
+        CameraDetector.setup_window(self)
+
+    # chamada pela pré-visualização para obter a frame a mostrar
+    def draw_preview(self):
+        frame = self.new_frame if self.is_start and self.new_frame is not None else self.old_frame
+
+        image_preview = self.get_buffer('preview', frame.shape)
+        np.copyto(image_preview, frame)
+
+        return image_preview
+
+    # processar uma frame da câmara, sem qualquer janela (usado também pelo benchmark)
+    def process_frame(self, frame, frame_time=None):
+        return self.process_cached_frame(self.frame_cache.add(frame, frame_time))
+
+    # processar uma frame já adicionada a uma cache de pré-processamento (partilhada com outros detetores na fusão)
+    def process_cached_frame(self, preprocessed_frame):
+        # se o jogo ainda não iniciou, apenas guardar a frame (como frame antiga)
+        if not self.is_start:
+            self.old_frame = preprocessed_frame.flipped()
+            self.old_frame_prepared = self.prepare_frame(preprocessed_frame)
+            return self.part_of_screen
+
+        self.new_frame = preprocessed_frame.flipped()
+
+        # preparar frame para efetuar a deteção de movimentos
+        self.new_frame_prepared = self.prepare_frame(preprocessed_frame)
+
+        # a primeira frame serve apenas como frame antiga
+        if self.old_frame_prepared is None:
+            self.old_frame_prepared = self.new_frame_prepared
+            return self.part_of_screen
+
+        self.detect_movement()
+
+        return self.part_of_screen
+
+    # níveis de qualidade para o governador (ver QualityGovernor), do melhor (as opções pedidas) para o pior:
+    # menos frames na pré-visualização, menos níveis e iterações do farneback e depois frames mais reduzidas
+    def get_quality_levels(self):
+        return [dict(processing_scale=self.processing_scale * scale, preview_divisor=preview_divisor,
+                     farneback_levels=min(self.farneback_levels, levels),
+                     farneback_iterations=min(self.farneback_iterations, iterations))
+                for scale, preview_divisor, levels, iterations in [(1, 1, 3, 3), (1, 2, 3, 3), (1, 2, 2, 2),
+                                                                   (0.75, 2, 2, 2), (0.5, 4, 2, 1), (0.5, 4, 1, 1)]]
+
+    def set_quality(self, quality):
+        # com outra escala a frame antiga já não serve para o flow, a frame seguinte passa a ser a antiga
+        if quality['processing_scale'] != self.processing_scale:
+            self.processing_scale = quality['processing_scale']
+            self.blur_size = max(3, int(9 * self.processing_scale) | 1)
+            self.old_frame_prepared = None
+            self.tracked_points = None
+
+        self.farneback_levels = quality['farneback_levels']
+        self.farneback_iterations = quality['farneback_iterations']
+
+        if self.preview is not None:
+            self.preview.set_rate_divisor(quality['preview_divisor'])
+
+    def onTrackbarChange(self, x):
+        # obter valor atual da trackbar
+        self.movement_sensibility = int(cv.getTrackbarPos('Sensibilidade', 'Camera'))
+
+    # preparar cada frame para o cálculo da deteção de movimentos: grayscale (antes de reduzir, para redimensionar
+    # só um canal), reduzida para a escala de processamento e com um filtro gaussiano para remover ruído,
+    # a frame preparada antiga continua válida porque cada frame da cache tem os seus próprios buffers
+    def prepare_frame(self, preprocessed_frame):
+        return preprocessed_frame.blurred(self.processing_scale, self.blur_size, gray=True)
+
+    def detect_movement(self):
+        self.stats['frames'] += 1
+
+        # se a cena está parada não há movimento para detetar, e o flow não é calculado
+        start_time = timings.now()
+        has_motion = not self.use_motion_gate or self.has_motion()
+        timings.record('motion_gate', start_time)
+
+        if not has_motion:
+            self.stats['gated_frames'] += 1
+            self.part_of_screen = Part_Of_Screen.NONE
+            self.old_frame_prepared = self.new_frame_prepared
+            return
+
+        flow_start_time = time.perf_counter()
+
+        # obter o valor da direção média dos pixeis,
+        # se o valor for negativo significa que foi para a esquerda e positivo para a direita
+        if self.flow_method == 'lucas_kanade':
+            flow_x_mean = self.calculate_sparse_flow_x()
+        elif self.flow_pool is not None:
+            flow_x_mean = self.calculate_strips_flow_x()
+        elif self.flow_method == 'dis':
+            flow_x_mean = self.calculate_dis_flow_x()
+        else:
+            flow_x_mean = self.calculate_dense_flow_x()
+
+        # numa frame reduzida cada deslocamento é menor, por isso o valor é convertido para a resolução original,
+        # e passado para milésimos de pixel (a unidade da sensibilidade)
+        flow_x_diretion = flow_x_mean / self.processing_scale * 1000
+
+        # verificar o lado da direção do movimento para atualizar o paddle do jogo,
+        # a sensibilidade permite ao jogador decidir se quer muito ou pouco que os movimentos sejam identificados
+        if flow_x_diretion < -self.movement_sensibility:
+            self.part_of_screen = Part_Of_Screen.LEFT
+        elif flow_x_diretion > self.movement_sensibility:
+            self.part_of_screen = Part_Of_Screen.RIGHT
+        else:
+            self.part_of_screen = Part_Of_Screen.NONE
+
+        self.old_frame_prepared = self.new_frame_prepared
+
+        self.stats['flow_frames'] += 1
+        self.stats['flow_time'] += time.perf_counter() - flow_start_time
+
+        return
+
+    def has_motion(self):
+        gate_start_time = time.perf_counter()
+
+        # reduzir a frame nova para uma largura fixa, para que o custo não dependa da resolução
+        frame_height, frame_width = self.new_frame_prepared.shape
+        small_size = (self.motion_gate_width, max(1, frame_height * self.motion_gate_width // frame_width))
+
+        # tal como nas frames preparadas, são usados dois buffers alternadamente
+        small_buffer = self.get_buffer('small_a', small_size[::-1])
+        if small_buffer is self.old_frame_small:
+            small_buffer = self.get_buffer('small_b', small_size[::-1])
+
+        new_frame_small = cv.resize(self.new_frame_prepared, small_size, dst=small_buffer, interpolation=cv.INTER_AREA)
+
+        if self.old_frame_small is None or self.old_frame_small.shape != new_frame_small.shape:
+            self.old_frame_small = cv.resize(self.old_frame_prepared, small_size,
+                                             dst=self.get_buffer('small_b', small_size[::-1]),
+                                             interpolation=cv.INTER_AREA)
+
+        # pixeis em movimento: a diferença absoluta entre as duas frames reduzidas passa o limiar do ruído
+        frame_difference = cv.absdiff(new_frame_small, self.old_frame_small,
+                                      dst=self.get_buffer('small_difference', small_size[::-1]))
+        cv.threshold(frame_difference, self.motion_pixel_threshold, 255, cv.THRESH_BINARY, dst=frame_difference)
+        motion_pixels = cv.countNonZero(frame_difference)
+
+        self.old_frame_small = new_frame_small
+        self.stats['gate_time'] += time.perf_counter() - gate_start_time
+
+        return motion_pixels >= self.motion_gate_fraction * frame_difference.size
+
+    # obter as estatísticas do processamento, incluindo a taxa de frames paradas
+    # e o tempo de CPU poupado (estimado pelo tempo médio do flow nas frames em que foi calculado)
+    def get_stats(self):
+        stats = dict(self.stats)
+
+        frames = max(1, stats['frames'])
+        flow_time_average = stats['flow_time'] / max(1, stats['flow_frames'])
+
+        stats['gate_hit_rate'] = stats['gated_frames'] / frames
+        stats['flow_time_average'] = flow_time_average
+        stats['time_saved'] = stats['gated_frames'] * flow_time_average - stats['gate_time']
+        stats.update(self.get_quality_stats())
+
+        return stats
+
+    def calculate_dense_flow_x(self):
+        start_time = timings.now()
+        flow = self.calculate_farneback_flow(self.old_frame_prepared, self.new_frame_prepared,
+                                             self.get_buffer('flow', self.new_frame_prepared.shape + (2,), np.float32))
+        timings.record('farneback', start_time)
+
+        return self.calculate_flow_x_mean(flow)
+
+    def calculate_flow_x_mean(self, flow):
+        # obter a média dos vetores de movimento no eixo x (primeiro canal do flow)
+        start_time = timings.now()
+        flow_x_mean = cv.mean(flow)[0]
+        timings.record('flow_sum', start_time)
+
+        return flow_x_mean
+
+    def calculate_farneback_flow(self, old_frame_prepared, new_frame_prepared, flow):
+        # aplicar método de farneback para calcular o flow dos movimentos detetados na câmara
+        # (os parâmetros usados são os padrão do OpenCV, o flow recebido é só para escrever o resultado)
+        return cv.calcOpticalFlowFarneback(prev=old_frame_prepared, next=new_frame_prepared,
+                                           flow=flow, pyr_scale=0.5, levels=self.farneback_levels,
+                                           winsize=self.farneback_winsize, iterations=self.farneback_iterations,
+                                           poly_n=5, poly_sigma=1.2, flags=0)
+
+    def calculate_strips_flow_x(self):
+        frame_height, frame_width = self.new_frame_prepared.shape
+        strip_height = -(-frame_height // self.flow_workers)
+
+        # enviar cada faixa para um thread, com as linhas de sobreposição acima e abaixo
+        futures = []
+        for strip_index in range(self.flow_workers):
+            top = strip_index * strip_height
+            bottom = min(frame_height, top + strip_height)
+            extended_top = max(0, top - self.strip_overlap)
+            extended_bottom = min(frame_height, bottom + self.strip_overlap)
+
+            futures.append(self.flow_pool.submit(self.calculate_strip_flow_x_sum, strip_index,
+                                                 extended_top, extended_bottom, top, bottom))
+
+        # juntar as somas das faixas e obter a média em toda a frame
+        flow_x_sum = sum(future.result() for future in futures)
+
+        return flow_x_sum / (frame_height * frame_width)
+
+    def calculate_strip_flow_x_sum(self, strip_index, extended_top, extended_bottom, top, bottom):
+        old_strip = self.old_frame_prepared[extended_top:extended_bottom]
+        new_strip = self.new_frame_prepared[extended_top:extended_bottom]
+
+        # cada faixa tem o seu buffer do flow (cada uma corre num thread diferente)
+        flow = self.get_buffer('flow_strip_%d' % strip_index, new_strip.shape + (2,), np.float32)
+
+        start_time = timings.now()
+        if self.flow_method == 'dis':
+            flow.fill(0)
+            flow = self.dis_strips[strip_index].calc(old_strip, new_strip, flow)
+        else:
+            flow = self.calculate_farneback_flow(old_strip, new_strip, flow)
+        timings.record('%s_strip' % self.flow_method, start_time)
+
+        # somar apenas as linhas que pertencem à faixa (as de sobreposição são somadas pelas vizinhas)
+        start_time = timings.now()
+        flow_x_sum = cv.sumElems(flow[top - extended_top:bottom - extended_top])[0]
+        timings.record('flow_sum', start_time)
+
+        return flow_x_sum
+
+    def calculate_dis_flow_x(self):
+        # aplicar método DIS (dense inverse search) com o preset escolhido,
+        # o DIS usa o flow recebido como ponto de partida, por isso o buffer é limpo antes
+        start_time = timings.now()
+        flow = self.get_buffer('flow', self.new_frame_prepared.shape + (2,), np.float32)
+        flow.fill(0)
+        flow = self.dis.calc(self.old_frame_prepared, self.new_frame_prepared, flow)
+        timings.record('dis', start_time)
+
+        return self.calculate_flow_x_mean(flow)
+
+    def calculate_sparse_flow_x(self):
+        # escolher novos pontos para seguir, quando são poucos ou já passaram algumas frames
+        if self.tracked_points is None or len(self.tracked_points) < self.min_tracked_points \
+                or self.frames_since_reseed >= self.reseed_interval:
+            start_time = timings.now()
+            self.tracked_points = cv.goodFeaturesToTrack(self.old_frame_prepared, maxCorners=self.max_tracked_points,
+                                                         qualityLevel=0.01, minDistance=7, blockSize=7)
+            timings.record('goodFeaturesToTrack', start_time)
+            self.frames_since_reseed = 0
+
+        self.frames_since_reseed += 1
+
+        # frame sem textura, não há pontos para seguir
+        if self.tracked_points is None:
+            return 0
+
+        # aplicar método de lucas-kanade piramidal para seguir os pontos até à frame nova
+        start_time = timings.now()
+        new_points, status, error = cv.calcOpticalFlowPyrLK(self.old_frame_prepared, self.new_frame_prepared,
+                                                            self.tracked_points, None, winSize=(15, 15), maxLevel=3,
+                                                            criteria=(cv.TERM_CRITERIA_EPS | cv.TERM_CRITERIA_COUNT,
+                                                                      10, 0.03))
+        timings.record('calcOpticalFlowPyrLK', start_time)
+
+        # manter apenas os pontos que foram encontrados na frame nova
+        found = status.ravel() == 1
+        points_count = len(self.tracked_points)
+        displacement_x = new_points[found, 0, 0] - self.tracked_points[found, 0, 0]
+        self.tracked_points = new_points[found].reshape(-1, 1, 2)
+
+        # pontos que realmente se moveram (os restantes pertencem ao fundo parado)
+        moving_displacement_x = displacement_x[np.abs(displacement_x) >= self.min_point_displacement]
+
+        if len(moving_displacement_x) == 0:
+            return 0
+
+        # a mediana dos deslocamentos ignora pontos mal seguidos,
+        # e é multiplicada pela fração de pontos em movimento,
+        # para ficar na mesma escala que a média do flow denso (e assim usar a mesma sensibilidade)
+        moving_fraction = len(moving_displacement_x) / points_count
+
+        return np.median(moving_displacement_x) * moving_fraction
+
+
+# presets do DIS disponibilizados pelo OpenCV
+DIS_PRESETS = {
+    'ultrafast': cv.DISOPTICAL_FLOW_PRESET_ULTRAFAST,
+    'fast': cv.DISOPTICAL_FLOW_PRESET_FAST,
+    'medium': cv.DISOPTICAL_FLOW_PRESET_MEDIUM
+}
@@ -0,0 +1,85 @@
+# descrição:        filtro de kalman de velocidade constante para a posição horizontal do objeto/face,
+#                   que suaviza as medições dos detetores e prevê onde o jogador está no instante do ciclo do jogo,
+#                   escondendo a latência da câmara e do processamento.
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+from threading import Lock
+
+
+class KalmanPositionFilter(object):
+    # as posições são frações da largura da frame (0 = esquerda, 1 = direita) e os tempos em segundos
+    # (time.perf_counter),
+    # process_noise: variância da aceleração do jogador (quanto maior, mais depressa segue mudanças de direção),
+    # measurement_noise: variância do erro de cada medição do detetor,
+    # max_prediction: tempo máximo de extrapolação, para o paddle não fugir quando o detetor perde o objeto
+    def __init__(self, process_noise=50.0, measurement_noise=0.0001, max_prediction=0.2):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.max_prediction = max_prediction
+
+        # estado (posição e velocidade), a sua covariância e o instante da última medição
+        self.position = None
+        self.velocity = 0.0
+        self.covariance = [[1.0, 0.0], [0.0, 1.0]]
+        self.last_time = None
+
+        # as medições chegam do thread do detetor e as previsões são pedidas pelo ciclo do jogo
+        self.lock = Lock()
+
+    def update(self, position, measurement_time):
+        with self.lock:
+            if self.position is None:
+                self.position = position
+                self.velocity = 0.0
+                self.covariance = [[self.measurement_noise, 0.0], [0.0, 1.0]]
+                self.last_time = measurement_time
+                return
+
+            # prever o estado no instante da medição (modelo de velocidade constante)
+            dt = max(0.0, measurement_time - self.last_time)
+            predicted_position, predicted_velocity, covariance = self.predict_state(dt)
+
+            # corrigir a previsão com a medição (só a posição é medida)
+            innovation = position - predicted_position
+            innovation_variance = covariance[0][0] + self.measurement_noise
+            gain_position = covariance[0][0] / innovation_variance
+            gain_velocity = covariance[1][0] / innovation_variance
+
+            self.position = predicted_position + gain_position * innovation
+            self.velocity = predicted_velocity + gain_velocity * innovation
+            self.covariance = [
+                [(1 - gain_position) * covariance[0][0],
+                 (1 - gain_position) * covariance[0][1]],
+                [covariance[1][0] - gain_velocity * covariance[0][0],
+                 covariance[1][1] - gain_velocity * covariance[0][1]]
+            ]
+            self.last_time = measurement_time
+
+    def predict_state(self, dt):
+        p = self.covariance
+        q = self.process_noise
+
+        position = self.position + self.velocity * dt
+        velocity = self.velocity
+
+        # P = F P F' + Q, com F = [[1, dt], [0, 1]] e Q o ruído de uma aceleração aleatória
+        p00 = p[0][0] + dt * (p[1][0] + p[0][1]) + dt * dt * p[1][1] + q * dt ** 4 / 4
+        p01 = p[0][1] + dt * p[1][1] + q * dt ** 3 / 2
+        p10 = p[1][0] + dt * p[1][1] + q * dt ** 3 / 2
+        p11 = p[1][1] + q * dt ** 2
+
+        return position, velocity, [[p00, p01], [p10, p11]]
+
+    # posição prevista no instante dado (ex.: o do ciclo atual do jogo), ou None se ainda não houve medições
+    def predict(self, now):
+        with self.lock:
+            if self.position is None:
+                return None
+
+            dt = min(max(0.0, now - self.last_time), self.max_prediction)
+            position = self.position + self.velocity * dt
+
+        return min(1.0, max(0.0, position))
@@ -0,0 +1,84 @@
+# descrição:        classe responsável pela janela de pré-visualização da câmara, num thread próprio,
+#                   para que o imshow e o waitKey não limitem a velocidade da deteção.
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import time
+import cv2 as cv
+from threading import Thread
+from Instrumentation import timings
+
+
+class Preview(Thread):
+    # preview_mode: 'frames' (mostrar uma em cada preview_every frames processadas)
+    #               ou 'fps' (mostrar no máximo preview_fps frames por segundo),
+    # o modo 'off' não chega a criar a pré-visualização (é tratado por quem faz a deteção)
+    def __init__(self, detector, preview_mode='frames', preview_every=1, preview_fps=30):
+        Thread.__init__(self)
+
+        self.detector = detector
+        self.preview_mode = preview_mode
+        self.preview_every = preview_every
+        self.preview_fps = preview_fps
+
+        # taxas pedidas, antes de serem reduzidas (ver set_rate_divisor)
+        self.requested_preview_every = preview_every
+        self.requested_preview_fps = preview_fps
+
+        self.frames_shown = 0
+
+    # mostrar menos frames quando o processamento está atrasado (ver QualityGovernor), 1 = as taxas pedidas
+    def set_rate_divisor(self, divisor):
+        self.preview_every = self.requested_preview_every * divisor
+        self.preview_fps = self.requested_preview_fps / divisor
+
+    # função pertencente à classe Thread, chamada quando o thread é iniciado
+    def run(self):
+        # criar janela (e os eventos e trackbars de cada deteção)
+        cv.namedWindow('Camera')
+        self.detector.setup_window()
+
+        last_frames_count = 0
+        next_preview_time = time.perf_counter()
+
+        while not self.detector.is_finish:
+            frames_count = self.detector.frames_count
+
+            # decidir se é altura de mostrar uma frame nova
+            if self.preview_mode == 'fps':
+                show_frame = frames_count > last_frames_count and time.perf_counter() >= next_preview_time
+            else:
+                show_frame = frames_count - last_frames_count >= self.preview_every
+
+            if show_frame:
+                # desenhar a frame com a deteção enquanto a deteção não está a alterar a frame
+                start_time = timings.now()
+                with self.detector.frame_lock:
+                    image_preview = self.detector.draw_preview()
+                timings.record('draw_preview', start_time)
+
+                start_time = timings.now()
+                cv.imshow('Camera', image_preview)
+                timings.record('imshow', start_time)
+
+                # se a pré-visualização se atrasou, não tenta recuperar as frames perdidas
+                last_frames_count = frames_count
+                next_preview_time = max(next_preview_time + 1 / self.preview_fps, time.perf_counter())
+                self.frames_shown += 1
+
+            # esperar pela próxima frame a mostrar (o waitKey também trata dos eventos da janela)
+            if self.preview_mode == 'fps':
+                wait_time = max(1, int((next_preview_time - time.perf_counter()) * 1000))
+            else:
+                wait_time = 1
+
+            cv.waitKey(wait_time)
+
+            # terminar a deteção quando o utilizador clica no botão de fechar a janela da câmara
+            if cv.getWindowProperty('Camera', cv.WND_PROP_VISIBLE) < 1:
+                self.detector.is_finish = True
+
+        # fecha todas as janelas
+        cv.destroyAllWindows()
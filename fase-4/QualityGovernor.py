@@ -0,0 +1,93 @@
+# descrição:        governador da qualidade dos detetores: compara o tempo de processamento das frames com um
+#                   orçamento por frame e, quando o computador está ocupado e o processamento passa o orçamento,
+#                   baixa a qualidade um nível (menos frames na pré-visualização, frames mais reduzidas, menos
+#                   trabalho por frame), para o paddle não ficar atrasado. quando há folga durante algum tempo, a
+#                   qualidade volta a subir um nível (com histerese, para não oscilar entre dois níveis).
+#                   os níveis de cada detetor são dados pelo próprio detetor (ver Controller.get_quality_levels).
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+class QualityGovernor(object):
+    # frame_budget: tempo máximo de processamento de cada frame (segundos, ex.: 1/30 para acompanhar a câmara),
+    # window: frames de cada medição, a qualidade só muda no fim de uma medição,
+    # raise_fraction: a qualidade só sobe quando o tempo médio fica abaixo desta fração do orçamento
+    #                 (o nível acima é mais caro, por isso precisa de folga para não voltar logo a descer),
+    # raise_windows: medições seguidas com folga antes de subir a qualidade
+    def __init__(self, frame_budget, window=30, raise_fraction=0.6, raise_windows=3):
+        self.frame_budget = frame_budget
+        self.window = window
+        self.raise_fraction = raise_fraction
+        self.raise_windows = raise_windows
+
+        # parâmetros do detetor em cada nível, do melhor (nível 0) para o pior
+        self.levels = None
+        self.level = 0
+
+        # medição atual e medições seguidas com folga
+        self.window_time = 0.0
+        self.window_frames = 0
+        self.headroom_windows = 0
+
+        # estatísticas: tempo médio da última medição, mudanças de nível e frames processadas em cada nível
+        self.last_average_time = None
+        self.lowered_count = 0
+        self.raised_count = 0
+        self.frames_per_level = []
+
+    def set_levels(self, levels):
+        self.levels = levels
+        self.level = 0
+        self.frames_per_level = [0] * len(levels)
+
+    # chamada com o tempo de processamento de cada frame, devolve os parâmetros do novo nível
+    # quando a qualidade muda (senão None)
+    def update(self, processing_time):
+        self.frames_per_level[self.level] += 1
+        self.window_time += processing_time
+        self.window_frames += 1
+
+        if self.window_frames < self.window:
+            return None
+
+        average_time = self.window_time / self.window_frames
+        self.last_average_time = average_time
+        self.window_time = 0.0
+        self.window_frames = 0
+
+        # passou o orçamento: baixar logo a qualidade
+        if average_time > self.frame_budget:
+            self.headroom_windows = 0
+
+            if self.level < len(self.levels) - 1:
+                self.level += 1
+                self.lowered_count += 1
+                return self.levels[self.level]
+
+            return None
+
+        # com folga durante algumas medições seguidas: subir a qualidade
+        if average_time < self.frame_budget * self.raise_fraction and self.level > 0:
+            self.headroom_windows += 1
+
+            if self.headroom_windows >= self.raise_windows:
+                self.headroom_windows = 0
+                self.level -= 1
+                self.raised_count += 1
+                return self.levels[self.level]
+        else:
+            self.headroom_windows = 0
+
+        return None
+
+    def get_stats(self):
+        return {
+            'quality_level': self.level,
+            'quality_levels': len(self.levels) if self.levels is not None else 0,
+            'quality_lowered': self.lowered_count,
+            'quality_raised': self.raised_count,
+            'frame_budget_ms': self.frame_budget * 1000,
+            'frame_time_average_ms': self.last_average_time * 1000 if self.last_average_time is not None else None,
+            'frames_per_quality_level': list(self.frames_per_level)
+        }
@@ -0,0 +1,263 @@
+# descrição:        classe responsável pelo segmentação da transmissão de vídeo (câmera) do computadordo,
+#                   para assim manipular o paddle do jogo através da deteção de cor de um determinado objeto.
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         5-11-2022
+# modificado a:     18-10-2026
+
+
+import cv2 as cv
+import numpy as np
+from CameraDetector import CameraDetector
+from Controllers import Part_Of_Screen
+from Instrumentation import timings
+
+
+class Segmentation(CameraDetector):
+    paddle_speed = 10
+    start_message = 'Clique num objeto da Câmera'
+
+    def __init__(self, processing_scale=1.0, preview_mode='frames', preview_every=1, preview_fps=30):
+        CameraDetector.__init__(self, preview_mode, preview_every, preview_fps)
+
+        # variáveis para os valores das trackbars
+        # nota: no opencv as escalas para H|SV são respetivamente: 0-179 | 0-255 | 0-255
+        self.h_min = 0
+        self.h_max = 179
+        self.s_min = 0
+        self.s_max = 255
+        self.v_min = 0
+        self.v_max = 255
+
+        # thresholds no formato usado pelo inRange (atualizados quando o utilizador clica no objeto)
+        self.image_hsv_min = None
+        self.image_hsv_max = None
+        self.update_hsv_thresholds()
+
+        self.image_original = None
+        self.frame_time = None
+        self.image_hsv = None
+        self.part_of_screen = Part_Of_Screen.NONE
+
+        # escala a que a segmentação é feita (1.0 = resolução original da câmera),
+        # o resultado é só esquerda/meio/direita, por isso uma frame reduzida é suficiente
+        self.processing_scale = processing_scale
+
+        # tamanho do filtro gaussiano ajustado à escala (tem de ser ímpar)
+        self.blur_size = max(3, int(9 * processing_scale) | 1)
+
+        # elemento estruturante para limpar o ruído da máscara
+        self.morph_kernel = cv.getStructuringElement(cv.MORPH_ELLIPSE, (5, 5))
+
+        # resultado da última segmentação (usado para desenhar o objeto)
+        self.image_labels = None
+        self.component_stats = None
+        self.component_centroids = None
+        self.biggest_component_index = -1
+
+    # chamada pela pré-visualização para obter a frame a mostrar
+    def draw_preview(self):
+        # se o jogo ainda não iniciou, mostrar apenas a câmera
+        if not self.is_start:
+            image_preview = self.get_buffer('preview', self.image_original.shape)
+            np.copyto(image_preview, self.image_original)
+            return image_preview
+
+        return self.draw_segmentation()
+
+    # processar uma frame da câmera, sem qualquer janela (usado também pelo benchmark)
+    def process_frame(self, frame, frame_time=None):
+        return self.process_cached_frame(self.frame_cache.add(frame, frame_time))
+
+    # processar uma frame já adicionada a uma cache de pré-processamento (partilhada com outros detetores na fusão)
+    def process_cached_frame(self, preprocessed_frame):
+        # frame espelhada e o instante em que foi obtida
+        self.image_original = preprocessed_frame.flipped()
+        self.frame_time = preprocessed_frame.frame_time
+
+        # frame reduzida para a escala de processamento, com um filtro gaussiano para remover ruído e em HSV
+        self.image_hsv = preprocessed_frame.hsv(self.processing_scale, self.blur_size)
+
+        # fazer segmentação só quando o jogo iniciar
+        if self.is_start:
+            self.segment()
+
+        return self.part_of_screen
+
+    # níveis de qualidade para o governador (ver QualityGovernor), do melhor (as opções pedidas) para o pior:
+    # menos frames na pré-visualização e depois frames mais reduzidas
+    def get_quality_levels(self):
+        return [dict(processing_scale=self.processing_scale * scale, preview_divisor=preview_divisor)
+                for scale, preview_divisor in [(1, 1), (1, 2), (0.75, 2), (0.5, 4), (0.35, 4)]]
+
+    def set_quality(self, quality):
+        self.processing_scale = quality['processing_scale']
+        self.blur_size = max(3, int(9 * self.processing_scale) | 1)
+
+        if self.preview is not None:
+            self.preview.set_rate_divisor(quality['preview_divisor'])
+
+    def click_in_camera_and_start_game(self, event, x, y, flags, param):
+        # sai da função, quando o utilizador clica na câmera e o jogo já em andamento
+        if self.is_start:
+            return
+
+        if event == cv.EVENT_LBUTTONUP:
+            # obter o pixel clicado na câmera (convertido para a escala de processamento)
+            with self.frame_lock:
+                pixel_hsv_clicked = self.image_hsv[int(y * self.processing_scale), int(x * self.processing_scale)]
+
+            # converter para inteiro, para as contas abaixo não darem a volta nos limites do uint8
+            pixel_hsv_clicked = pixel_hsv_clicked.astype(int)
+
+            # definir thresholds
+            self.h_min = pixel_hsv_clicked[0] - 25
+            self.h_max = pixel_hsv_clicked[0] + 25
+            self.s_min = pixel_hsv_clicked[1] - 25
+            self.s_max = pixel_hsv_clicked[1] + 25
+            self.v_min = pixel_hsv_clicked[2] - 25
+            self.v_max = pixel_hsv_clicked[2] + 25
+
+            # prevenir que os valores mínimos e máximos não ultrapassem as escalas do openCV para HSV
+            if self.h_min < 0:
+                self.h_min = 0
+            if self.s_min < 0:
+                self.s_min = 0
+            if self.v_min < 0:
+                self.v_min = 0
+
+            if self.h_max > 179:
+                self.h_max = 179
+            if self.s_max > 255:
+                self.s_max = 255
+            if self.v_max > 255:
+                self.v_max = 255
+
+            self.update_hsv_thresholds()
+
+            self.record_click(x, y)
+
+            # iniciar jogo
+            self.is_start = True
+
+    def update_hsv_thresholds(self):
+        # obter os tresholds mínimos e máximos,
+        # as escalas HSV utilizadas pelo opencv são: H (0-179) | S (0-255) | V (0-255)
+        self.image_hsv_min = np.array([self.h_min, self.s_min, self.v_min], np.uint8)
+        self.image_hsv_max = np.array([self.h_max, self.s_max, self.v_max], np.uint8)
+
+    def segment(self):
+        mask_shape = self.image_hsv.shape[:2]
+
+        # obter os pixeis que fazem parte da junção dos tresholds mínimos e máximos,
+        # se pertencer fica a 255 senão fica a 0
+        start_time = timings.now()
+        image_mask = cv.inRange(self.image_hsv, self.image_hsv_min, self.image_hsv_max,
+                                dst=self.get_buffer('mask', mask_shape))
+        timings.record('inRange', start_time)
+
+        # remover pequenos pontos de ruído da máscara (abertura morfológica),
+        # para que cenas com muito ruído não gerem centenas de componentes
+        start_time = timings.now()
+        image_mask = cv.morphologyEx(image_mask, cv.MORPH_OPEN, self.morph_kernel,
+                                     dst=self.get_buffer('mask_open', mask_shape))
+        timings.record('morphologyEx', start_time)
+
+        # obter todos os componentes ligados da máscara, já com a área e o centróide de cada um,
+        # numa única chamada (o componente 0 é sempre o fundo),
+        # as estatísticas da frame anterior são reutilizadas quando o número de componentes é igual
+        start_time = timings.now()
+        components_count, self.image_labels, self.component_stats, self.component_centroids = \
+            cv.connectedComponentsWithStats(image_mask, self.get_buffer('labels', mask_shape, np.int32),
+                                            self.component_stats, self.component_centroids, 8, cv.CV_32S)
+        timings.record('connectedComponents', start_time)
+        stats = self.component_stats
+        centroids = self.component_centroids
+
+        self.biggest_component_index = -1
+
+        # se existir componentes além do fundo
+        if components_count > 1:
+            # obter o maior componente
+            self.biggest_component_index = self.find_biggest_component(stats)
+
+            # obter o pixel central do componente (em coordenadas da frame original)
+            component_center_x, component_center_y = self.get_center_of_mass(centroids,
+                                                                             self.biggest_component_index)
+
+            # verificar se existe um valor válido para o centro do objeto,
+            # uma vez que se existir o centro do objeto, podemos considerar que o objeto também existe
+            if component_center_x != -1:
+                # descobrir em que lado está o objeto
+                self.part_of_screen = self.find_side_of_screen_belongs(component_center_x)
+
+                # posição contínua do objeto, para o paddle o seguir (se o filtro de posição estiver ativo)
+                self.update_position(component_center_x / self.get_width(), self.frame_time)
+
+    # desenhar o objeto segmentado, apenas quando a frame é realmente mostrada
+    def draw_segmentation(self):
+        # copiar a imagem original para o buffer da pré-visualização, para não modificar a frame da câmera
+        image_preview = self.get_buffer('preview', self.image_original.shape)
+        np.copyto(image_preview, self.image_original)
+
+        if self.biggest_component_index != -1:
+            image_mask = cv.compare(self.image_labels, self.biggest_component_index, cv.CMP_EQ,
+                                    dst=self.get_buffer('component_mask', self.image_labels.shape))
+
+            # voltar a colocar a máscara na resolução original
+            if self.processing_scale != 1.0:
+                image_mask = cv.resize(image_mask, (image_preview.shape[1], image_preview.shape[0]),
+                                       dst=self.get_buffer('component_mask_original', image_preview.shape[:2]),
+                                       interpolation=cv.INTER_NEAREST)
+
+            # pintar o objeto de verde
+            image_green = self.buffers.get('green')
+            if image_green is None or image_green.shape != image_preview.shape:
+                image_green = np.full(image_preview.shape, (0, 255, 0), np.uint8)
+                self.buffers['green'] = image_green
+
+            cv.copyTo(image_green, image_mask, image_preview)
+
+        return image_preview
+
+    def find_biggest_component(self, stats):
+        # ignorar o fundo (índice 0) e escolher o componente com maior área
+        return 1 + int(np.argmax(stats[1:, cv.CC_STAT_AREA]))
+
+    def get_center_of_mass(self, centroids, component_index):
+        center_x = -1
+        center_y = -1
+
+        # os centróides estão na escala de processamento, por isso são convertidos para a frame original
+        if component_index != -1:
+            center_x = int(centroids[component_index][0] / self.processing_scale)
+            center_y = int(centroids[component_index][1] / self.processing_scale)
+
+        return center_x, center_y
+
+    def find_side_of_screen_belongs(self, contour_center_x):
+        # obter a largura da tela e o centro no eixo x
+        frame_width = self.get_width()
+        frame_center_x = self.get_center_x(frame_width)
+
+        belongs_to_left = 0 <= contour_center_x <= frame_width / 2 - 20
+        belongs_to_middle = frame_center_x - 20 <= contour_center_x <= frame_center_x + 20
+        belongs_to_right = frame_center_x + 20 <= contour_center_x <= frame_width
+
+        part_of_screen = Part_Of_Screen.NONE
+
+        # guardar em que parte da tela encontra-se o objeto,
+        # para depois manipular a posição do paddle do jogo
+        if belongs_to_left:
+            part_of_screen = Part_Of_Screen.LEFT
+        elif belongs_to_middle:
+            part_of_screen = Part_Of_Screen.MIDDLE
+        elif belongs_to_right:
+            part_of_screen = Part_Of_Screen.RIGHT
+
+        return part_of_screen
+
+    def get_width(self):
+        return self.image_original.shape[1]
+
+    def get_center_x(self, frame_width):
+        return frame_width / 2
@@ -0,0 +1,169 @@
+# descrição:        gravação de uma sessão da câmara (frames tal como foram capturadas, instante de cada captura e
+#                   decisão do controlador), para depois perceber o que a câmara viu num jogo. as frames são copiadas
+#                   num thread próprio para ficheiros mapeados em memória já criados com o tamanho máximo, assim
+#                   gravar não atrasa a deteção, e a leitura da sessão usa as frames diretamente do ficheiro
+#                   (sem cópias), com a mesma interface da câmara.
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import json
+import os
+import queue
+import numpy as np
+from threading import Thread
+from Controllers import Part_Of_Screen
+
+
+# ficheiros de uma sessão gravada (numa pasta própria)
+FRAMES_FILE = 'frames.npy'
+FRAME_TIMES_FILE = 'tempos.npy'
+DECISIONS_FILE = 'decisoes.npy'
+METADATA_FILE = 'sessao.json'
+
+# decisão guardada antes do jogo iniciar (as restantes são o valor do Part_Of_Screen)
+NO_DECISION = -1
+
+
+class SessionRecorder(Thread):
+    # path: pasta da sessão,
+    # max_frames: frames que cabem nos ficheiros (ex.: 3600 = 2 minutos a 30 fps), as seguintes já não são gravadas,
+    # slots: frames à espera do thread da gravação, quando estão todos ocupados as novas frames são descartadas
+    #        (a deteção nunca espera pela gravação),
+    # metadata: informação extra guardada com a sessão (ex.: controlador e escala)
+    def __init__(self, path, max_frames=3600, slots=8, metadata=None):
+        Thread.__init__(self)
+
+        self.path = path
+        self.max_frames = max_frames
+        self.metadata = metadata if metadata is not None else {}
+        os.makedirs(path, exist_ok=True)
+
+        # instante da captura e decisão de cada frame
+        self.frame_times = np.lib.format.open_memmap(os.path.join(path, FRAME_TIMES_FILE), mode='w+',
+                                                     dtype=np.float64, shape=(max_frames,))
+        self.decisions = np.lib.format.open_memmap(os.path.join(path, DECISIONS_FILE), mode='w+',
+                                                   dtype=np.int8, shape=(max_frames,))
+
+        # o ficheiro das frames só é criado com a primeira frame, quando o tamanho delas já é conhecido
+        # (o ficheiro não ocupa espaço no disco até as frames serem escritas)
+        self.frames = None
+
+        # buffers onde o thread da câmara copia as frames,
+        # e os índices dos que estão livres e dos que estão à espera de ser gravados
+        self.slots = slots
+        self.slot_buffers = []
+        self.free_slots = queue.Queue()
+        self.ready_slots = queue.Queue()
+
+        for slot in range(slots):
+            self.free_slots.put(slot)
+
+        self.frames_count = 0
+        self.dropped_frames = 0
+
+        # última frame antes do jogo iniciar e pixel clicado na câmara (para repetir o clique na leitura)
+        self.click_frame = None
+        self.click_pixel = None
+
+    # chamada pelo thread da câmara depois de processar cada frame
+    def add(self, frame, frame_time, is_start, part_of_screen):
+        if self.frames is None:
+            self.frames = np.lib.format.open_memmap(os.path.join(self.path, FRAMES_FILE), mode='w+',
+                                                    dtype=frame.dtype, shape=(self.max_frames,) + frame.shape)
+            self.slot_buffers = [np.empty_like(frame) for slot in range(self.slots)]
+
+        if self.frames_count >= self.max_frames:
+            self.dropped_frames += 1
+            return
+
+        try:
+            slot = self.free_slots.get_nowait()
+        except queue.Empty:
+            self.dropped_frames += 1
+            return
+
+        if is_start and self.click_frame is None:
+            self.click_frame = self.frames_count - 1
+
+        if not is_start:
+            decision = NO_DECISION
+        else:
+            decision = part_of_screen.value
+
+        np.copyto(self.slot_buffers[slot], frame)
+        self.ready_slots.put((slot, self.frames_count, frame_time, decision))
+        self.frames_count += 1
+
+    def set_click_pixel(self, x, y):
+        self.click_pixel = [int(x), int(y)]
+
+    # função pertencente à classe Thread, copia as frames dos buffers para os ficheiros
+    def run(self):
+        while True:
+            item = self.ready_slots.get()
+            if item is None:
+                break
+
+            slot, index, frame_time, decision = item
+            self.frames[index] = self.slot_buffers[slot]
+            self.frame_times[index] = frame_time
+            self.decisions[index] = decision
+
+            self.free_slots.put(slot)
+
+        for memmap in (self.frames, self.frame_times, self.decisions):
+            if memmap is not None:
+                memmap.flush()
+
+        metadata = dict(self.metadata, frames=self.frames_count, dropped_frames=self.dropped_frames,
+                        click_frame=self.click_frame, click_pixel=self.click_pixel)
+        with open(os.path.join(self.path, METADATA_FILE), 'w') as metadata_file:
+            json.dump(metadata, metadata_file, indent=2)
+
+    # gravar as frames que faltam e terminar o thread
+    def close(self):
+        self.ready_slots.put(None)
+        self.join()
+
+
+# leitura de uma sessão gravada, com a mesma interface da câmara (cv.VideoCapture), as frames lidas são
+# as do ficheiro mapeado em memória (só de leitura), sem cópias
+class SessionReader(object):
+    def __init__(self, path):
+        with open(os.path.join(path, METADATA_FILE)) as metadata_file:
+            self.metadata = json.load(metadata_file)
+
+        frames_count = self.metadata['frames']
+        self.frames = np.load(os.path.join(path, FRAMES_FILE), mmap_mode='r')[:frames_count] \
+            if frames_count > 0 else np.empty((0, 0, 0, 3), np.uint8)
+        self.frame_times = np.load(os.path.join(path, FRAME_TIMES_FILE), mmap_mode='r')[:frames_count]
+        self.decisions = np.load(os.path.join(path, DECISIONS_FILE), mmap_mode='r')[:frames_count]
+
+        # se o jogo nunca iniciou, o clique fica depois da última frame
+        self.click_frame = self.metadata['click_frame'] if self.metadata['click_frame'] is not None else frames_count
+        self.click_pixel = self.metadata['click_pixel']
+
+        self.position = 0
+
+    def __len__(self):
+        return len(self.frames)
+
+    def get_decision(self, index):
+        decision = int(self.decisions[index])
+        return None if decision == NO_DECISION else Part_Of_Screen(decision)
+
+    def isOpened(self):
+        return True
+
+    def read(self, frame=None):
+        if self.position >= len(self.frames):
+            return False, None
+
+        frame = self.frames[self.position]
+        self.position += 1
+        return True, frame
+
+    def release(self):
+        pass
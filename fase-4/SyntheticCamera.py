@@ -0,0 +1,160 @@
+# descrição:        câmara sintética, com a mesma interface da câmara (cv.VideoCapture) e ao mesmo ritmo, que
+#                   mostra um alvo a andar para a esquerda e para a direita sobre um fundo parado: um círculo de
+#                   cor (para a cor e o fundo), um retângulo com textura (para o optical flow) ou um desenho de uma
+#                   face (para as faces). os instantes em que o alvo muda de direção e em que passa o meio da frame
+#                   são guardados, para medir a latência dos controladores (ver latencia.py).
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import random
+import time
+import cv2 as cv
+import numpy as np
+from threading import Lock
+
+
+# alvo que cada detetor consegue seguir
+DETECTOR_TARGETS = {
+    'cor': 'blob',
+    'movimento': 'textura',
+    'faces': 'face',
+    'fundo': 'blob'
+}
+
+
+# desenho de uma face de frente (pele, sobrancelhas, olhos, nariz e boca), que o classificador das faces deteta
+def draw_face(size):
+    face = np.full((size, size, 3), 60, np.uint8)
+    cv.ellipse(face, (size // 2, size // 2), (int(size * 0.38), int(size * 0.48)), 0, 0, 360, (150, 180, 225), -1)
+
+    for eye_x in (int(size * 0.35), int(size * 0.65)):
+        cv.ellipse(face, (eye_x, int(size * 0.4)), (int(size * 0.09), int(size * 0.05)), 0, 0, 360, (40, 40, 40), -1)
+        cv.line(face, (eye_x - int(size * 0.1), int(size * 0.31)), (eye_x + int(size * 0.1), int(size * 0.31)),
+                (40, 50, 70), max(2, size // 40))
+
+    cv.line(face, (size // 2, int(size * 0.45)), (size // 2, int(size * 0.6)), (110, 130, 180), max(2, size // 50))
+    cv.ellipse(face, (size // 2, int(size * 0.72)), (int(size * 0.14), int(size * 0.05)), 0, 0, 360, (60, 60, 140), -1)
+
+    return cv.GaussianBlur(face, (0, 0), size / 100)
+
+
+class SyntheticCamera(object):
+    # target: 'blob' (círculo de cor), 'textura' (retângulo com textura) ou 'face' (desenho de uma face),
+    # speed: velocidade do alvo (pixels por segundo),
+    # amplitude: distância (fração da largura) entre o meio da frame e os pontos onde o alvo muda de direção,
+    #            escolhida ao acaso em cada mudança (sempre a mesma sequência para a mesma seed)
+    def __init__(self, target='blob', frame_size=(640, 480), fps=30, speed=250, amplitude=(0.15, 0.3), seed=0):
+        self.target = target
+        self.frame_width, self.frame_height = frame_size
+        self.fps = fps
+        self.speed = speed
+        self.amplitude = amplitude
+        self.random_generator = random.Random(seed)
+
+        # fundo escuro com textura, parado
+        background_generator = np.random.default_rng(seed)
+        self.background = background_generator.integers(20, 100, (self.frame_height, self.frame_width, 3),
+                                                        dtype=np.uint8)
+        self.background = cv.GaussianBlur(self.background, (21, 21), 0)
+
+        # imagem do alvo e a máscara dos pixeis que lhe pertencem
+        if target == 'face':
+            self.sprite = draw_face(160)
+            self.sprite_mask = np.zeros(self.sprite.shape[:2], np.uint8)
+            cv.ellipse(self.sprite_mask, (80, 80), (61, 77), 0, 0, 360, 255, -1)
+        elif target == 'textura':
+            # do tamanho de um jogador, e com uma textura grossa para não desaparecer nas frames reduzidas
+            # (ex.: no portão de movimento do optical flow)
+            texture = background_generator.integers(0, 256, (16, 12, 3), dtype=np.uint8)
+            self.sprite = cv.resize(texture, (180, 240), interpolation=cv.INTER_NEAREST)
+            self.sprite_mask = np.full(self.sprite.shape[:2], 255, np.uint8)
+        else:
+            self.sprite = np.full((120, 120, 3), (0, 220, 255), np.uint8)
+            self.sprite_mask = np.zeros(self.sprite.shape[:2], np.uint8)
+            cv.circle(self.sprite_mask, (60, 60), 60, 255, -1)
+
+        # o alvo começa no meio da frame (onde o detetor de cor escolhe a cor) a andar para a direita
+        self.x = self.frame_width / 2
+        self.direction = 1
+        self.turn_x = None
+
+        self.start_time = None
+        self.last_time = None
+        self.next_frame_time = None
+
+        # instantes (time.perf_counter) e nova direção/lado (1 = direita, -1 = esquerda, na imagem da câmara,
+        # que os detetores veem espelhada) das mudanças de direção e das passagens pelo meio da frame
+        self.turns = []
+        self.crossings = []
+
+        # as frames são lidas pelo thread do detetor e os instantes pelo thread que mede a latência
+        self.lock = Lock()
+
+    def isOpened(self):
+        return True
+
+    def read(self, frame=None):
+        # esperar pelo instante da frame seguinte, ao ritmo de uma câmara
+        now = time.perf_counter()
+        if self.start_time is None:
+            self.start_time = now
+            self.last_time = now
+            self.next_frame_time = now
+            self.turn_x = self.get_next_turn_x()
+
+        time.sleep(max(0.0, self.next_frame_time - now))
+        now = time.perf_counter()
+        self.next_frame_time = max(self.next_frame_time + 1 / self.fps, now)
+
+        with self.lock:
+            self.move(now)
+
+        if frame is None or frame.shape != self.background.shape:
+            frame = np.empty_like(self.background)
+
+        self.draw(frame)
+        return True, frame
+
+    def release(self):
+        pass
+
+    # ponto onde o alvo vai mudar de direção, do lado para onde está a andar
+    def get_next_turn_x(self):
+        amplitude = self.random_generator.uniform(*self.amplitude) * self.frame_width
+        return self.frame_width / 2 + self.direction * amplitude
+
+    # andar com o alvo até ao instante dado, registando as mudanças de direção e as passagens pelo meio pelo caminho
+    def move(self, now):
+        middle_x = self.frame_width / 2
+
+        while self.last_time < now:
+            turn_time = self.last_time + abs(self.turn_x - self.x) / self.speed
+            segment_end_time = min(now, turn_time)
+            new_x = self.x + self.direction * self.speed * (segment_end_time - self.last_time)
+
+            if (self.x - middle_x) * (new_x - middle_x) < 0 or (self.x == middle_x and new_x != middle_x):
+                crossing_time = self.last_time + abs(middle_x - self.x) / self.speed
+                self.crossings.append((crossing_time, self.direction))
+
+            self.x = new_x
+            self.last_time = segment_end_time
+
+            if segment_end_time == turn_time:
+                self.direction *= -1
+                self.turns.append((turn_time, self.direction))
+                self.turn_x = self.get_next_turn_x()
+
+    def draw(self, frame):
+        np.copyto(frame, self.background)
+
+        sprite_height, sprite_width = self.sprite.shape[:2]
+        left = int(round(self.x - sprite_width / 2))
+        top = (self.frame_height - sprite_height) // 2
+
+        cv.copyTo(self.sprite, self.sprite_mask, frame[top:top + sprite_height, left:left + sprite_width])
+
+    def get_events(self):
+        with self.lock:
+            return list(self.turns), list(self.crossings)
@@ -0,0 +1,159 @@
+# descrição:        registo do estado do jogo em cada ciclo (bola, paddle, tijolos, vidas e a decisão de cada
+#                   controlador com a sua latência), para analisar jogos longos. os registos são juntos em blocos
+#                   de tamanho fixo que um thread próprio acrescenta a um ficheiro por coluna, assim o ciclo do jogo
+#                   nunca espera pelo disco (quando o thread não acompanha, os registos são descartados e contados).
+#                   a leitura mapeia cada coluna em memória (sem a carregar toda), ou percorre-a bloco a bloco.
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import json
+import math
+import os
+import queue
+import numpy as np
+from threading import Thread
+
+
+# registo de cada jogador em cada ciclo: ciclo, jogador, instante (time.perf_counter), estado do tabuleiro
+# (Board_State), centro e direção da bola, centro do paddle do jogador, tijolos que faltam, vidas, decisão do
+# controlador (valor do Part_Of_Screen) e latência da decisão (tempo desde a captura da
+# frame que a deu, NaN nos controladores sem câmara)
+TICK_DTYPE = np.dtype([('tick', '<u4'), ('player', 'u1'), ('time', '<f8'), ('state', 'u1'), ('ball_x', '<f4'),
+                       ('ball_y', '<f4'), ('ball_dx', 'i1'), ('ball_dy', 'i1'), ('paddle_x', '<f4'),
+                       ('bricks', '<u2'), ('lives', 'i1'), ('decision', 'i1'), ('latency_ms', '<f4')])
+
+# descrição das colunas e do número de registos (os ficheiros das colunas são <nome>.bin na mesma pasta)
+METADATA_FILE = 'telemetria.json'
+
+
+class TelemetryWriter(Thread):
+    # path: pasta dos ficheiros,
+    # chunk_rows: registos de cada bloco (cada bloco cheio é escrito de uma vez),
+    # chunks: blocos em memória, quando estão todos à espera do disco os registos novos são descartados,
+    # metadata: informação extra guardada com os registos (ex.: controladores)
+    def __init__(self, path, chunk_rows=4096, chunks=4, metadata=None):
+        Thread.__init__(self)
+
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.metadata = metadata if metadata is not None else {}
+        os.makedirs(path, exist_ok=True)
+
+        # blocos livres e blocos cheios à espera do thread da escrita (com o número de registos de cada um)
+        self.free_chunks = queue.Queue()
+        self.ready_chunks = queue.Queue()
+
+        for index in range(chunks):
+            self.free_chunks.put(np.empty(chunk_rows, TICK_DTYPE))
+
+        # bloco a ser preenchido pelo ciclo do jogo
+        self.chunk = self.free_chunks.get()
+        self.chunk_index = 0
+
+        self.ticks = 0
+        self.rows_count = 0
+        self.dropped_rows = 0
+
+    # chamada pelo ciclo do jogo depois de cada ciclo do tabuleiro, um registo por jogador
+    def add(self, now, state, board, controllers):
+        ball_coords = board.ball.get_position()
+        ball_x = (ball_coords[0] + ball_coords[2]) * 0.5
+        ball_y = (ball_coords[1] + ball_coords[3]) * 0.5
+
+        for player, (paddle, controller) in enumerate(zip(board.paddles, controllers)):
+            # sem bloco livre (o disco não acompanha) o registo é descartado
+            if self.chunk is None:
+                try:
+                    self.chunk = self.free_chunks.get_nowait()
+                    self.chunk_index = 0
+                except queue.Empty:
+                    self.dropped_rows += 1
+                    continue
+
+            paddle_coords = paddle.get_position()
+            part_of_screen = controller.part_of_screen
+            decision_time = controller.decision_time
+
+            self.chunk[self.chunk_index] = (
+                self.ticks, player, now, state.value, ball_x, ball_y, board.ball.direction[0],
+                board.ball.direction[1], (paddle_coords[0] + paddle_coords[2]) * 0.5, board.bricks_count,
+                board.lives, part_of_screen.value,
+                (now - decision_time) * 1000 if decision_time is not None else math.nan)
+
+            self.chunk_index += 1
+            self.rows_count += 1
+
+            if self.chunk_index == self.chunk_rows:
+                self.ready_chunks.put((self.chunk, self.chunk_index))
+                self.chunk = None
+
+        self.ticks += 1
+
+    # função pertencente à classe Thread, acrescenta cada bloco cheio aos ficheiros das colunas
+    def run(self):
+        column_files = dict((name, open(os.path.join(self.path, name + '.bin'), 'wb'))
+                            for name in TICK_DTYPE.names)
+
+        while True:
+            item = self.ready_chunks.get()
+            if item is None:
+                break
+
+            chunk, rows = item
+            for name, column_file in column_files.items():
+                np.ascontiguousarray(chunk[name][:rows]).tofile(column_file)
+
+            self.free_chunks.put(chunk)
+
+        for column_file in column_files.values():
+            column_file.close()
+
+        metadata = dict(self.metadata, rows=self.rows_count, ticks=self.ticks,
+                        dropped_rows=self.dropped_rows, chunk_rows=self.chunk_rows,
+                        columns=[(name, TICK_DTYPE[name].str) for name in TICK_DTYPE.names])
+        with open(os.path.join(self.path, METADATA_FILE), 'w') as metadata_file:
+            json.dump(metadata, metadata_file, indent=2)
+
+    # escrever o bloco incompleto e terminar o thread
+    def close(self):
+        if self.chunk is not None and self.chunk_index > 0:
+            self.ready_chunks.put((self.chunk, self.chunk_index))
+        self.chunk = None
+
+        self.ready_chunks.put(None)
+        self.join()
+
+
+# leitura dos registos: cada coluna é mapeada em memória (só de leitura), para analisar milhões de ciclos sem os
+# carregar todos, ou percorrida em blocos
+class TelemetryReader(object):
+    def __init__(self, path):
+        with open(os.path.join(path, METADATA_FILE)) as metadata_file:
+            self.metadata = json.load(metadata_file)
+
+        self.rows = self.metadata['rows']
+        self.columns = {}
+
+        for name, dtype in self.metadata['columns']:
+            if self.rows > 0:
+                self.columns[name] = np.memmap(os.path.join(path, name + '.bin'), np.dtype(dtype), 'r',
+                                               shape=(self.rows,))
+            else:
+                self.columns[name] = np.empty(0, np.dtype(dtype))
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    # percorrer os registos em blocos de rows registos (por omissão os blocos da escrita), cada bloco é um
+    # dicionário com as colunas pedidas (por omissão todas)
+    def iter_chunks(self, rows=None, names=None):
+        rows = rows if rows is not None else self.metadata['chunk_rows']
+        names = names if names is not None else list(self.columns)
+
+        for start in range(0, self.rows, rows):
+            yield dict((name, self.columns[name][start:start + rows]) for name in names)
@@ -0,0 +1,176 @@
+# descrição:        avaliação de um controlador sem câmara (ex.: piloto automático ou repetição) em vários
+#                   tabuleiros e seeds: cada jogo é jogado sem janela até ganhar, perder ou chegar ao máximo de
+#                   ciclos, em vários processos. a seed decide a posição inicial do paddle e a direção inicial da
+#                   bola. os resultados (pontos, tijolos partidos, ciclos e vidas perdidas) ficam numa cache
+#                   persistente (ver EpisodeCache), e os jogos que já estão na cache não são jogados outra vez.
+#                   uso: python avaliar.py --controlador autopiloto --tabuleiros 8x3 16x12 --seeds 100
+#                        python avaliar.py --controlador repeticao --opcoes '{"replay_path": "jogo.txt"}'
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from Game import Board, Board_State, Brick, get_bricks_layout
+from HeadlessCanvas import HeadlessCanvas
+from Controllers import create_controller
+from EpisodeCache import EpisodeCache, get_engine_version, get_episode_key
+from benchmark_jogo import get_layout_name
+
+
+# versão da preparação de cada jogo (o que a seed decide), faz parte da chave da cache
+EPISODE_VERSION = 1
+
+
+# um jogo completo sem janela, até ganhar, perder ou chegar ao máximo de ciclos
+def play_episode(controller_name, options, columns, rows, seed, max_ticks):
+    random_generator = random.Random(seed)
+    controller = create_controller(controller_name, **options)
+
+    # o tabuleiro cresce com os tijolos, tal como no benchmark do jogo
+    width = columns * 75 + 10
+    height = 400 + (rows - 3) * 20
+    layout = get_bricks_layout(columns, rows)
+    board = Board(HeadlessCanvas(width, height), width, height, layout)
+
+    # a seed decide onde o paddle começa e para que lado a bola sai
+    board.move_paddle_to(board.paddle, random_generator.uniform(0.2, 0.8) * width)
+    board.add_ball()
+    board.ball.direction[0] = random_generator.choice([-1, 1])
+    board.paddle.ball = None
+
+    state = Board_State.PLAYING
+    ticks = 0
+    lives_lost = 0
+
+    while ticks < max_ticks and state in (Board_State.PLAYING, Board_State.BALL_LOST):
+        if state == Board_State.BALL_LOST:
+            board.add_ball()
+            board.paddle.ball = None
+
+        state = board.tick([controller], ticks)
+        ticks += 1
+
+        if state in (Board_State.BALL_LOST, Board_State.LOST):
+            lives_lost += 1
+
+    # pontos: toques nos tijolos (cada tijolo vale os toques que aguenta)
+    bricks = [game_object for game_object in board.items.values() if isinstance(game_object, Brick)]
+    hits_left = sum(brick.hits for brick in bricks)
+
+    return {
+        'state': state.name,
+        'score': sum(hits for x, y, hits in layout) - hits_left,
+        'bricks_cleared': sum(1 for brick in bricks if brick.hits == 0),
+        'bricks': len(bricks),
+        'ticks': ticks,
+        'lives_lost': lives_lost
+    }
+
+
+# parâmetros do controlador que decidem os resultados: as opções e, na repetição, o conteúdo do ficheiro
+def get_controller_parameters(options):
+    parameters = dict(options)
+
+    if 'replay_path' in options:
+        with open(options['replay_path'], 'rb') as replay_file:
+            parameters['replay_path'] = hashlib.sha256(replay_file.read()).hexdigest()
+
+    return parameters
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Avaliar um controlador sem câmara em vários tabuleiros e seeds.')
+    parser.add_argument('--controlador', choices=['autopiloto', 'repeticao'], default='autopiloto')
+    parser.add_argument('--opcoes', default='{}', help='opções do controlador em JSON, ex.: \'{"dead_zone": 5}\'')
+    parser.add_argument('--tabuleiros', nargs='+', default=['8x3'],
+                        help='tabuleiros (colunas x linhas de tijolos), ex.: 8x3 16x12')
+    parser.add_argument('--seeds', type=int, default=20, help='número de seeds por tabuleiro (0 a N-1)')
+    parser.add_argument('--max-ciclos', type=int, default=50000, help='máximo de ciclos de cada jogo')
+    parser.add_argument('--trabalhadores', type=int, default=os.cpu_count(), help='processos em paralelo')
+    parser.add_argument('--cache', default='avaliacoes.sqlite', help='ficheiro da cache dos resultados')
+    parser.add_argument('--cache-max', type=int, default=100000, help='resultados guardados na cache')
+    parser.add_argument('--sem-cache', action='store_true', help='jogar todos os jogos, sem usar a cache')
+    parser.add_argument('--json', help='ficheiro JSON onde guardar o resultado de cada jogo')
+    args = parser.parse_args()
+
+    # sem seeds não há jogos, e o resumo de cada tabuleiro dividiria por zero
+    if args.seeds < 1:
+        parser.error('--seeds tem de ser maior do que 0')
+
+    options = json.loads(args.opcoes)
+    layouts = []
+    for layout in args.tabuleiros:
+        columns, rows = layout.lower().split('x')
+        layouts.append((int(columns), int(rows)))
+
+    parameters = get_controller_parameters(options)
+    engine_version = '%s/%d' % (get_engine_version(), EPISODE_VERSION)
+    cache = EpisodeCache(args.cache, args.cache_max) if not args.sem_cache else None
+
+    # procurar cada jogo na cache, só os que faltam são jogados
+    episodes = []
+    results = {}
+
+    for columns, rows in layouts:
+        for seed in range(args.seeds):
+            key = get_episode_key(args.controlador, dict(parameters, max_ticks=args.max_ciclos),
+                                  get_layout_name(columns, rows), engine_version, seed)
+            episode = (columns, rows, seed, key)
+            episodes.append(episode)
+
+            result = cache.get(key) if cache is not None else None
+            if result is not None:
+                results[episode] = result
+
+    missing_episodes = [episode for episode in episodes if episode not in results]
+    start_time = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.trabalhadores) as pool:
+        futures = dict((pool.submit(play_episode, args.controlador, options, columns, rows, seed, args.max_ciclos),
+                        (columns, rows, seed, key)) for columns, rows, seed, key in missing_episodes)
+
+        # os resultados são guardados à medida que os jogos terminam, assim uma avaliação interrompida não perde
+        # os jogos já jogados
+        for future in as_completed(futures):
+            episode = futures[future]
+            results[episode] = future.result()
+
+            if cache is not None:
+                cache.put(episode[3], results[episode])
+
+    elapsed_time = time.perf_counter() - start_time
+
+    print('%-10s %7s %7s %8s %10s %10s %8s' % ('tabuleiro', 'jogos', 'ganhos', 'pontos', 'tijolos', 'ciclos',
+                                                'vidas'))
+    for columns, rows in layouts:
+        layout_results = [results[episode] for episode in episodes if episode[:2] == (columns, rows)]
+        count = len(layout_results)
+
+        print('%-10s %7d %7d %8.1f %10.1f %10.0f %8.2f' % (
+            get_layout_name(columns, rows), count, sum(1 for result in layout_results if result['state'] == 'WON'),
+            sum(result['score'] for result in layout_results) / count,
+            sum(result['bricks_cleared'] for result in layout_results) / count,
+            sum(result['ticks'] for result in layout_results) / count,
+            sum(result['lives_lost'] for result in layout_results) / count))
+
+    print('jogados: %d em %.1f s | da cache: %d' % (len(missing_episodes), elapsed_time,
+                                                    len(episodes) - len(missing_episodes)))
+
+    if cache is not None:
+        cache.close()
+
+    if args.json is not None:
+        with open(args.json, 'w') as json_file:
+            json.dump([dict(results[episode], layout=get_layout_name(*episode[:2]), seed=episode[2])
+                       for episode in episodes], json_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,391 @@
+# descrição:        benchmark reprodutível dos detetores (cor, movimento, faces e fundo) sobre clips gravados,
+#                   sem janelas, a várias escalas de processamento. cada clip tem as decisões corretas de cada
+#                   frame, e para cada detetor e escala são mostradas as fps, a latência por frame (p50/p90/p99),
+#                   o pico de memória e a percentagem de decisões corretas. os resultados podem ser guardados como
+#                   base e comparados com a base em execuções seguintes (termina com erro se alguma configuração
+#                   piorou).
+#                   uso: python benchmark.py clips/clips.json --guardar-base base.json
+#                        python benchmark.py clips/clips.json --comparar base.json
+#                        python benchmark.py --gerar-clips clips (clips sintéticos, para quem não tem gravações)
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+import cv2 as cv
+import numpy as np
+from Controllers import Part_Of_Screen, create_controller
+from Instrumentation import get_percentile
+
+
+# decisões a comparar com cada detetor: os de posição (onde está o objeto/face/silhueta)
+# e o optical flow (para onde é o movimento)
+LABEL_COLUMNS = {
+    'cor': 'posicao',
+    'movimento': 'movimento',
+    'faces': 'posicao',
+    'fundo': 'posicao'
+}
+
+
+# frames de um vídeo (usado também pelos benchmarks de cada detetor, ex.: benchmark_cor.py),
+# resolution: redimensionar as frames, para testar resoluções maiores que a do vídeo (por exemplo 1920x1080)
+def read_frames(video_path, max_frames, resolution=None):
+    video = cv.VideoCapture(video_path)
+    frames = []
+
+    while len(frames) < max_frames:
+        ret, frame = video.read()
+        if not ret:
+            break
+
+        if resolution is not None:
+            frame = cv.resize(frame, tuple(resolution), interpolation=cv.INTER_LINEAR)
+
+        frames.append(frame)
+
+    video.release()
+
+    return frames
+
+
+# memória alocada por frame pelo process_frame (usado pelos benchmarks de cada detetor)
+def measure_allocations(process_frame, frames, warmup_frames=10):
+    # as primeiras frames criam os buffers, por isso só contam as seguintes
+    for frame in frames[:warmup_frames]:
+        process_frame(frame)
+
+    tracemalloc.start()
+    allocated_bytes = 0
+
+    # memória alocada durante cada frame (pico durante a frame menos a memória antes dela)
+    for frame in frames[warmup_frames:]:
+        tracemalloc.reset_peak()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        process_frame(frame)
+        allocated_bytes += tracemalloc.get_traced_memory()[1] - memory_before
+
+    tracemalloc.stop()
+
+    return allocated_bytes / max(1, len(frames) - warmup_frames)
+
+
+# ficheiro CSV com as colunas frame, posicao e movimento (NONE, LEFT, MIDDLE ou RIGHT, vazio = sem decisão)
+def read_labels(labels_path):
+    labels = {'posicao': [], 'movimento': []}
+
+    with open(labels_path, newline='') as labels_file:
+        for row in csv.DictReader(labels_file):
+            for column in labels:
+                value = row.get(column, '').strip()
+                labels[column].append(Part_Of_Screen[value] if value else None)
+
+    return labels
+
+
+# o manifesto é um ficheiro JSON com a lista dos clips: vídeo, decisões corretas, frame e pixel em que o jogador
+# clica (o pixel do objeto a seguir pelo detetor de cor, na frame espelhada) e os detetores a que o clip se aplica
+def read_manifest(manifest_path):
+    with open(manifest_path) as manifest_file:
+        manifest = json.load(manifest_file)
+
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    clips = []
+
+    for clip in manifest['clips']:
+        clips.append({
+            'name': clip.get('nome', os.path.splitext(os.path.basename(clip['video']))[0]),
+            'video': os.path.join(manifest_dir, clip['video']),
+            'labels': os.path.join(manifest_dir, clip['decisoes']),
+            'click_frame': clip.get('clique', 0),
+            'pixel': clip.get('pixel', [320, 240]),
+            'detectors': clip.get('detetores', list(LABEL_COLUMNS))
+        })
+
+    return clips
+
+
+# iniciar o detetor tal como no jogo: as frames até ao clique são mostradas e depois o jogador clica no objeto
+# (o detetor de fundo aprende o fundo nessas frames)
+def create_detector(name, processing_scale, frames, click_frame, pixel):
+    detector = create_controller(name, processing_scale=processing_scale, preview_mode='off')
+
+    for frame in frames[:click_frame + 1]:
+        detector.process_frame(frame)
+
+    detector.click_in_camera_and_start_game(cv.EVENT_LBUTTONUP, pixel[0], pixel[1], None, None)
+
+    return detector
+
+
+# antes do clique o jogo ainda não iniciou e não há decisões, por isso só as frames depois do clique contam para
+# os tempos e para as decisões (a decisão de cada frame depois do clique, pela ordem das frames)
+def run_detector(name, frames, processing_scale, click_frame, pixel):
+    detector = create_detector(name, processing_scale, frames, click_frame, pixel)
+
+    decisions = []
+    frame_times = []
+    start_time = time.perf_counter()
+
+    for frame in frames[click_frame + 1:]:
+        frame_start_time = time.perf_counter()
+        decisions.append(detector.process_frame(frame))
+        frame_times.append(time.perf_counter() - frame_start_time)
+
+    elapsed_time = time.perf_counter() - start_time
+
+    return decisions, frame_times, elapsed_time
+
+
+# pico de memória (python e numpy) durante o processamento, numa execução à parte porque o tracemalloc atrasa
+def measure_peak_memory(name, frames, processing_scale, click_frame, pixel):
+    tracemalloc.start()
+    detector = create_detector(name, processing_scale, frames, click_frame, pixel)
+
+    for frame in frames[click_frame + 1:]:
+        detector.process_frame(frame)
+
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return peak_memory
+
+
+# percentagem de decisões corretas nas frames com decisão,
+# o meio (do detetor de cor) e nenhuma decisão significam ambos que o paddle não se move
+def get_accuracy(decisions, labels):
+    def normalize(decision):
+        return Part_Of_Screen.NONE if decision == Part_Of_Screen.MIDDLE else decision
+
+    pairs = [(normalize(decision), normalize(label)) for decision, label in zip(decisions, labels) if label is not None]
+
+    if len(pairs) == 0:
+        return None
+
+    return sum(decision == label for decision, label in pairs) / len(pairs)
+
+
+def run_benchmark(clips, detector_names, scales, max_frames, measure_memory):
+    results = []
+
+    for clip in clips:
+        frames = read_frames(clip['video'], max_frames)
+        if len(frames) <= clip['click_frame'] + 1:
+            print('%s: sem frames' % clip['video'])
+            continue
+
+        labels = read_labels(clip['labels'])
+
+        for name in detector_names:
+            if name not in clip['detectors']:
+                continue
+
+            for processing_scale in scales:
+                decisions, frame_times, elapsed_time = run_detector(name, frames, processing_scale,
+                                                                    clip['click_frame'], clip['pixel'])
+
+                peak_memory = None
+                if measure_memory:
+                    peak_memory = measure_peak_memory(name, frames, processing_scale, clip['click_frame'],
+                                                      clip['pixel'])
+
+                results.append({
+                    'clip': clip['name'],
+                    'detector': name,
+                    'scale': processing_scale,
+                    'frames': len(frame_times),
+                    'fps': len(frame_times) / elapsed_time,
+                    'latency_p50_ms': get_percentile(frame_times, 0.5) * 1000,
+                    'latency_p90_ms': get_percentile(frame_times, 0.9) * 1000,
+                    'latency_p99_ms': get_percentile(frame_times, 0.99) * 1000,
+                    'peak_memory_bytes': peak_memory,
+                    'accuracy': get_accuracy(decisions,
+                                             labels[LABEL_COLUMNS[name]][clip['click_frame'] + 1:len(frames)])
+                })
+
+    return results
+
+
+def get_result_key(result):
+    return '%s/%s/%g' % (result['clip'], result['detector'], result['scale'])
+
+
+def print_results(results):
+    print('%-14s %-10s %6s %8s %9s %9s %9s %12s %9s' % ('clip', 'detetor', 'escala', 'fps', 'p50', 'p90', 'p99',
+                                                       'memória', 'acerto'))
+
+    for result in results:
+        peak_memory = result['peak_memory_bytes']
+        accuracy = result['accuracy']
+        print('%-14s %-10s %6.2f %8.1f %7.2fms %7.2fms %7.2fms %12s %9s' % (
+            result['clip'], result['detector'], result['scale'], result['fps'], result['latency_p50_ms'],
+            result['latency_p90_ms'], result['latency_p99_ms'],
+            '-' if peak_memory is None else '%d KB' % (peak_memory // 1024),
+            '-' if accuracy is None else '%.1f%%' % (accuracy * 100)))
+
+
+# comparar com a base: uma configuração piorou se as fps baixaram mais do que a tolerância
+# ou se a percentagem de decisões corretas baixou
+def compare_results(results, baseline, fps_tolerance):
+    baseline_results = dict((get_result_key(result), result) for result in baseline['results'])
+    regressions = 0
+
+    print('%-34s %10s %10s %8s %9s %9s' % ('configuração', 'fps base', 'fps', 'dif.', 'acerto', 'base'))
+
+    for result in results:
+        key = get_result_key(result)
+        baseline_result = baseline_results.get(key)
+        if baseline_result is None:
+            print('%-34s (sem base)' % key)
+            continue
+
+        fps_change = result['fps'] / baseline_result['fps'] - 1
+        accuracy = result['accuracy'] if result['accuracy'] is not None else math.nan
+        baseline_accuracy = baseline_result['accuracy'] if baseline_result['accuracy'] is not None else math.nan
+
+        worse = fps_change < -fps_tolerance or accuracy < baseline_accuracy
+        regressions += worse
+
+        print('%-34s %10.1f %10.1f %+7.1f%% %8.1f%% %8.1f%% %s' % (
+            key, baseline_result['fps'], result['fps'], fps_change * 100, accuracy * 100, baseline_accuracy * 100,
+            'PIOROU' if worse else ''))
+
+    return regressions
+
+
+# gerar um clip sintético: um retângulo amarelo (do tamanho de um jogador) que entra na frame e anda para a esquerda
+# e para a direita sobre um fundo escuro com textura parado, com as decisões corretas (na frame espelhada,
+# tal como os detetores a veem), o jogador clica no retângulo quando ele aparece
+def generate_clips(clips_dir, frames_count=300, empty_frames=30, frame_size=(640, 480)):
+    os.makedirs(clips_dir, exist_ok=True)
+
+    frame_width, frame_height = frame_size
+    object_width, object_height = 160, 240
+
+    random_generator = np.random.default_rng(0)
+    background = random_generator.integers(20, 100, (frame_height, frame_width, 3), dtype=np.uint8)
+    background = cv.GaussianBlur(background, (21, 21), 0)
+
+    video_path = os.path.join(clips_dir, 'jogador.avi')
+    labels_path = os.path.join(clips_dir, 'jogador.csv')
+    writer = cv.VideoWriter(video_path, cv.VideoWriter_fourcc(*'MJPG'), 30, frame_size)
+
+    # centro do retângulo (na frame espelhada) em cada frame, num movimento de vai-e-vem a partir do meio,
+    # nas primeiras frames a cena está vazia
+    centers_x = [None] * empty_frames + [
+        frame_width / 2 + (frame_width / 2 - object_width / 2) * math.sin(2 * math.pi * index / 120)
+        for index in range(frames_count - empty_frames)]
+
+    with open(labels_path, 'w', newline='') as labels_file:
+        labels_writer = csv.writer(labels_file)
+        labels_writer.writerow(['frame', 'posicao', 'movimento'])
+
+        for index, center_x in enumerate(centers_x):
+            frame = background.copy()
+
+            if center_x is None:
+                writer.write(frame)
+                labels_writer.writerow([index, 'NONE', 'NONE'])
+                continue
+
+            # a câmara vê o retângulo do lado oposto (as frames são espelhadas pelos detetores)
+            left = int(round(frame_width - center_x - object_width / 2))
+            top = (frame_height - object_height) // 2
+            cv.rectangle(frame, (left, top), (left + object_width, top + object_height), (0, 220, 255), -1)
+            writer.write(frame)
+
+            # posição, com a mesma margem do meio que a segmentação (20 pixeis para cada lado)
+            if center_x < frame_width / 2 - 20:
+                position = 'LEFT'
+            elif center_x > frame_width / 2 + 20:
+                position = 'RIGHT'
+            else:
+                position = 'MIDDLE'
+
+            # movimento, só quando o retângulo anda depressa o suficiente para ser detetado
+            # (sem decisão quando aparece, e quando anda devagar de mais para ser claro)
+            movement = ''
+            if centers_x[index - 1] is not None:
+                displacement_x = center_x - centers_x[index - 1]
+                if displacement_x < -4:
+                    movement = 'LEFT'
+                elif displacement_x > 4:
+                    movement = 'RIGHT'
+                elif abs(displacement_x) < 1:
+                    movement = 'NONE'
+
+            labels_writer.writerow([index, position, movement])
+
+    writer.release()
+
+    manifest = {
+        'clips': [{
+            'nome': 'jogador',
+            'video': 'jogador.avi',
+            'decisoes': 'jogador.csv',
+            'clique': empty_frames,
+            'pixel': [frame_width // 2, frame_height // 2],
+            'detetores': ['cor', 'movimento', 'fundo']
+        }]
+    }
+
+    with open(os.path.join(clips_dir, 'clips.json'), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark reprodutível dos detetores sobre clips com as decisões '
+                                                 'corretas.')
+    parser.add_argument('manifestos', nargs='*', help='ficheiros JSON com a lista dos clips')
+    parser.add_argument('--detetores', nargs='+', choices=list(LABEL_COLUMNS), default=list(LABEL_COLUMNS))
+    parser.add_argument('--escalas', type=float, nargs='+', default=[1.0, 0.5, 0.25])
+    parser.add_argument('--max-frames', type=int, default=300)
+    parser.add_argument('--sem-memoria', action='store_true', help='não medir o pico de memória (mais rápido)')
+    parser.add_argument('--guardar-base', help='guardar os resultados num ficheiro JSON, para comparações futuras')
+    parser.add_argument('--comparar', help='comparar os resultados com uma base guardada anteriormente')
+    parser.add_argument('--tolerancia', type=float, default=0.1,
+                        help='descida máxima das fps em relação à base (0.1 = 10%%)')
+    parser.add_argument('--gerar-clips', help='gerar clips sintéticos (e o manifesto) nesta pasta e terminar')
+    args = parser.parse_args()
+
+    if args.gerar_clips is not None:
+        generate_clips(args.gerar_clips)
+        print('clips gerados em %s' % os.path.join(args.gerar_clips, 'clips.json'))
+        return
+
+    if len(args.manifestos) == 0:
+        parser.error('é preciso pelo menos um manifesto (ou --gerar-clips)')
+
+    clips = []
+    for manifest_path in args.manifestos:
+        clips += read_manifest(manifest_path)
+
+    results = run_benchmark(clips, args.detetores, args.escalas, args.max_frames, not args.sem_memoria)
+    print_results(results)
+
+    if args.guardar_base is not None:
+        with open(args.guardar_base, 'w') as baseline_file:
+            json.dump({'opencv': cv.__version__, 'results': results}, baseline_file, indent=2)
+
+    if args.comparar is not None:
+        with open(args.comparar) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        print()
+        regressions = compare_results(results, baseline, args.tolerancia)
+
+        if regressions > 0:
+            print('%d configurações pioraram em relação à base' % regressions)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
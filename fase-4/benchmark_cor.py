@@ -0,0 +1,86 @@
+# descrição:        benchmark da segmentação sobre vídeos gravados, sem janelas, a várias escalas de processamento.
+#                   mostra as fps, a percentagem de decisões iguais às da resolução original e (com --memoria)
+#                   a memória alocada por frame.
+#                   uso: python benchmark_cor.py video.mp4 [video.mp4 ...] --pixel 320 240
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import argparse
+import time
+import cv2 as cv
+from Segmentation import Segmentation
+from benchmark import read_frames, measure_allocations
+
+
+def run_segmentation(frames, processing_scale, pixel):
+    segmentation = Segmentation(processing_scale)
+
+    # simular o clique no objeto na primeira frame, para definir os thresholds e iniciar a segmentação
+    segmentation.process_frame(frames[0])
+    segmentation.click_in_camera_and_start_game(cv.EVENT_LBUTTONUP, pixel[0], pixel[1], None, None)
+
+    decisions = []
+    start_time = time.perf_counter()
+
+    for frame in frames:
+        decisions.append(segmentation.process_frame(frame))
+
+    elapsed_time = time.perf_counter() - start_time
+
+    return decisions, elapsed_time
+
+
+def measure_segmentation_allocations(frames, processing_scale, pixel):
+    segmentation = Segmentation(processing_scale)
+    segmentation.process_frame(frames[0])
+    segmentation.click_in_camera_and_start_game(cv.EVENT_LBUTTONUP, pixel[0], pixel[1], None, None)
+
+    # cada frame é processada e desenhada, tal como no ciclo da câmera
+    def process_frame(frame):
+        segmentation.process_frame(frame)
+        segmentation.draw_segmentation()
+
+    return measure_allocations(process_frame, frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da segmentação a várias escalas de processamento.')
+    parser.add_argument('videos', nargs='+')
+    parser.add_argument('--escalas', type=float, nargs='+', default=[1.0, 0.75, 0.5, 0.25])
+    parser.add_argument('--pixel', type=int, nargs=2, default=[320, 240],
+                        help='pixel do objeto a seguir na primeira frame (x y)')
+    parser.add_argument('--max-frames', type=int, default=300)
+    parser.add_argument('--memoria', action='store_true', help='medir a memória alocada por frame (tracemalloc)')
+    args = parser.parse_args()
+
+    print('%-30s %8s %10s %12s %14s' % ('vídeo', 'escala', 'fps', 'concordância', 'bytes/frame'))
+
+    for video_path in args.videos:
+        frames = read_frames(video_path, args.max_frames)
+        if len(frames) == 0:
+            print('%-30s sem frames' % video_path)
+            continue
+
+        # as decisões à resolução original servem de referência
+        reference_decisions, reference_time = run_segmentation(frames, 1.0, args.pixel)
+
+        for processing_scale in args.escalas:
+            if processing_scale == 1.0:
+                decisions, elapsed_time = reference_decisions, reference_time
+            else:
+                decisions, elapsed_time = run_segmentation(frames, processing_scale, args.pixel)
+
+            agreement = sum(a == b for a, b in zip(decisions, reference_decisions)) / len(frames)
+
+            allocated_bytes = -1
+            if args.memoria:
+                allocated_bytes = measure_segmentation_allocations(frames, processing_scale, args.pixel)
+
+            print('%-30s %8.2f %10.1f %11.1f%% %14.0f' % (video_path, processing_scale, len(frames) / elapsed_time,
+                                                          agreement * 100, allocated_bytes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# descrição:        benchmark da deteção de faces sobre vídeos gravados, sem janelas, a várias escalas e intervalos.
+#                   mostra as fps, a percentagem de decisões iguais às da resolução original e (com --memoria)
+#                   a memória alocada por frame.
+#                   uso: python benchmark_faces.py video.mp4 [video.mp4 ...] --intervalos 1 5 10
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import argparse
+import time
+import cv2 as cv
+from FaceDetection import FaceDetection
+from benchmark import read_frames, measure_allocations
+
+
+# simular o clique na câmara, para a deteção de faces ser feita desde a primeira frame
+def start_face_detection(face_detection):
+    face_detection.click_in_camera_and_start_game(cv.EVENT_LBUTTONUP, 0, 0, None, None)
+
+
+def run_face_detection(frames, processing_scale, detection_interval=1):
+    face_detection = FaceDetection(processing_scale, detection_interval)
+    face_detection.load_face_cascade()
+    start_face_detection(face_detection)
+
+    decisions = []
+    start_time = time.perf_counter()
+
+    for frame in frames:
+        decisions.append(face_detection.process_frame(frame))
+
+    elapsed_time = time.perf_counter() - start_time
+
+    return decisions, elapsed_time, face_detection.stats
+
+
+def measure_face_detection_allocations(frames, processing_scale, detection_interval):
+    face_detection = FaceDetection(processing_scale, detection_interval)
+    face_detection.load_face_cascade()
+    start_face_detection(face_detection)
+
+    # cada frame é processada e desenhada, tal como no ciclo da câmara
+    def process_frame(frame):
+        face_detection.process_frame(frame)
+        face_detection.draw_face()
+
+    return measure_allocations(process_frame, frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da deteção de faces a '
+                                             'várias escalas e intervalos de deteção.')
+    parser.add_argument('videos', nargs='+')
+    parser.add_argument('--escalas', type=float, nargs='+', default=[1.0, 0.75, 0.5, 0.25])
+    parser.add_argument('--intervalos', type=int, nargs='+', default=[1, 5, 10],
+                        help='número de frames entre cada aplicação do classificador')
+    parser.add_argument('--max-frames', type=int, default=300)
+    parser.add_argument('--memoria', action='store_true', help='medir a memória alocada por frame (tracemalloc)')
+    args = parser.parse_args()
+
+    print('%-30s %8s %10s %10s %12s %12s %14s' % ('vídeo', 'escala', 'intervalo', 'fps', 'concordância', 'deteções',
+                                                   'bytes/frame'))
+
+    for video_path in args.videos:
+        frames = read_frames(video_path, args.max_frames)
+        if len(frames) == 0:
+            print('%-30s sem frames' % video_path)
+            continue
+
+        # as decisões à resolução original, com o classificador em todas as frames, servem de referência
+        reference_decisions, reference_time, reference_stats = run_face_detection(frames, 1.0)
+
+        for processing_scale in args.escalas:
+            for detection_interval in args.intervalos:
+                if processing_scale == 1.0 and detection_interval == 1:
+                    decisions, elapsed_time, stats = reference_decisions, reference_time, reference_stats
+                else:
+                    decisions, elapsed_time, stats = run_face_detection(frames, processing_scale, detection_interval)
+
+                agreement = sum(a == b for a, b in zip(decisions, reference_decisions)) / len(frames)
+
+                allocated_bytes = -1
+                if args.memoria:
+                    allocated_bytes = measure_face_detection_allocations(frames, processing_scale, detection_interval)
+
+                print('%-30s %8.2f %10d %10.1f %11.1f%% %12d %14.0f' % (video_path, processing_scale,
+                                                                       detection_interval, len(frames) / elapsed_time,
+                                                                       agreement * 100, stats['detections'],
+                                                                       allocated_bytes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+# descrição:        benchmark da lógica do jogo, sem janela (numa HeadlessCanvas) e com o piloto automático:
+#                   ciclos do jogo por segundo com o tabuleiro do jogo (3 linhas de 8 tijolos) e com tabuleiros
+#                   maiores, custo da procura de colisões, custo de tratar os toques nos tijolos e duração de um
+#                   jogo completo. os resultados podem ser guardados como base e comparados com a base em
+#                   execuções seguintes (termina com erro se algum resultado piorou mais do que a tolerância).
+#                   uso: python benchmark_jogo.py --guardar-base base_jogo.json
+#                        python benchmark_jogo.py --comparar base_jogo.json
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from Game import Board, Board_State, Brick, get_bricks_layout
+from HeadlessCanvas import HeadlessCanvas
+from Controllers import AutopilotController
+
+
+# tabuleiros (colunas x linhas de tijolos), o primeiro é o do jogo
+LAYOUTS = [(8, 3), (16, 12), (32, 24)]
+
+
+def create_board(columns, rows):
+    # a janela cresce com o tabuleiro, com o mesmo espaço do jogo entre os tijolos e o paddle
+    width = columns * 75 + 10
+    height = 400 + (rows - 3) * 20
+    board = Board(HeadlessCanvas(width, height), width, height, get_bricks_layout(columns, rows))
+    board.add_ball()
+    board.paddle.ball = None
+
+    return board
+
+
+def get_layout_name(columns, rows):
+    return '%dx%d' % (columns, rows)
+
+
+# ciclos do jogo por segundo: o tempo é só o dos ciclos, uma bola perdida volta logo ao paddle
+# e um jogo terminado recomeça com um tabuleiro novo
+def measure_ticks(columns, rows, ticks):
+    controller = AutopilotController()
+    board = create_board(columns, rows)
+    total_time = 0.0
+
+    for index in range(ticks):
+        start_time = time.perf_counter()
+        state = board.tick([controller], start_time)
+        total_time += time.perf_counter() - start_time
+
+        if state == Board_State.BALL_LOST:
+            board.add_ball()
+            board.paddle.ball = None
+        elif state != Board_State.PLAYING:
+            board = create_board(columns, rows)
+
+    return ticks / total_time
+
+
+# procuras de colisões por segundo, com a bola em posições aleatórias (sempre as mesmas) sobre o tabuleiro,
+# só a procura (a bola não ressalta e os tijolos não são tocados)
+def measure_collisions(columns, rows, queries):
+    board = create_board(columns, rows)
+    random_generator = random.Random(0)
+    ball = board.ball
+
+    positions = [(random_generator.uniform(0, board.width), random_generator.uniform(0, board.height))
+                 for index in range(queries)]
+    collisions = 0
+
+    start_time = time.perf_counter()
+    for x, y in positions:
+        coords = ball.get_position()
+        ball.move(x - coords[0], y - coords[1])
+        collisions += len(board.find_collisions())
+    total_time = time.perf_counter() - start_time
+
+    return queries / total_time, collisions / queries
+
+
+# toques nos tijolos por segundo (mudar a cor e apagar), cada tijolo é tocado até desaparecer
+def measure_brick_hits(bricks_count):
+    canvas = HeadlessCanvas(610, 400)
+    bricks = [Brick(canvas, 40 + index % 8 * 75, 50 + index // 8 * 20, 3) for index in range(bricks_count)]
+
+    start_time = time.perf_counter()
+    for hits in range(3):
+        for brick in bricks:
+            brick.hit()
+    total_time = time.perf_counter() - start_time
+
+    return bricks_count * 3 / total_time
+
+
+# um jogo completo com o piloto automático, até ganhar, perder ou chegar ao máximo de ciclos
+# (a bola pode ficar presa a ressaltar sem tocar nos últimos tijolos)
+def measure_episode(columns, rows, max_ticks):
+    controller = AutopilotController()
+    board = create_board(columns, rows)
+    bricks_count = len(board.canvas.find_withtag('brick'))
+
+    state = Board_State.PLAYING
+    ticks = 0
+
+    start_time = time.perf_counter()
+    while ticks < max_ticks and state in (Board_State.PLAYING, Board_State.BALL_LOST):
+        if state == Board_State.BALL_LOST:
+            board.add_ball()
+            board.paddle.ball = None
+
+        state = board.tick([controller], time.perf_counter())
+        ticks += 1
+    total_time = time.perf_counter() - start_time
+
+    return {
+        'wall_time_s': total_time,
+        'ticks': ticks,
+        'ticks_per_second': ticks / total_time,
+        'state': state.name,
+        'bricks_destroyed': bricks_count - len(board.canvas.find_withtag('brick'))
+    }
+
+
+# cada medição é repetida e fica a melhor, a menos afetada por outros processos
+def run_benchmark(layouts, ticks, queries, bricks_count, max_ticks, repeats):
+    results = []
+
+    for columns, rows in layouts:
+        layout = get_layout_name(columns, rows)
+
+        ticks_per_second = max(measure_ticks(columns, rows, ticks) for index in range(repeats))
+        results.append({'benchmark': 'ticks', 'layout': layout, 'per_second': ticks_per_second})
+
+        measurements = [measure_collisions(columns, rows, queries) for index in range(repeats)]
+        queries_per_second = max(measurement[0] for measurement in measurements)
+        results.append({'benchmark': 'collisions', 'layout': layout, 'per_second': queries_per_second,
+                        'mean_collisions': measurements[0][1]})
+
+        episodes = [measure_episode(columns, rows, max_ticks) for index in range(repeats)]
+        episode = min(episodes, key=lambda result: result['wall_time_s'])
+        results.append(dict({'benchmark': 'episode', 'layout': layout, 'per_second': episode['ticks_per_second']},
+                            **episode))
+
+    hits_per_second = max(measure_brick_hits(bricks_count) for index in range(repeats))
+    results.append({'benchmark': 'brick_hits', 'layout': '%d' % bricks_count, 'per_second': hits_per_second})
+
+    return results
+
+
+def get_result_key(result):
+    return '%s/%s' % (result['benchmark'], result['layout'])
+
+
+def print_results(results):
+    print('%-22s %14s %s' % ('benchmark', 'por segundo', ''))
+
+    for result in results:
+        details = ''
+        if result['benchmark'] == 'collisions':
+            details = '%.2f colisões por procura' % result['mean_collisions']
+        elif result['benchmark'] == 'episode':
+            details = '%.3fs, %d ciclos, %s, %d tijolos destruídos' % (
+                result['wall_time_s'], result['ticks'], result['state'], result['bricks_destroyed'])
+
+        print('%-22s %14.0f %s' % (get_result_key(result), result['per_second'], details))
+
+
+# comparar com a base: um resultado piorou se o número de operações por segundo baixou mais do que a tolerância,
+# ou se um jogo completo acabou de outra forma (a lógica do jogo mudou)
+def compare_results(results, baseline, tolerance):
+    baseline_results = dict((get_result_key(result), result) for result in baseline['results'])
+    regressions = 0
+
+    print('%-22s %14s %14s %8s' % ('benchmark', 'base', 'atual', 'dif.'))
+
+    for result in results:
+        key = get_result_key(result)
+        baseline_result = baseline_results.get(key)
+        if baseline_result is None:
+            print('%-22s (sem base)' % key)
+            continue
+
+        change = result['per_second'] / baseline_result['per_second'] - 1
+        worse = change < -tolerance
+        changed = result['benchmark'] == 'episode' and (result['state'], result['ticks']) != (
+            baseline_result['state'], baseline_result['ticks'])
+        regressions += worse or changed
+
+        print('%-22s %14.0f %14.0f %+7.1f%% %s' % (
+            key, baseline_result['per_second'], result['per_second'], change * 100,
+            'PIOROU' if worse else 'JOGO DIFERENTE' if changed else ''))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da lógica do jogo, sem janela.')
+    parser.add_argument('--tabuleiros', nargs='+', default=[get_layout_name(*layout) for layout in LAYOUTS],
+                        help='tabuleiros (colunas x linhas de tijolos), ex.: 8x3 32x24')
+    parser.add_argument('--ciclos', type=int, default=20000, help='ciclos do jogo por medição')
+    parser.add_argument('--procuras', type=int, default=20000, help='procuras de colisões por medição')
+    parser.add_argument('--tijolos', type=int, default=50000, help='tijolos tocados por medição')
+    parser.add_argument('--max-ciclos', type=int, default=50000, help='máximo de ciclos de um jogo completo')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--guardar-base', help='guardar os resultados num ficheiro JSON, para comparações futuras')
+    parser.add_argument('--comparar', help='comparar os resultados com uma base guardada anteriormente')
+    parser.add_argument('--tolerancia', type=float, default=0.1,
+                        help='descida máxima das operações por segundo em relação à base (0.1 = 10%%)')
+    args = parser.parse_args()
+
+    layouts = []
+    for layout in args.tabuleiros:
+        columns, rows = layout.lower().split('x')
+        layouts.append((int(columns), int(rows)))
+
+    # as medições só são comparáveis com a base se forem feitas com os mesmos parâmetros
+    parameters = {'ticks': args.ciclos, 'queries': args.procuras, 'bricks': args.tijolos, 'max_ticks': args.max_ciclos}
+
+    baseline = None
+    if args.comparar is not None:
+        with open(args.comparar) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        if baseline.get('parameters') != parameters:
+            parser.error('a base foi medida com outros parâmetros: %s' % baseline.get('parameters'))
+
+    results = run_benchmark(layouts, args.ciclos, args.procuras, args.tijolos, args.max_ciclos, args.repeticoes)
+    print_results(results)
+
+    if args.guardar_base is not None:
+        with open(args.guardar_base, 'w') as baseline_file:
+            json.dump({'python': platform.python_version(), 'parameters': parameters, 'results': results},
+                      baseline_file, indent=2)
+
+    if baseline is not None:
+        print()
+        regressions = compare_results(results, baseline, args.tolerancia)
+
+        if regressions > 0:
+            print('%d resultados pioraram em relação à base' % regressions)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
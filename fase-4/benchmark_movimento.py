@@ -0,0 +1,119 @@
+# descrição:        benchmark do optical flow sobre vídeos gravados, sem janelas, a vários métodos e escalas.
+#                   mostra as fps, a percentagem de decisões iguais às do farneback à resolução original e
+#                   (com --memoria) a memória alocada por frame.
+#                   uso: python benchmark_movimento.py video.mp4 [video.mp4 ...] --metodos farneback dis lucas_kanade
+#                        python benchmark_movimento.py video.mp4 --resolucao 1920 1080 --trabalhadores 1 2 4
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import argparse
+import time
+import cv2 as cv
+from OpticalFlow import OpticalFlow
+from benchmark import read_frames, measure_allocations
+
+
+# simular o clique na câmara, para o optical flow ser calculado desde a primeira frame
+def start_optical_flow(optical_flow):
+    optical_flow.click_in_camera_and_start_game(cv.EVENT_LBUTTONUP, 0, 0, None, None)
+
+
+def run_optical_flow(frames, processing_scale, flow_method, dis_preset='fast', use_motion_gate=True, flow_workers=1):
+    optical_flow = OpticalFlow(processing_scale, flow_method, dis_preset, use_motion_gate, flow_workers)
+    start_optical_flow(optical_flow)
+
+    decisions = []
+    start_time = time.perf_counter()
+
+    for frame in frames:
+        decisions.append(optical_flow.process_frame(frame))
+
+    elapsed_time = time.perf_counter() - start_time
+
+    if optical_flow.flow_pool is not None:
+        optical_flow.flow_pool.shutdown()
+
+    return decisions, elapsed_time, optical_flow.get_stats()
+
+
+def measure_optical_flow_allocations(frames, processing_scale, flow_method, dis_preset, use_motion_gate,
+                                     flow_workers):
+    optical_flow = OpticalFlow(processing_scale, flow_method, dis_preset, use_motion_gate, flow_workers)
+    start_optical_flow(optical_flow)
+    allocated_bytes = measure_allocations(optical_flow.process_frame, frames)
+
+    if optical_flow.flow_pool is not None:
+        optical_flow.flow_pool.shutdown()
+
+    return allocated_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do optical flow a '
+                                             'vários métodos e escalas de processamento.')
+    parser.add_argument('videos', nargs='+')
+    parser.add_argument('--metodos', nargs='+', default=['farneback', 'dis', 'lucas_kanade'])
+    parser.add_argument('--presets', nargs='+', default=['ultrafast', 'fast', 'medium'],
+                        help='presets testados no método dis')
+    parser.add_argument('--escalas', type=float, nargs='+', default=[1.0, 0.75, 0.5, 0.25])
+    parser.add_argument('--max-frames', type=int, default=300)
+    parser.add_argument('--trabalhadores', type=int, nargs='+', default=[1],
+                        help='número de threads do flow denso em faixas')
+    parser.add_argument('--resolucao', type=int, nargs=2, default=None, help='redimensionar as frames (largura altura)')
+    parser.add_argument('--memoria', action='store_true', help='medir a memória alocada por frame (tracemalloc)')
+    parser.add_argument('--sem-portao', action='store_true',
+                        help='calcular sempre o flow, mesmo quando a cena está parada')
+    args = parser.parse_args()
+
+    print('%-30s %-14s %8s %8s %10s %10s %12s %10s %12s %14s' % ('vídeo', 'método', 'escala', 'threads', 'fps',
+                                                                   'ganho', 'concordância', 'paradas', 'poupado (s)',
+                                                                   'bytes/frame'))
+
+    for video_path in args.videos:
+        frames = read_frames(video_path, args.max_frames, args.resolucao)
+        if len(frames) == 0:
+            print('%-30s sem frames' % video_path)
+            continue
+
+        # as decisões do farneback à resolução original (sem verificação de movimento) servem de referência
+        reference_decisions, reference_time, reference_stats = run_optical_flow(frames, 1.0, 'farneback',
+                                                                                use_motion_gate=False)
+
+        # cada método é testado com cada preset (só o dis tem presets)
+        configurations = []
+        for flow_method in args.metodos:
+            if flow_method == 'dis':
+                configurations += [(flow_method, dis_preset) for dis_preset in args.presets]
+            else:
+                configurations.append((flow_method, None))
+
+        for flow_method, dis_preset in configurations:
+            method_name = flow_method if dis_preset is None else '%s_%s' % (flow_method, dis_preset)
+
+            for processing_scale in args.escalas:
+                for flow_workers in args.trabalhadores:
+                    # o lucas-kanade não é calculado em faixas
+                    if flow_method == 'lucas_kanade' and flow_workers > 1:
+                        continue
+
+                    decisions, elapsed_time, stats = run_optical_flow(frames, processing_scale, flow_method,
+                                                                      dis_preset, not args.sem_portao, flow_workers)
+
+                    agreement = sum(a == b for a, b in zip(decisions, reference_decisions)) / len(frames)
+
+                    allocated_bytes = -1
+                    if args.memoria:
+                        allocated_bytes = measure_optical_flow_allocations(frames, processing_scale, flow_method,
+                                                                           dis_preset, not args.sem_portao,
+                                                                           flow_workers)
+
+                    print('%-30s %-14s %8.2f %8d %10.1f %9.1fx %11.1f%% %9.1f%% %12.3f %14.0f' % (
+                        video_path, method_name, processing_scale, flow_workers, len(frames) / elapsed_time,
+                        reference_time / elapsed_time, agreement * 100, stats['gate_hit_rate'] * 100,
+                        stats['time_saved'], allocated_bytes))
+
+
+if __name__ == '__main__':
+    main()
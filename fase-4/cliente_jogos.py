@@ -0,0 +1,98 @@
+# descrição:        bots para o servidor de jogos (ver servidor_jogos.py): abre várias sessões em simultâneo,
+#                   cada uma com um bot que segue a bola (como o piloto automático) e, no fim, mostra o resultado e
+#                   os ciclos por segundo de cada sessão. os bots lentos (que demoram a ler cada estado) servem para
+#                   testar a paragem das sessões cujo cliente não acompanha o servidor.
+#                   uso: python cliente_jogos.py --sessoes 200 --porta 5555
+#                        python cliente_jogos.py --unix /tmp/jogos.sock --sessoes 50 --lentos 5
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import argparse
+import asyncio
+import math
+import time
+from Game import Board_State
+from servidor_jogos import HELLO, WELCOME, ACTION, STATE, BRICK
+
+
+# sessão de um bot: segue a bola com o paddle até o jogo terminar, e devolve o estado final e os ciclos recebidos
+async def run_bot(args, read_delay, dead_zone=10):
+    if args.unix is not None:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.porta)
+
+    writer.write(HELLO.pack(args.ciclos, args.colunas, args.linhas))
+    session_id, width, height, bricks_count = WELCOME.unpack(await reader.readexactly(WELCOME.size))
+
+    start_time = time.perf_counter()
+    bricks_left = bricks_count
+    direction = 0
+    state = Board_State.PLAYING
+    ticks = 0
+
+    try:
+        while state not in (Board_State.WON, Board_State.LOST):
+            ticks, state_value, lives, ball_x, ball_y, paddle_x, changed_bricks = STATE.unpack(
+                await reader.readexactly(STATE.size))
+            state = Board_State(state_value)
+
+            for index in range(changed_bricks):
+                brick_index, hits = BRICK.unpack(await reader.readexactly(BRICK.size))
+                if hits == 0:
+                    bricks_left -= 1
+
+            # só é enviada uma ação quando a direção muda
+            offset = ball_x - paddle_x
+            new_direction = -1 if offset < -dead_zone else 1 if offset > dead_zone else 0
+            if new_direction != direction:
+                direction = new_direction
+                writer.write(ACTION.pack(direction, math.nan))
+
+            if read_delay > 0:
+                await asyncio.sleep(read_delay)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+
+    writer.close()
+
+    return {'session': session_id, 'state': state.name, 'ticks': ticks, 'bricks_left': bricks_left,
+            'tick_rate': ticks / (time.perf_counter() - start_time)}
+
+
+async def run_bots(args):
+    # os bots lentos demoram o dobro de um ciclo a ler cada estado
+    read_delay = 2 / (args.ciclos or 20)
+    bots = [run_bot(args, read_delay if index < args.lentos else 0) for index in range(args.sessoes)]
+
+    return await asyncio.gather(*bots)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bots para o servidor de jogos.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=5555)
+    parser.add_argument('--unix', help='caminho do socket unix do servidor (em vez de TCP)')
+    parser.add_argument('--sessoes', type=int, default=10, help='sessões em simultâneo')
+    parser.add_argument('--lentos', type=int, default=0, help='quantas das sessões têm um bot lento')
+    parser.add_argument('--ciclos', type=int, default=0, help='ciclos por segundo de cada sessão (0 = os do jogo)')
+    parser.add_argument('--colunas', type=int, default=8, help='colunas de tijolos')
+    parser.add_argument('--linhas', type=int, default=3, help='linhas de tijolos')
+    args = parser.parse_args()
+
+    results = asyncio.run(run_bots(args))
+
+    for result in results:
+        print('sessão %4d: %-7s %6d ciclos | %5.1f ciclos/s | tijolos por partir: %d' % (
+            result['session'], result['state'], result['ticks'], result['tick_rate'], result['bricks_left']))
+
+    print('ganhos: %d | perdidos: %d | ciclos/s médio: %.1f' % (
+        sum(1 for result in results if result['state'] == 'WON'),
+        sum(1 for result in results if result['state'] == 'LOST'),
+        sum(result['tick_rate'] for result in results) / len(results)))
+
+
+if __name__ == '__main__':
+    main()
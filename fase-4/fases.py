@@ -0,0 +1,36 @@
+# descrição:        as fases 1 a 3 usam o jogo, os detetores e a pré-visualização desta fase (uma só cópia de cada),
+#                   os ficheiros main.py e benchmark.py de cada fase só correm aqui o script correspondente, com o
+#                   controlador da fase. este é o único sítio que liga as fases anteriores a esta pasta: os outros
+#                   ficheiros desta fase são importados normalmente, porque este script corre a partir dela.
+#                   uso (a partir das outras fases): python ../fase-4/fases.py 1 jogo --escala 0.5
+#                                                    python ../fase-4/fases.py 3 benchmark video.mp4 --intervalos 1 5
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import runpy
+import sys
+
+
+# script desta fase e argumentos fixos de cada fase (os restantes argumentos são os da linha de comandos)
+PHASES = {
+    '1': {'jogo': ('main', ['--controlador', 'cor']), 'benchmark': ('benchmark_cor', [])},
+    '2': {'jogo': ('main', ['--controlador', 'movimento']), 'benchmark': ('benchmark_movimento', [])},
+    '3': {'jogo': ('main', ['--controlador', 'faces']), 'benchmark': ('benchmark_faces', [])}
+}
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in PHASES or sys.argv[2] not in PHASES[sys.argv[1]]:
+        sys.exit('uso: python fases.py 1|2|3 jogo|benchmark [argumentos]')
+
+    module_name, arguments = PHASES[sys.argv[1]][sys.argv[2]]
+
+    # o script corre como se fosse chamado diretamente, com os argumentos fixos da fase antes dos outros
+    sys.argv = [module_name + '.py'] + arguments + sys.argv[3:]
+    runpy.run_module(module_name, run_name='__main__', alter_sys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+# descrição:        medição automática da latência entre o movimento do jogador e o paddle: uma câmara sintética
+#                   (ver SyntheticCamera) mostra um alvo que muda de direção em instantes conhecidos, o detetor corre
+#                   no seu thread tal como no jogo, e a lógica do jogo (sem janela) move o paddle a cada ciclo.
+#                   a latência é o tempo até o paddle começar a andar para o lado certo, depois de o alvo mudar de
+#                   direção (optical flow e posição contínua) ou de passar para o outro lado da frame (cor, faces e
+#                   fundo, que decidem pelo lado onde está o alvo). o resultado é a distribuição das latências de
+#                   cada controlador, que pode ser acrescentada a um histórico para acompanhar ao longo do tempo.
+#                   uso: python latencia.py --controladores cor movimento faces --duracao 30
+#                        python latencia.py --posicao-continua --historico latencias.jsonl
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import argparse
+import datetime
+import json
+import time
+from Game import Board, Board_State
+from HeadlessCanvas import HeadlessCanvas
+from Controllers import create_controller
+from PositionFilter import KalmanPositionFilter
+from SyntheticCamera import SyntheticCamera, DETECTOR_TARGETS
+from Instrumentation import get_percentile
+
+
+# controladores que decidem pelo lado da frame onde está o alvo (os restantes pela direção do movimento)
+POSITION_CONTROLLERS = ['cor', 'faces', 'fundo']
+
+
+# ciclos do jogo durante duration segundos, ao ritmo do jogo, e a direção do paddle em cada ciclo
+# (-1 = esquerda, 0 = parado, 1 = direita)
+def run_game(controller, duration, tick_interval):
+    board = Board(HeadlessCanvas(610, 400))
+    board.add_ball()
+    board.paddle.ball = None
+
+    paddle_moves = []
+    next_tick_time = time.perf_counter()
+    end_time = next_tick_time + duration
+
+    while next_tick_time < end_time:
+        time.sleep(max(0.0, next_tick_time - time.perf_counter()))
+        tick_time = time.perf_counter()
+
+        paddle_x = board.paddle.get_position()[0]
+        state = board.tick([controller], tick_time)
+        offset = board.paddle.get_position()[0] - paddle_x
+
+        # a bola não interessa para a latência, quando se perde (ou o jogo termina) é posta de novo no paddle
+        if state != Board_State.PLAYING:
+            board.lives = 3
+            board.add_ball()
+            board.paddle.ball = None
+
+        paddle_moves.append((tick_time, (offset > 0) - (offset < 0)))
+        next_tick_time += tick_interval
+
+    return paddle_moves
+
+
+# latência de cada acontecimento (instante e direção esperada do paddle): o tempo até ao primeiro ciclo em que o
+# paddle anda nessa direção, antes do acontecimento seguinte (senão o acontecimento é contado como perdido)
+def get_latencies(events, paddle_moves):
+    latencies = []
+    missed = 0
+    move_index = 0
+
+    for index, (event_time, paddle_direction) in enumerate(events):
+        next_event_time = events[index + 1][0] if index + 1 < len(events) else paddle_moves[-1][0]
+
+        while move_index < len(paddle_moves) and paddle_moves[move_index][0] < event_time:
+            move_index += 1
+
+        latency = None
+        for move_time, move_direction in paddle_moves[move_index:]:
+            if move_time >= next_event_time:
+                break
+            if move_direction == paddle_direction:
+                latency = move_time - event_time
+                break
+
+        if latency is None:
+            missed += 1
+        else:
+            latencies.append(latency)
+
+    return latencies, missed
+
+
+def measure_latency(name, duration, warmup, processing_scale, tick_interval, continuous_position, fps, speed):
+    camera = SyntheticCamera(DETECTOR_TARGETS[name], fps=fps, speed=speed)
+
+    options = dict(preview_mode='off')
+    if processing_scale is not None:
+        options['processing_scale'] = processing_scale
+
+    controller = create_controller(name, **options)
+    controller.set_camera(camera)
+    if continuous_position:
+        controller.set_position_filter(KalmanPositionFilter())
+    controller.start()
+
+    # sem janela os detetores iniciam sozinhos (o de cor escolhe a cor do alvo no meio da primeira frame)
+    while not controller.is_start:
+        time.sleep(0.01)
+
+    paddle_moves = run_game(controller, warmup + duration, tick_interval)
+
+    controller.is_finish = True
+    controller.join()
+
+    # os detetores veem a câmara espelhada, por isso o paddle deve andar para o lado contrário ao da câmara,
+    # e os acontecimentos do aquecimento (modelo do fundo, filtro de posição, etc.) não contam
+    turns, crossings = camera.get_events()
+    events = turns if continuous_position or name not in POSITION_CONTROLLERS else crossings
+    measure_start_time = paddle_moves[0][0] + warmup
+    events = [(event_time, -direction) for event_time, direction in events if event_time >= measure_start_time]
+
+    latencies, missed = get_latencies(events, paddle_moves)
+
+    summary = {'events': len(events), 'missed': missed}
+    if len(latencies) > 0:
+        summary.update({
+            'mean_ms': sum(latencies) / len(latencies) * 1000,
+            'p50_ms': get_percentile(latencies, 0.5) * 1000,
+            'p90_ms': get_percentile(latencies, 0.9) * 1000,
+            'p99_ms': get_percentile(latencies, 0.99) * 1000,
+            'max_ms': max(latencies) * 1000
+        })
+
+    return summary, [latency * 1000 for latency in latencies]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latência entre o movimento do jogador e o paddle, com uma câmara '
+                                                 'sintética.')
+    parser.add_argument('--controladores', nargs='+', choices=list(DETECTOR_TARGETS),
+                        default=['cor', 'movimento', 'faces'])
+    parser.add_argument('--duracao', type=float, default=20, help='segundos medidos por controlador')
+    parser.add_argument('--aquecimento', type=float, default=2, help='segundos iniciais que não são medidos')
+    parser.add_argument('--escala', type=float, help='escala de processamento (por omissão a de cada detetor)')
+    parser.add_argument('--ciclo', type=float, default=0.05, help='segundos entre ciclos do jogo (como no jogo)')
+    parser.add_argument('--posicao-continua', action='store_true', help='o paddle segue a posição (filtro de kalman)')
+    parser.add_argument('--fps', type=float, default=30, help='frames por segundo da câmara sintética')
+    parser.add_argument('--velocidade', type=float, default=250, help='velocidade do alvo (pixels por segundo)')
+    parser.add_argument('--json', help='ficheiro JSON onde guardar os resultados e todas as latências')
+    parser.add_argument('--historico', help='ficheiro onde acrescentar uma linha JSON com o resumo de cada execução')
+    args = parser.parse_args()
+
+    parameters = {'duration': args.duracao, 'processing_scale': args.escala, 'tick_interval': args.ciclo,
+                  'continuous_position': args.posicao_continua, 'fps': args.fps, 'speed': args.velocidade}
+    results = {}
+
+    print('%-10s %9s %8s %9s %9s %9s %9s' % ('controlador', 'mudanças', 'perdidas', 'média', 'p50', 'p90', 'p99'))
+
+    for name in args.controladores:
+        summary, latencies = measure_latency(name, args.duracao, args.aquecimento, args.escala, args.ciclo,
+                                             args.posicao_continua, args.fps, args.velocidade)
+        results[name] = {'summary': summary, 'latencies_ms': latencies}
+
+        if 'mean_ms' in summary:
+            print('%-10s %9d %8d %7.0fms %7.0fms %7.0fms %7.0fms' % (
+                name, summary['events'], summary['missed'], summary['mean_ms'], summary['p50_ms'],
+                summary['p90_ms'], summary['p99_ms']))
+        else:
+            print('%-10s %9d %8d' % (name, summary['events'], summary['missed']))
+
+    date = datetime.datetime.now().isoformat(timespec='seconds')
+
+    if args.json is not None:
+        with open(args.json, 'w') as json_file:
+            json.dump({'date': date, 'parameters': parameters, 'results': results}, json_file, indent=2)
+
+    if args.historico is not None:
+        with open(args.historico, 'a') as history_file:
+            summaries = dict((name, result['summary']) for name, result in results.items())
+            history_file.write(json.dumps({'date': date, 'parameters': parameters, 'results': summaries}) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+# descrição:        ficheiro principal do jogo, com o controlador do paddle escolhido na linha de comandos.
+#                   uso: python main.py --controlador cor|movimento|faces|fundo|fusao|teclado|autopiloto|repeticao
+#                        python main.py --jogadores cor faces --camaras partilhada
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import time
+
+# instante em que o programa começou, para o relatório do arranque
+startup_time = time.perf_counter()
+
+import argparse
+import tkinter as tk
+from Game import Game
+from Controllers import CONTROLLERS, create_controller
+from PositionFilter import KalmanPositionFilter
+from Instrumentation import timings
+from QualityGovernor import QualityGovernor
+
+
+# detetores que podem ser usados por cada jogador no modo de vários jogadores, e as câmaras desse modo
+# (ver Multiplayer, que só é importado nesse modo)
+PLAYER_CONTROLLERS = ['cor', 'movimento', 'faces', 'fundo']
+CAMERA_MODES = ['separadas', 'partilhada', 'sintetica']
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Break Those Bricks, com vários controladores do paddle.')
+    parser.add_argument('--controlador', choices=sorted(CONTROLLERS), default='cor', help='controlador do paddle')
+    parser.add_argument('--escala', type=float,
+                        help='escala de processamento das frames da câmara (por omissão 1.0, ou 0.25 no fundo)')
+    parser.add_argument('--metodo', choices=['farneback', 'dis', 'lucas_kanade'], default='farneback',
+                        help='método de optical flow (controlador movimento)')
+    parser.add_argument('--preset', choices=['ultrafast', 'fast', 'medium'], default='fast',
+                        help='preset do método dis (controlador movimento)')
+    parser.add_argument('--trabalhadores', type=int, default=1,
+                        help='número de threads do flow denso em faixas (controlador movimento)')
+    parser.add_argument('--sobreposicao', type=int, default=16,
+                        help='linhas de sobreposição entre faixas (controlador movimento)')
+    parser.add_argument('--sem-portao', action='store_true',
+                        help='calcular sempre o flow, mesmo quando a cena está parada (controlador movimento)')
+    parser.add_argument('--subtrator', choices=['mog2', 'knn'], default='mog2',
+                        help='modelo de fundo (controlador fundo)')
+    parser.add_argument('--intervalo', type=int, default=1,
+                        help='número de frames entre cada aplicação do classificador (controlador faces)')
+    parser.add_argument('--detetores', nargs='+', choices=['cor', 'movimento', 'faces', 'fundo'],
+                        default=['faces', 'movimento'],
+                        help='detetores combinados pelo controlador fusao (o primeiro é o principal)')
+    parser.add_argument('--fusao', choices=['portao', 'maioria'], default='portao',
+                        help='como combinar as decisões: principal só quando os outros detetam algo, ou por maioria')
+    parser.add_argument('--posicao-continua', action='store_true',
+                        help='o paddle segue a posição do objeto/face (filtro de kalman) em vez de andar por passos')
+    parser.add_argument('--repeticao', help='ficheiro com as decisões a repetir (controlador repeticao)')
+    parser.add_argument('--gravar', help='pasta onde gravar a sessão da câmara (frames, instantes e decisões)')
+    parser.add_argument('--gravar-max-frames', type=int, default=3600,
+                        help='frames que cabem na gravação (3600 = 2 minutos a 30 fps)')
+    parser.add_argument('--orcamento', type=float,
+                        help='milissegundos de processamento por frame: a qualidade dos detetores baixa quando '
+                             'o processamento passa o orçamento e volta a subir quando há folga')
+    parser.add_argument('--telemetria', help='pasta onde guardar o estado do jogo em cada ciclo (ver Telemetry)')
+    parser.add_argument('--telemetria-bloco', type=int, default=4096,
+                        help='registos de cada bloco escrito no disco')
+    parser.add_argument('--tempos', action='store_true',
+                        help='medir o tempo de cada etapa (captura, filtros, deteção, imshow, ciclo do jogo)')
+    parser.add_argument('--tempos-intervalo', type=float, default=5,
+                        help='segundos entre cada resumo dos tempos durante o jogo (0 = só no fim)')
+    parser.add_argument('--tempos-json', help='ficheiro JSON onde guardar os tempos no fim (implica --tempos)')
+    parser.add_argument('--tempos-csv', help='ficheiro CSV onde guardar os tempos no fim (implica --tempos)')
+    parser.add_argument('--pre-visualizacao', choices=['off', 'frames', 'fps'], default='frames',
+                        help='pré-visualização da câmara: desligada, uma em cada N frames ou N frames por segundo')
+    parser.add_argument('--pre-visualizacao-n', type=int, default=1, help='N do modo frames')
+    parser.add_argument('--pre-visualizacao-fps', type=float, default=30, help='frames por segundo do modo fps')
+    parser.add_argument('--jogadores', nargs='+', choices=PLAYER_CONTROLLERS,
+                        help='vários jogadores, com o detetor de cada um (cada detetor corre no seu processo)')
+    parser.add_argument('--camaras', choices=CAMERA_MODES, default='separadas',
+                        help='câmaras dos jogadores: uma por jogador, uma câmara dividida numa zona por jogador, '
+                             'ou câmaras sintéticas (para testar sem câmaras)')
+    args = parser.parse_args()
+
+    if args.controlador == 'repeticao' and args.repeticao is None:
+        parser.error('o controlador repeticao precisa do ficheiro --repeticao')
+    if args.jogadores is not None and args.gravar is not None:
+        parser.error('a gravação da sessão só é possível com um jogador')
+    if args.pre_visualizacao_n <= 0:
+        parser.error('--pre-visualizacao-n tem de ser maior do que 0')
+    if args.pre_visualizacao_fps <= 0:
+        parser.error('--pre-visualizacao-fps tem de ser maior do que 0')
+
+    return args
+
+
+# escala de processamento escolhida, ou a escala por omissão do controlador
+def get_processing_scale(args, default=1.0):
+    return args.escala if args.escala is not None else default
+
+
+# opções de cada controlador (os que não estão aqui não têm opções)
+def get_controller_options(args, name):
+    preview_options = dict(preview_mode=args.pre_visualizacao, preview_every=args.pre_visualizacao_n,
+                           preview_fps=args.pre_visualizacao_fps)
+
+    if name == 'cor':
+        return dict(processing_scale=get_processing_scale(args), **preview_options)
+    elif name == 'movimento':
+        return dict(processing_scale=get_processing_scale(args), flow_method=args.metodo, dis_preset=args.preset,
+                    use_motion_gate=not args.sem_portao, flow_workers=args.trabalhadores,
+                    strip_overlap=args.sobreposicao, **preview_options)
+    elif name == 'faces':
+        return dict(processing_scale=get_processing_scale(args), detection_interval=args.intervalo, **preview_options)
+    elif name == 'fundo':
+        return dict(processing_scale=get_processing_scale(args, 0.25), subtractor=args.subtrator, **preview_options)
+    elif name == 'repeticao':
+        return dict(replay_path=args.repeticao)
+    elif name == 'fusao':
+        # os detetores da fusão não têm janela própria, a pré-visualização é a da fusão
+        detectors = [create_controller(detector_name,
+                                       **dict(get_controller_options(args, detector_name), preview_mode='off'))
+                     for detector_name in args.detetores]
+        return dict(detectors=detectors, fusion_rule=args.fusao, **preview_options)
+
+    return {}
+
+
+def main():
+    args = parse_arguments()
+
+    # os tempos das etapas só são medidos quando pedidos
+    measure_timings = args.tempos or args.tempos_json is not None or args.tempos_csv is not None
+    if measure_timings:
+        timings.enable()
+
+    # orçamento de processamento de cada frame do governador da qualidade (em segundos)
+    frame_budget = args.orcamento / 1000 if args.orcamento is not None else None
+
+    # vários jogadores: um controlador por jogador, cada um com o detetor a correr num processo próprio
+    # (os tempos das etapas dos detetores ficam nesses processos, aqui só os do jogo)
+    shared_camera = None
+    recorder = None
+
+    if args.jogadores is not None:
+        from Multiplayer import create_players
+
+        shared_camera, controllers = create_players(args.jogadores, [get_controller_options(args, name)
+                                                                     for name in args.jogadores], args.camaras,
+                                                    frame_budget)
+    else:
+        # iniciar o controlador (câmara, classificador, etc.) antes de criar a janela do jogo, para correrem em
+        # simultâneo
+        controller_options = get_controller_options(args, args.controlador)
+        controllers = [create_controller(args.controlador, **controller_options)]
+
+        # gravar o que a câmara viu e as decisões do controlador, para repetir depois com reproduzir_sessao.py
+        # (só importado quando pedido, tal como os controladores, porque precisa do numpy)
+        if args.gravar is not None:
+            from SessionRecording import SessionRecorder
+
+            recorder = SessionRecorder(args.gravar, args.gravar_max_frames,
+                                       metadata=dict(controller=args.controlador,
+                                                     processing_scale=controller_options.get('processing_scale'),
+                                                     detectors=args.detetores if args.controlador == 'fusao' else None))
+            recorder.start()
+            controllers[0].set_recorder(recorder)
+
+        # baixar a qualidade do detetor quando o computador está ocupado
+        if frame_budget is not None:
+            controllers[0].set_quality_governor(QualityGovernor(frame_budget))
+
+    for controller in controllers:
+        # prever a posição do objeto/face no instante de cada ciclo do jogo, para esconder a latência da câmara
+        if args.posicao_continua:
+            controller.set_position_filter(KalmanPositionFilter())
+
+        controller.start()
+
+    # registar o estado de cada ciclo do jogo, escrito no disco por um thread próprio
+    # (só importado quando pedido, porque precisa do numpy)
+    telemetry = None
+    if args.telemetria is not None:
+        from Telemetry import TelemetryWriter
+
+        telemetry = TelemetryWriter(args.telemetria, args.telemetria_bloco,
+                                    metadata=dict(controllers=args.jogadores if args.jogadores is not None
+                                                  else [args.controlador]))
+        telemetry.start()
+
+    root = tk.Tk()
+    root.title('Break Those Bricks')
+
+    game = Game(root, controllers, telemetry)
+
+    # mostrar quanto tempo demorou cada etapa do arranque, desde o início do programa
+    startup_times = dict(getattr(controllers[0], 'startup_times', {}), **game.startup_times)
+    for step, step_time in sorted(startup_times.items(), key=lambda item: item[1]):
+        print('%-20s %8.1f ms' % (step, (step_time - startup_time) * 1000))
+
+    # mostrar o resumo dos tempos de tempos a tempos, durante o jogo
+    def report_timings():
+        print(timings.format_summary())
+        root.after(int(args.tempos_intervalo * 1000), report_timings)
+
+    if measure_timings and args.tempos_intervalo > 0:
+        root.after(int(args.tempos_intervalo * 1000), report_timings)
+
+    game.mainloop()
+
+    # terminar a câmara partilhada pelos jogadores (os processos dos jogadores já terminaram)
+    if shared_camera is not None:
+        shared_camera.close()
+
+    # terminar a gravação (o controlador já terminou quando a janela do jogo fecha)
+    if recorder is not None:
+        recorder.close()
+        print('sessão gravada em %s: %d frames | descartadas %d' % (args.gravar, recorder.frames_count,
+                                                                     recorder.dropped_frames))
+
+    if telemetry is not None:
+        telemetry.close()
+        print('telemetria guardada em %s: %d registos | descartados %d' % (args.telemetria, telemetry.rows_count,
+                                                                          telemetry.dropped_rows))
+
+    # resumo final dos tempos, e guardá-los nos ficheiros pedidos
+    if measure_timings:
+        print(timings.format_summary())
+
+        if args.tempos_json is not None:
+            timings.export_json(args.tempos_json)
+        if args.tempos_csv is not None:
+            timings.export_csv(args.tempos_csv)
+
+    # mostrar quantas frames paradas não precisaram de optical flow e o tempo de CPU poupado
+    if args.jogadores is None and args.controlador == 'movimento':
+        stats = controllers[0].get_stats()
+        print('frames: %d | paradas: %.1f%% | flow médio: %.1f ms | poupado: %.2f s' % (
+            stats['frames'], stats['gate_hit_rate'] * 100, stats['flow_time_average'] * 1000, stats['time_saved']))
+
+    # mostrar em que nível de qualidade o detetor terminou e quantas vezes o governador mudou de nível
+    quality_stats = controllers[0].get_quality_stats()
+    if args.jogadores is None and len(quality_stats) > 0 and quality_stats['frame_time_average_ms'] is not None:
+        print('qualidade: nível %d de %d | baixou %d | subiu %d | processamento médio: %.1f ms '
+              '(orçamento %.1f ms)' % (
+            quality_stats['quality_level'], quality_stats['quality_levels'] - 1, quality_stats['quality_lowered'],
+            quality_stats['quality_raised'], quality_stats['frame_time_average_ms'], quality_stats['frame_budget_ms']))
+
+    # mostrar quantos resultados do pré-processamento foram partilhados entre os detetores
+    if args.jogadores is None and args.controlador == 'fusao':
+        stats = controllers[0].get_stats()
+        print('pré-processamento: calculados %d | reaproveitados %d' % (stats['computed'], stats['reused']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+# descrição:        processar vídeos longos com um detetor, sem janelas, e guardar a decisão e a posição do
+#                   objeto/face/silhueta de cada frame num ficheiro binário compacto (ver TRACE_DTYPE).
+#                   o vídeo é dividido em blocos processados em paralelo por vários processos, cada bloco começa
+#                   umas frames antes (aquecimento) para os detetores com estado (ex.: o optical flow precisa da
+#                   frame anterior) darem as mesmas decisões que um processamento sequencial. os resultados são
+#                   escritos por ordem à medida que os blocos terminam, com poucos blocos em memória de cada vez.
+#                   uso: python processar_video.py video.avi --detetor movimento --trabalhadores 4
+#                        python processar_video.py video.avi --detetor cor --clique 30 --pixel 320 240 --verificar
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import cv2 as cv
+import numpy as np
+from Controllers import create_controller
+from SessionRecording import NO_DECISION
+
+
+# registo de cada frame: índice, decisão (valor do Part_Of_Screen, NO_DECISION antes do jogo iniciar)
+# e posição (fração da largura da frame, NaN quando o detetor não mede posições ou não encontrou nada)
+TRACE_DTYPE = np.dtype([('frame', '<u4'), ('decision', 'i1'), ('position', '<f4')])
+
+# frames de aquecimento de cada detetor: o optical flow precisa da frame anterior, as faces da última face (o
+# classificador só procura faces de tamanho parecido com ela e, entre deteções, a face é seguida pelo template),
+# por isso pelo menos um intervalo de deteção mais uma frame (com folga, para o tamanho da face estabilizar), e o
+# modelo do fundo de várias frames (e por isso só fica aproximadamente igual). a cor só guarda a última decisão
+# (ver CARRIED_DECISIONS), que nenhum aquecimento garante quando o objeto desaparece durante muitas frames
+WARMUP_FRAMES = {
+    'cor': 0,
+    'movimento': 1,
+    'faces': 10,
+    'fundo': 300
+}
+
+# detetores que mantêm a última decisão nas frames em que não encontram o objeto/face (e só mudam de decisão quando
+# medem uma posição): as primeiras frames de cada bloco sem posição medida recebem a última decisão do bloco
+# anterior, tal como no processamento sequencial
+CARRIED_DECISIONS = ['cor', 'faces']
+
+
+# recebe as posições medidas pelo detetor no lugar do filtro de posição (ver Controller.update_position)
+class PositionTrace(object):
+    def __init__(self):
+        self.position = None
+
+    def update(self, position, measurement_time):
+        self.position = position
+
+    def predict(self, now):
+        return None
+
+
+# processar as frames [chunk_start, chunk_end) do vídeo, a partir de um detetor novo (num processo do pool)
+def process_chunk(video_path, name, processing_scale, chunk_start, chunk_end, warmup, click_frame, pixel):
+    detector = create_controller(name, processing_scale=processing_scale, preview_mode='off')
+    position_trace = PositionTrace()
+    detector.set_position_filter(position_trace)
+
+    video = cv.VideoCapture(video_path)
+    warmup_start = max(0, chunk_start - warmup)
+
+    # o clique foi antes do aquecimento: a frame do clique é processada primeiro, para o detetor de cor
+    # escolher a cor do objeto nela (o aquecimento substitui depois o estado dos outros detetores)
+    if click_frame < warmup_start:
+        video.set(cv.CAP_PROP_POS_FRAMES, click_frame)
+        ret, frame = video.read()
+        if ret:
+            detector.process_frame(frame)
+        detector.click_in_camera_and_start_game(cv.EVENT_LBUTTONUP, pixel[0], pixel[1], None, None)
+
+    video.set(cv.CAP_PROP_POS_FRAMES, warmup_start)
+
+    trace = np.zeros(chunk_end - chunk_start, TRACE_DTYPE)
+    frames_count = 0
+
+    for index in range(warmup_start, chunk_end):
+        ret, frame = video.read()
+        if not ret:
+            break
+
+        position_trace.position = None
+        decision = detector.process_frame(frame)
+
+        # as decisões das frames do aquecimento não são guardadas
+        if index >= chunk_start:
+            record = trace[index - chunk_start]
+            record['frame'] = index
+            record['decision'] = decision.value if detector.is_start else NO_DECISION
+            record['position'] = position_trace.position if position_trace.position is not None else math.nan
+            frames_count += 1
+
+        if index == click_frame:
+            detector.click_in_camera_and_start_game(cv.EVENT_LBUTTONUP, pixel[0], pixel[1], None, None)
+
+    video.release()
+
+    return trace[:frames_count]
+
+
+# dividir o vídeo em blocos e processá-los em paralelo, os blocos terminados são entregues pela ordem do vídeo,
+# e nunca há mais do que 2 blocos por processo à espera (a memória não depende do tamanho do vídeo)
+def process_video(video_path, name, processing_scale, chunk_size, warmup, click_frame, pixel, workers):
+    video = cv.VideoCapture(video_path)
+    frames_count = int(video.get(cv.CAP_PROP_FRAME_COUNT))
+    video.release()
+
+    chunks = [(chunk_start, min(chunk_start + chunk_size, frames_count))
+              for chunk_start in range(0, frames_count, chunk_size)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending_chunks = deque()
+
+        for chunk_start, chunk_end in chunks:
+            pending_chunks.append(pool.submit(process_chunk, video_path, name, processing_scale, chunk_start,
+                                              chunk_end, warmup, click_frame, pixel))
+
+            if len(pending_chunks) >= 2 * workers:
+                yield pending_chunks.popleft().result()
+
+        while len(pending_chunks) > 0:
+            yield pending_chunks.popleft().result()
+
+
+# passar a última decisão de cada bloco ao bloco seguinte (ver CARRIED_DECISIONS), os blocos chegam pela ordem
+# do vídeo
+def carry_decisions(chunk_traces, click_frame):
+    last_decision = None
+
+    for chunk_trace in chunk_traces:
+        if last_decision is not None and len(chunk_trace) > 0:
+            # frames do início do bloco até à primeira posição medida, depois do clique (antes não há decisões)
+            measured = np.flatnonzero(~np.isnan(chunk_trace['position']))
+            carried_end = measured[0] if len(measured) > 0 else len(chunk_trace)
+            carried = chunk_trace[:carried_end]
+            carried['decision'][carried['frame'] > click_frame] = last_decision
+
+        if len(chunk_trace) > 0:
+            last_decision = chunk_trace['decision'][-1]
+
+        yield chunk_trace
+
+
+def read_trace(trace_path):
+    return np.fromfile(trace_path, TRACE_DTYPE)
+
+
+# comparar com um processamento sequencial (um só bloco, sem aquecimento), para confirmar o aquecimento escolhido
+def verify_trace(trace, video_path, name, processing_scale, click_frame, pixel):
+    sequential_trace = process_chunk(video_path, name, processing_scale, 0, len(trace), 0, click_frame, pixel)
+
+    same_decisions = trace['decision'] == sequential_trace['decision']
+    same_positions = np.isclose(trace['position'], sequential_trace['position'], atol=1e-4, equal_nan=True)
+
+    return np.count_nonzero(same_decisions & same_positions) / len(trace), \
+        np.flatnonzero(~(same_decisions & same_positions))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Processar vídeos com um detetor e guardar as decisões de cada '
+                                                 'frame.')
+    parser.add_argument('video')
+    parser.add_argument('--detetor', choices=list(WARMUP_FRAMES), default='cor')
+    parser.add_argument('--escala', type=float, help='escala de processamento (por omissão a do detetor no jogo)')
+    parser.add_argument('--saida', help='ficheiro do registo (por omissão o nome do vídeo com .trace)')
+    parser.add_argument('--trabalhadores', type=int, default=os.cpu_count(), help='processos em paralelo')
+    parser.add_argument('--bloco', type=int, default=600, help='frames de cada bloco')
+    parser.add_argument('--aquecimento', type=int,
+                        help='frames de aquecimento antes de cada bloco (por omissão as do detetor)')
+    parser.add_argument('--clique', type=int, default=0, help='frame depois da qual o jogador clica na câmara')
+    parser.add_argument('--pixel', type=int, nargs=2, help='pixel clicado (por omissão o centro da frame)')
+    parser.add_argument('--verificar', action='store_true',
+                        help='comparar no fim com um processamento sequencial (mais lento)')
+    args = parser.parse_args()
+
+    video = cv.VideoCapture(args.video)
+    if not video.isOpened():
+        parser.error('não foi possível abrir o vídeo %s' % args.video)
+
+    frame_size = (int(video.get(cv.CAP_PROP_FRAME_WIDTH)), int(video.get(cv.CAP_PROP_FRAME_HEIGHT)))
+    video_fps = video.get(cv.CAP_PROP_FPS)
+    video.release()
+
+    processing_scale = args.escala if args.escala is not None else (0.25 if args.detetor == 'fundo' else 1.0)
+    warmup = args.aquecimento if args.aquecimento is not None else WARMUP_FRAMES[args.detetor]
+    pixel = args.pixel if args.pixel is not None else [frame_size[0] // 2, frame_size[1] // 2]
+    trace_path = args.saida if args.saida is not None else os.path.splitext(args.video)[0] + '.trace'
+
+    frames_count = 0
+    start_time = time.perf_counter()
+
+    with open(trace_path, 'wb') as trace_file:
+        chunk_traces = process_video(args.video, args.detetor, processing_scale, args.bloco, warmup, args.clique,
+                                     pixel, args.trabalhadores)
+        if args.detetor in CARRIED_DECISIONS:
+            chunk_traces = carry_decisions(chunk_traces, args.clique)
+
+        for chunk_trace in chunk_traces:
+            chunk_trace.tofile(trace_file)
+            frames_count += len(chunk_trace)
+
+    elapsed_time = time.perf_counter() - start_time
+
+    # descrição do registo, para o ler sem este ficheiro
+    with open(trace_path + '.json', 'w') as metadata_file:
+        json.dump({'video': args.video, 'detector': args.detetor, 'processing_scale': processing_scale,
+                   'frames': frames_count, 'video_fps': video_fps, 'click_frame': args.clique, 'pixel': pixel,
+                   'chunk_frames': args.bloco, 'warmup_frames': warmup,
+                   'dtype': [(field, TRACE_DTYPE[field].str) for field in TRACE_DTYPE.names]},
+                  metadata_file, indent=2)
+
+    print('%s: %d frames em %.1f s (%.1f fps, %d processos) -> %s' % (
+        args.video, frames_count, elapsed_time, frames_count / elapsed_time, args.trabalhadores, trace_path))
+
+    if args.verificar:
+        agreement, differences = verify_trace(read_trace(trace_path), args.video, args.detetor, processing_scale,
+                                              args.clique, pixel)
+        print('igual ao processamento sequencial: %.2f%%' % (agreement * 100))
+
+        if len(differences) > 0:
+            print('primeiras frames diferentes: %s' % ', '.join(str(index) for index in differences[:10]))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
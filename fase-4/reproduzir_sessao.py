@@ -0,0 +1,83 @@
+# descrição:        repetir uma sessão da câmara gravada com main.py --gravar num detetor, sem janelas e à
+#                   velocidade máxima (as frames são lidas diretamente do ficheiro gravado), e comparar as decisões
+#                   com as que o controlador tomou durante o jogo.
+#                   uso: python reproduzir_sessao.py sessao
+#                        python reproduzir_sessao.py sessao --detetor movimento --escala 0.5
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import argparse
+from Controllers import Part_Of_Screen
+from SessionRecording import SessionReader
+from Instrumentation import get_percentile
+from benchmark import LABEL_COLUMNS, get_accuracy, run_detector
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Repetir uma sessão gravada num detetor.')
+    parser.add_argument('sessao', help='pasta da sessão gravada')
+    parser.add_argument('--detetor', choices=list(LABEL_COLUMNS),
+                        help='detetor a usar (por omissão o controlador com que a sessão foi gravada)')
+    parser.add_argument('--escala', type=float,
+                        help='escala de processamento (por omissão a escala com que a sessão foi gravada)')
+    parser.add_argument('--diferencas', type=int, default=10, help='número de frames diferentes a mostrar')
+    args = parser.parse_args()
+
+    reader = SessionReader(args.sessao)
+    metadata = reader.metadata
+
+    name = args.detetor if args.detetor is not None else metadata.get('controller')
+    if name not in LABEL_COLUMNS:
+        parser.error('a sessão foi gravada com o controlador %s, escolha um detetor com --detetor' % name)
+
+    processing_scale = args.escala
+    if processing_scale is None:
+        processing_scale = metadata.get('processing_scale') or (0.25 if name == 'fundo' else 1.0)
+
+    if len(reader) <= reader.click_frame + 1:
+        parser.error('a sessão não tem frames depois do início do jogo')
+
+    # sem clique gravado (jogo iniciado sem janela), o clique é no centro da câmara, tal como no jogo
+    pixel = reader.click_pixel
+    if pixel is None:
+        pixel = [reader.frames.shape[2] // 2, reader.frames.shape[1] // 2]
+
+    # o run_detector só devolve as decisões das frames depois do clique, as gravadas são comparadas a partir da
+    # mesma frame
+    decisions, frame_times, elapsed_time = run_detector(name, reader.frames, processing_scale, reader.click_frame,
+                                                        pixel)
+    first_frame = reader.click_frame + 1
+    recorded_decisions = [reader.get_decision(index) for index in range(first_frame, len(reader))]
+
+    print('sessão: %d frames (%d descartadas na gravação) | detetor: %s | escala: %g' % (
+        len(reader), metadata['dropped_frames'], name, processing_scale))
+    print('%.1f fps | p50 %.2f ms | p99 %.2f ms' % (len(frame_times) / elapsed_time,
+                                                    get_percentile(frame_times, 0.5) * 1000,
+                                                    get_percentile(frame_times, 0.99) * 1000))
+
+    accuracy = get_accuracy(decisions, recorded_decisions)
+    if accuracy is None:
+        print('a sessão não tem decisões gravadas')
+        return
+
+    print('decisões iguais às gravadas: %.1f%%' % (accuracy * 100))
+
+    # frames com decisões diferentes (índices na sessão), com o instante em relação à primeira frame gravada
+    def normalize(decision):
+        return Part_Of_Screen.NONE if decision == Part_Of_Screen.MIDDLE else decision
+
+    differences = [first_frame + index
+                   for index, (decision, recorded_decision) in enumerate(zip(decisions, recorded_decisions))
+                   if recorded_decision is not None and normalize(decision) != normalize(recorded_decision)]
+
+    for frame_index in differences[:args.diferencas]:
+        decision = decisions[frame_index - first_frame]
+        print('frame %6d (%8.3f s): gravada %-6s repetida %s' % (
+            frame_index, reader.frame_times[frame_index] - reader.frame_times[0],
+            recorded_decisions[frame_index - first_frame].name, decision.name))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+# descrição:        servidor de jogos sem janela, para avaliar muitos bots (ou controladores remotos) em simultâneo:
+#                   cada ligação (TCP ou socket unix) é uma sessão com o seu tabuleiro (ver Game.Board), com as
+#                   mesmas regras do ciclo do jogo (Game.game_loop). os clientes enviam a ação do paddle e recebem,
+#                   em cada ciclo, o estado da bola e do paddle e só os tijolos que mudaram (protocolo binário, ver
+#                   abaixo). todas as sessões correm num só event loop do asyncio, os ciclos de todas as sessões
+#                   que chegaram à sua hora são feitos de seguida em cada iteração, e uma sessão cujo cliente não
+#                   lê o estado a tempo fica parada até o cliente recuperar (em vez de acumular estados em memória).
+#                   uso: python servidor_jogos.py --porta 5555
+#                        python servidor_jogos.py --unix /tmp/jogos.sock --relatorio 10
+# autor:            Luís Pereira (18446), Paulo Machado (23484)
+# criado a:         18-10-2026
+# modificado a:     18-10-2026
+
+
+import argparse
+import asyncio
+import heapq
+import json
+import math
+import struct
+import time
+from Game import Board, Board_State, Brick, get_bricks_layout
+from HeadlessCanvas import HeadlessCanvas
+from Controllers import Controller, Part_Of_Screen
+from Instrumentation import get_percentile
+
+
+# protocolo (little-endian):
+# - cliente -> servidor, no início: HELLO (ciclos por segundo, 0 = os do jogo, e colunas x linhas de tijolos)
+# - servidor -> cliente, no início: WELCOME (sessão, largura e altura do tabuleiro e número de tijolos, os tijolos
+#   são os de get_bricks_layout pela mesma ordem)
+# - cliente -> servidor, a qualquer altura: ACTION (direção do paddle -1/0/1, ou a posição do centro do paddle em
+#   fração da largura, NaN para andar pela direção), vale até à ação seguinte
+# - servidor -> cliente, em cada ciclo: STATE (ciclo, estado do tabuleiro, vidas, centro da bola, centro do paddle e
+#   número de tijolos alterados) seguido de um BRICK (índice e toques que faltam, 0 = destruído) por tijolo alterado
+# a sessão termina quando o jogo termina (o último STATE tem o estado WON ou LOST) ou quando o cliente desliga
+HELLO = struct.Struct('<HBB')
+WELCOME = struct.Struct('<IHHH')
+ACTION = struct.Struct('<bf')
+STATE = struct.Struct('<IBBfffH')
+BRICK = struct.Struct('<HB')
+
+# ciclos por segundo do jogo (Game.game_loop repete a cada 50 ms) e pausa depois de uma bola perdida
+DEFAULT_TICK_RATE = 20
+BALL_LOST_PAUSE = 1.0
+
+# bytes à espera de serem enviados a partir dos quais a sessão fica parada até o cliente ler o estado
+MAX_PENDING_BYTES = 64 * 1024
+
+
+# controlador com a última ação recebida do cliente
+class ClientController(Controller):
+    start_message = 'Cliente'
+
+    def __init__(self):
+        Controller.__init__(self)
+
+        self.is_start = True
+        self.position = None
+
+    def set_action(self, direction, position):
+        self.part_of_screen = Part_Of_Screen.LEFT if direction < 0 else \
+            Part_Of_Screen.RIGHT if direction > 0 else Part_Of_Screen.NONE
+        self.position = None if math.isnan(position) else min(1.0, max(0.0, position))
+
+    def get_position(self, now):
+        return self.position
+
+
+class Session(object):
+    def __init__(self, session_id, writer, tick_rate, columns, rows):
+        self.session_id = session_id
+        self.writer = writer
+        self.tick_interval = 1 / tick_rate
+
+        # o tabuleiro cresce com os tijolos, tal como no benchmark do jogo
+        width = columns * 75 + 10
+        height = 400 + (rows - 3) * 20
+        self.board = Board(HeadlessCanvas(width, height), width, height, get_bricks_layout(columns, rows))
+        self.board.add_ball()
+        self.board.paddle.ball = None
+        self.controller = ClientController()
+
+        # índice de cada tijolo, pela ordem de get_bricks_layout
+        bricks = [game_object for game_object in self.board.items.values() if isinstance(game_object, Brick)]
+        self.brick_indexes = dict((brick.item, index) for index, brick in enumerate(bricks))
+
+        # contabilidade dos ciclos: feitos, atrasados (a sessão não chegou a tempo e os ciclos em falta não são
+        # recuperados) e parados à espera do cliente
+        self.start_time = time.perf_counter()
+        self.next_tick_time = self.start_time
+        self.ticks = 0
+        self.late_ticks = 0
+        self.stalled_ticks = 0
+        self.state = Board_State.PLAYING
+        self.is_closed = False
+
+        self.writer.write(WELCOME.pack(session_id, width, height, len(bricks)))
+
+    def tick(self, now):
+        # o cliente ainda não leu os estados anteriores: a sessão não avança
+        if self.writer.transport.get_write_buffer_size() > MAX_PENDING_BYTES:
+            self.stalled_ticks += 1
+            self.schedule_next_tick(now, self.tick_interval)
+            return
+
+        # depois de uma bola perdida o jogo recomeça com a bola no paddle (como no Game.setup_game)
+        if self.state == Board_State.BALL_LOST:
+            self.board.add_ball()
+            self.board.paddle.ball = None
+
+        self.state = self.board.tick([self.controller], now)
+        self.ticks += 1
+        self.send_state()
+
+        if self.state in (Board_State.WON, Board_State.LOST):
+            self.close()
+        elif self.state == Board_State.BALL_LOST:
+            self.schedule_next_tick(now, BALL_LOST_PAUSE)
+        else:
+            self.schedule_next_tick(now, self.tick_interval)
+
+    def schedule_next_tick(self, now, interval):
+        self.next_tick_time += interval
+
+        # ciclos que já passaram da hora não são feitos (o jogo continua ao ritmo certo a partir de agora)
+        if self.next_tick_time < now:
+            missed_ticks = int((now - self.next_tick_time) / self.tick_interval) + 1
+            self.late_ticks += missed_ticks
+            self.next_tick_time += missed_ticks * self.tick_interval
+
+    def send_state(self):
+        ball_coords = self.board.ball.get_position()
+        paddle_coords = self.board.paddle.get_position()
+        hit_bricks = self.board.hit_bricks
+
+        message = [STATE.pack(self.ticks, self.state.value, max(0, self.board.lives),
+                              (ball_coords[0] + ball_coords[2]) * 0.5, (ball_coords[1] + ball_coords[3]) * 0.5,
+                              (paddle_coords[0] + paddle_coords[2]) * 0.5, len(hit_bricks))]
+        for brick in hit_bricks:
+            message.append(BRICK.pack(self.brick_indexes[brick.item], brick.hits))
+
+        self.writer.write(b''.join(message))
+
+    def close(self):
+        if not self.is_closed:
+            self.is_closed = True
+            self.writer.close()
+
+    def get_stats(self):
+        elapsed_time = time.perf_counter() - self.start_time
+        return {'session': self.session_id, 'ticks': self.ticks, 'tick_rate': self.ticks / elapsed_time,
+                'target_tick_rate': 1 / self.tick_interval, 'late_ticks': self.late_ticks,
+                'stalled_ticks': self.stalled_ticks, 'state': self.state.name, 'lives': max(0, self.board.lives)}
+
+
+class GameServer(object):
+    def __init__(self):
+        self.sessions = {}
+        self.next_session_id = 1
+        self.finished_stats = []
+
+        # próximos ciclos das sessões (instante, sessão), e o evento que acorda o ciclo das sessões
+        # quando chega uma sessão nova
+        self.schedule = []
+        self.new_session = asyncio.Event()
+
+    async def handle_client(self, reader, writer):
+        try:
+            tick_rate, columns, rows = HELLO.unpack(await reader.readexactly(HELLO.size))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+
+        session = Session(self.next_session_id, writer, tick_rate or DEFAULT_TICK_RATE, max(1, columns),
+                          max(1, rows))
+        self.next_session_id += 1
+        self.sessions[session.session_id] = session
+        heapq.heappush(self.schedule, (session.next_tick_time, session.session_id))
+        self.new_session.set()
+
+        # as ações só mudam o controlador da sessão, usadas no ciclo seguinte
+        try:
+            while not session.is_closed:
+                direction, position = ACTION.unpack(await reader.readexactly(ACTION.size))
+                session.controller.set_action(direction, position)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+        session.close()
+
+    # ciclo de todas as sessões: em cada iteração são feitos os ciclos de todas as sessões que chegaram à hora,
+    # e depois espera-se pela hora da sessão seguinte (os estados são enviados pelo event loop entretanto)
+    async def run_sessions(self):
+        while True:
+            now = time.perf_counter()
+
+            while len(self.schedule) > 0 and self.schedule[0][0] <= now:
+                tick_time, session_id = heapq.heappop(self.schedule)
+                session = self.sessions[session_id]
+
+                if not session.is_closed:
+                    session.tick(now)
+
+                if session.is_closed:
+                    self.finished_stats.append(session.get_stats())
+                    del self.sessions[session_id]
+                else:
+                    heapq.heappush(self.schedule, (session.next_tick_time, session_id))
+
+            self.new_session.clear()
+            timeout = self.schedule[0][0] - time.perf_counter() if len(self.schedule) > 0 else None
+
+            try:
+                await asyncio.wait_for(self.new_session.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    # resumo das sessões ativas: ciclos por segundo de cada sessão (face ao pedido) e sessões atrasadas/paradas
+    def format_summary(self):
+        stats = [session.get_stats() for session in self.sessions.values()]
+        if len(stats) == 0:
+            return 'sessões: 0 | terminadas: %d' % len(self.finished_stats)
+
+        tick_rates = [session_stats['tick_rate'] / session_stats['target_tick_rate'] for session_stats in stats]
+        return 'sessões: %d | terminadas: %d | ciclos/s: %.0f | ritmo p50: %.0f%% p1: %.0f%% | ' \
+               'com atrasos: %d | paradas pelo cliente: %d' % (
+                   len(stats), len(self.finished_stats), sum(session_stats['tick_rate'] for session_stats in stats),
+                   get_percentile(tick_rates, 0.5) * 100, get_percentile(tick_rates, 0.01) * 100,
+                   sum(1 for session_stats in stats if session_stats['late_ticks'] > 0),
+                   sum(1 for session_stats in stats if session_stats['stalled_ticks'] > 0))
+
+    async def report(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            print(self.format_summary())
+
+
+async def serve(args):
+    server = GameServer()
+
+    if args.unix is not None:
+        socket_server = await asyncio.start_unix_server(server.handle_client, args.unix)
+    else:
+        socket_server = await asyncio.start_server(server.handle_client, args.host, args.porta)
+
+    tasks = [asyncio.create_task(server.run_sessions())]
+    if args.relatorio > 0:
+        tasks.append(asyncio.create_task(server.report(args.relatorio)))
+
+    print('servidor à escuta em %s' % (args.unix if args.unix is not None else '%s:%d' % (args.host, args.porta)))
+
+    try:
+        async with socket_server:
+            await socket_server.serve_forever()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+        # guardar a contabilidade de todas as sessões (as ainda ativas e as terminadas)
+        if args.json is not None:
+            with open(args.json, 'w') as json_file:
+                json.dump(server.finished_stats + [session.get_stats() for session in server.sessions.values()],
+                          json_file, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor de jogos sem janela, com uma sessão por ligação.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=5555)
+    parser.add_argument('--unix', help='caminho de um socket unix (em vez de TCP)')
+    parser.add_argument('--relatorio', type=float, default=5,
+                        help='segundos entre cada resumo das sessões (0 = nunca)')
+    parser.add_argument('--json', help='ficheiro JSON onde guardar a contabilidade de cada sessão no fim')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()